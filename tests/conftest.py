@@ -0,0 +1,27 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains shared fixtures for tpDcc-libs-curves tests
+"""
+
+import pytest
+
+from tpDcc.libs.curves.core import bundle, geometry, nurbs, similarity, simplify, tessellation, thumbnails
+
+# Modules that use NumPy when it is available and fallback to plain Python otherwise
+NUMPY_MODULES = (bundle, geometry, nurbs, similarity, simplify, tessellation, thumbnails)
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'python'])
+def use_numpy(request, monkeypatch):
+    if not request.param:
+        for module in NUMPY_MODULES:
+            monkeypatch.setattr(module, 'numpy', None)
+    elif nurbs.numpy is None:
+        pytest.skip('NumPy is not available')
+
+    # Cached tessellations store different array types depending on NumPy availability
+    tessellation.get_tessellation_cache().clear()
+    yield
+    tessellation.get_tessellation_cache().clear()
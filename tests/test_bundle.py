@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves bundle format
+"""
+
+import os
+import json
+import shutil
+from collections import OrderedDict
+
+from tpDcc.libs.curves.core import bundle
+
+CURVES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tpDcc', 'libs', 'curves', 'curves')
+
+
+def _get_curves(curves_path):
+    curves = list()
+    for file_name in sorted(os.listdir(curves_path)):
+        if not file_name.endswith('.curve'):
+            continue
+        file_path = os.path.join(curves_path, file_name)
+        with open(file_path) as fh:
+            curve_data = json.load(fh, object_pairs_hook=OrderedDict)
+        file_stat = os.stat(file_path)
+        curves.append((os.path.splitext(file_name)[0], file_name, curve_data, file_stat.st_size, file_stat.st_mtime))
+
+    return curves
+
+
+def test_bundle_roundtrip(tmp_path):
+    curves = _get_curves(CURVES_PATH)
+    bundle_path = str(tmp_path / 'curves.curvebundle')
+    bundle.write_bundle(bundle_path, curves)
+
+    curves_bundle = bundle.read_bundle(bundle_path)
+    assert curves_bundle.get_curve_names() == [curve[0] for curve in curves]
+    for curve_name, relative_path, curve_data, _, _ in curves:
+        assert curves_bundle.get_relative_path(curve_name) == relative_path
+        assert curves_bundle.get_curve_data(curve_name) == curve_data
+
+
+def test_bundle_is_up_to_date(tmp_path):
+    curves_path = str(tmp_path / 'curves')
+    os.makedirs(curves_path)
+    for file_name in ('circle.curve', 'cube.curve'):
+        shutil.copy2(os.path.join(CURVES_PATH, file_name), curves_path)
+    bundle_path = os.path.join(curves_path, 'curves.curvebundle')
+    directories = [('.', os.stat(curves_path).st_mtime, [], ['circle.curve', 'cube.curve'])]
+    bundle.write_bundle(bundle_path, _get_curves(curves_path), directories=directories)
+    assert bundle.read_bundle(bundle_path).is_up_to_date(curves_path)
+
+    # Replacing the bundle modifies the mtime of its directory but not the curves it contains
+    bundle.write_bundle(bundle_path, _get_curves(curves_path), directories=directories)
+    with open(os.path.join(curves_path, '.cube.curve.lock'), 'w'):
+        pass
+    assert bundle.read_bundle(bundle_path).is_up_to_date(curves_path)
+
+    os.remove(os.path.join(curves_path, 'cube.curve'))
+    assert not bundle.read_bundle(bundle_path).is_up_to_date(curves_path)
+
+
+def test_bundle_view(tmp_path):
+    curves = _get_curves(CURVES_PATH)
+    bundle_path = str(tmp_path / 'curves.curvebundle')
+    bundle.write_bundle(bundle_path, curves)
+
+    with bundle.open_bundle_view(bundle_path) as bundle_view:
+        for curve_name, _, curve_data, _, _ in curves:
+            shape_arrays = bundle_view.get_shape_arrays(curve_name)
+            for shape_name, shape_data in curve_data.items():
+                assert shape_arrays[shape_name]['cvs'].tolist() == shape_data['cvs']
+            del shape_arrays
+
+
+def test_bundle_view_rewrite(tmp_path):
+    curves = _get_curves(CURVES_PATH)
+    bundle_path = str(tmp_path / 'curves.curvebundle')
+    bundle.write_bundle(bundle_path, curves)
+
+    # Bundle is replaced while a view maps it, so the view keeps reading the previous bundle contents
+    with bundle.open_bundle_view(bundle_path) as bundle_view:
+        bundle.write_bundle(bundle_path, curves[:1])
+        bundle.write_bundle(bundle_path, list())
+        for curve_name, _, curve_data, _, _ in curves:
+            shape_arrays = bundle_view.get_shape_arrays(curve_name)
+            for shape_name, shape_data in curve_data.items():
+                assert shape_arrays[shape_name]['cvs'].tolist() == shape_data['cvs']
+            del shape_arrays
+
+    assert not bundle.read_bundle(bundle_path).get_curve_names()
@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves curve data cache
+"""
+
+import os
+import json
+
+import pytest
+
+pytest.importorskip('tpDcc.libs.python')
+
+from tpDcc.libs.curves.core import cache
+
+
+def _write_curve(curve_path, degree=1):
+    curve_path.write_text(json.dumps({'lineShape': {'degree': degree, 'cvs': [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]}}))
+
+    return str(curve_path)
+
+
+def test_curve_data_cache(tmp_path):
+    curve_path = _write_curve(tmp_path / 'line.curve')
+    curve_cache = cache.CurveDataCache()
+    assert curve_cache.get(curve_path)['lineShape']['degree'] == 1
+    assert curve_cache.get(curve_path)['lineShape']['degree'] == 1
+    assert (curve_cache.hits, curve_cache.misses) == (1, 1)
+    assert curve_cache.stats()['entries'] == 1
+
+    # Returned data is a copy, so modifying it does not modify the cached data
+    curve_cache.get(curve_path)['lineShape']['cvs'].append([2.0, 0.0, 0.0])
+    assert len(curve_cache.get(curve_path)['lineShape']['cvs']) == 2
+
+    # Entries are invalidated when the modification time or the size of the file changes
+    _write_curve(tmp_path / 'line.curve', degree=3)
+    file_mtime = os.stat(curve_path).st_mtime + 2.0
+    os.utime(curve_path, (file_mtime, file_mtime))
+    assert curve_cache.get(curve_path)['lineShape']['degree'] == 3
+    assert curve_cache.misses == 2
+
+    os.remove(curve_path)
+    assert curve_cache.get(curve_path) is None
+    assert curve_cache.stats()['entries'] == 0
+
+
+def test_curve_data_cache_eviction(tmp_path):
+    curve_paths = [_write_curve(tmp_path / '{}.curve'.format(curve_name)) for curve_name in ('a', 'b', 'c')]
+    curve_cache = cache.CurveDataCache(max_entries=2)
+    for curve_path in curve_paths[:2]:
+        curve_cache.get(curve_path)
+
+    # Least recently used entry is evicted first
+    curve_cache.get(curve_paths[0])
+    curve_cache.get(curve_paths[2])
+    curve_cache.get(curve_paths[0])
+    curve_cache.get(curve_paths[1])
+    assert (curve_cache.hits, curve_cache.misses) == (2, 4)
+
+    file_size = os.stat(curve_paths[0]).st_size
+    curve_cache.max_bytes = file_size
+    assert curve_cache.stats()['entries'] == 1
+    assert curve_cache.total_bytes == file_size
+
+    curve_cache.clear()
+    assert curve_cache.stats() == {
+        'entries': 0, 'bytes': 0, 'hits': 0, 'misses': 0, 'max_entries': 2, 'max_bytes': file_size}
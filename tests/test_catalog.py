@@ -0,0 +1,110 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves catalog
+"""
+
+import threading
+
+import pytest
+
+pytest.importorskip('tpDcc.libs.python')
+
+from tpDcc.libs.curves.core import catalog
+
+
+def test_layered_index(tmp_path):
+    studio_path, user_path = tmp_path / 'studio', tmp_path / 'user'
+    (studio_path / 'sub').mkdir(parents=True)
+    user_path.mkdir()
+    for curve_path in (studio_path / 'sub' / 'circle.curve', studio_path / 'square.curve', user_path / 'circle.curve'):
+        curve_path.write_text('{}')
+
+    curves_catalog = catalog.CurveCatalog([str(user_path), str(studio_path)])
+    user_circle, studio_circle = str(user_path / 'circle.curve'), str(studio_path / 'sub' / 'circle.curve')
+
+    assert curves_catalog.find_curve_path('circle') == user_circle
+    assert curves_catalog.get_curve_providers('circle') == [user_circle, studio_circle]
+    assert list(curves_catalog.get_shadowed_curves().keys()) == ['circle']
+    assert curves_catalog.get_curve_root_path(studio_circle) == str(studio_path)
+
+    (user_path / 'circle.curve').unlink()
+    curves_catalog.remove_curve_path(user_circle)
+    assert curves_catalog.find_curve_path('circle') == studio_circle
+    assert not curves_catalog.get_shadowed_curves()
+
+
+def test_add_remove_curve_path(tmp_path):
+    studio_path, user_path = tmp_path / 'studio', tmp_path / 'user'
+    (studio_path / 'sub').mkdir(parents=True)
+    user_path.mkdir()
+    for curve_path in (studio_path / 'sub' / 'circle.curve', studio_path / 'square.curve'):
+        curve_path.write_text('{}')
+    curves_catalog = catalog.CurveCatalog([str(user_path), str(studio_path)])
+    assert curves_catalog.get_curve_names() == ['square', 'circle']
+
+    # Index updated file by file follows the same order than a full scan
+    for curve_path in (user_path / 'circle.curve', studio_path / 'arrow.curve'):
+        curve_path.write_text('{}')
+        assert curves_catalog.add_curve_path(str(curve_path))
+    (studio_path / 'square.curve').unlink()
+    assert curves_catalog.remove_curve_path(str(studio_path / 'square.curve'))
+    full_catalog = catalog.CurveCatalog([str(user_path), str(studio_path)])
+    assert curves_catalog.get_curve_names() == full_catalog.get_curve_names() == ['circle', 'arrow']
+    assert curves_catalog.get_curve_paths() == full_catalog.get_curve_paths()
+    assert curves_catalog.get_curve_providers('circle') == full_catalog.get_curve_providers('circle')
+
+    # Files created by other processes in the same directory are still found by next refresh
+    (studio_path / 'star.curve').write_text('{}')
+    (studio_path / 'cross.curve').write_text('{}')
+    assert curves_catalog.add_curve_path(str(studio_path / 'cross.curve'))
+    assert curves_catalog.refresh()
+    assert curves_catalog.find_curve_path('star') == str(studio_path / 'star.curve')
+
+
+def test_curve_metadata(tmp_path):
+    for curve_path in (tmp_path / 'circle.curve', tmp_path / 'ring.curve'):
+        curve_path.write_text('{}')
+    curves_catalog = catalog.CurveCatalog([str(tmp_path)])
+    for curve_name in ('circle', 'ring'):
+        assert curves_catalog.set_curve_metadata(str(tmp_path / '{}.curve'.format(curve_name)), {'hash': 'abc'})
+    assert curves_catalog.get_curve_aliases(str(tmp_path / 'circle.curve')) == [str(tmp_path / 'ring.curve')]
+
+    # Curve files edited in place do not modify their directory but their metadata is not valid anymore
+    (tmp_path / 'ring.curve').write_text('{"ringShape": {}}')
+    assert curves_catalog.get_curve_metadata(str(tmp_path / 'circle.curve')) == {'hash': 'abc'}
+    assert curves_catalog.get_curve_metadata(str(tmp_path / 'ring.curve')) is None
+    assert not curves_catalog.get_duplicate_curves()
+
+
+def test_concurrent_updates(tmp_path):
+    curve_paths = list()
+    for i in range(50):
+        curve_path = tmp_path / 'curve_{:02d}.curve'.format(i)
+        curve_path.write_text('{}')
+        curve_paths.append(str(curve_path))
+    curves_catalog = catalog.CurveCatalog([str(tmp_path)])
+    curves_catalog.refresh()
+    errors = list()
+
+    # Catalog is updated from other thread (for example, a threaded curves watcher) while it is being read
+    def _update_catalog():
+        try:
+            for _ in range(20):
+                for curve_path in reversed(curve_paths):
+                    curves_catalog.remove_curve_path(curve_path)
+                    curves_catalog.add_curve_path(curve_path)
+        except Exception as exc:
+            errors.append(exc)
+
+    update_thread = threading.Thread(target=_update_catalog)
+    update_thread.start()
+    while update_thread.is_alive():
+        curves_catalog.get_curve_names()
+        curves_catalog.get_curve_mtimes()
+        curves_catalog.get_shadowed_curves()
+    update_thread.join()
+
+    assert not errors
+    assert curves_catalog.get_curve_paths() == curve_paths
@@ -0,0 +1,161 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves core functions
+"""
+
+import os
+import json
+import shutil
+
+import pytest
+
+pytest.importorskip('tpDcc.core')
+pytest.importorskip('tpDcc.libs.python')
+
+from tpDcc.libs.curves.core import storage, curveslib
+
+CURVES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tpDcc', 'libs', 'curves', 'curves')
+
+
+@pytest.fixture
+def curves_path(tmp_path, monkeypatch):
+    monkeypatch.setenv(storage.CACHE_PATH_ENV, str(tmp_path / 'cache'))
+    curves_path = tmp_path / 'curves'
+    curves_path.mkdir()
+    for file_name in ('circle.curve', 'cube.curve'):
+        shutil.copy2(os.path.join(CURVES_PATH, file_name), str(curves_path))
+
+    return str(curves_path)
+
+
+def test_curves_bundle_external_changes(curves_path):
+    curveslib.compile_curves_bundle(curves_path)
+    assert curveslib.get_curves_bundle(curves_path).get_curve_names() == ['circle', 'cube']
+    assert curveslib.get_curves_bundle(curves_path) is not None
+
+    # Curve created by other process is detected without refreshing the catalogs of current session
+    with open(os.path.join(curves_path, 'square.curve'), 'w') as fh:
+        json.dump({'squareShape': {'degree': 1, 'form': 1, 'cvs': [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]}}, fh)
+    directory_mtime = os.stat(curves_path).st_mtime + 2.0
+    os.utime(curves_path, (directory_mtime, directory_mtime))
+    assert curveslib.get_curves_bundle(curves_path) is None
+
+
+def test_create_curve_dcc_space(monkeypatch):
+    created_data = list()
+
+    def _convert_to_z_up(curve_data):
+        return {name: dict(data, cvs=[[x, -z, y] for x, y, z in data['cvs']]) for name, data in curve_data.items()}
+
+    monkeypatch.setattr(curveslib, 'convert_curve_data_to_dcc', _convert_to_z_up)
+    monkeypatch.setattr(
+        curveslib, 'create_curve_from_data', lambda curve_data, **kwargs: created_data.append(curve_data))
+
+    # Creation transforms are applied in DCC space: Z offset and then mirror are applied along the DCC up axis
+    curve_data = {'lineShape': {'degree': 1, 'cvs': [[0.0, 1.0, 0.0], [1.0, 2.0, 3.0]]}}
+    curveslib._create_curve_from_type_data(curve_data, translate_offset=(0.0, 0.0, 5.0), mirror='Z')
+    assert created_data[0]['lineShape']['cvs'] == [[0.0, 0.0, -6.0], [1.0, -3.0, -7.0]]
+
+
+@pytest.mark.parametrize('max_workers, use_processes', [(1, False), (2, False), (2, True)],
+                         ids=['serial', 'threads', 'processes'])
+def test_bulk_load_curves(curves_path, max_workers, use_processes):
+    with open(os.path.join(curves_path, 'broken.curve'), 'w') as fh:
+        fh.write('{"brokenShape": ')
+
+    # Curve files that cannot be loaded are reported without aborting the loading of the others
+    curves_data, errors = curveslib.bulk_load_curves(
+        curves_path, max_workers=max_workers, use_processes=use_processes)
+    assert list(curves_data.keys()) == ['circle', 'cube']
+    with open(os.path.join(CURVES_PATH, 'cube.curve')) as fh:
+        assert curves_data['cube'] == json.load(fh)
+    assert [os.path.basename(curve_path) for curve_path in errors] == ['broken.curve']
+
+
+@pytest.mark.parametrize('use_bundle', [False, True], ids=['files', 'bundle'])
+def test_iterate_curves_filters(tmp_path, monkeypatch, use_bundle):
+    monkeypatch.setenv(storage.CACHE_PATH_ENV, str(tmp_path / 'cache'))
+    cvs = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]]
+    curves = {
+        'arrow_left': {'arrowShape': {'degree': 1, 'cvs': cvs}},
+        'arrow_right': {'arrowShape': {'degree': 1, 'cvs': cvs}, 'tipShape': {'degree': 3, 'cvs': cvs}},
+        'pin': {'pinShape': {'degree': 3, 'cvs': cvs}, 'headShape': {'degree': 1, 'cvs': cvs, 'shape_parent': 'pin'}}
+    }
+    for curve_name, curve_data in curves.items():
+        (tmp_path / '{}.curve'.format(curve_name)).write_text(json.dumps(curve_data))
+    if use_bundle:
+        curveslib.compile_curves_bundle(str(tmp_path))
+        assert curveslib.get_curves_bundle(str(tmp_path)) is not None
+
+    def _get_names(**kwargs):
+        return [curve_name for curve_name, _, _ in curveslib.iterate_curves(str(tmp_path), **kwargs)]
+
+    assert _get_names() == ['arrow_left', 'arrow_right', 'pin']
+    assert _get_names(name_pattern='arrow_*') == ['arrow_left', 'arrow_right']
+    assert _get_names(shape_count=2) == ['arrow_right', 'pin']
+    assert _get_names(degree=3) == ['arrow_right', 'pin']
+    assert _get_names(has_shape_parent=True) == ['pin']
+    assert _get_names(has_shape_parent=False, degree=1) == ['arrow_left', 'arrow_right']
+    assert not _get_names(name_pattern='arrow_*', shape_count=3)
+    curve_name, curve_path, curve_data = next(curveslib.iterate_curves(str(tmp_path), name_pattern='pin'))
+    assert os.path.basename(curve_path) == 'pin.curve'
+    assert curve_data == curves['pin']
+
+
+def test_create_curves(curves_path, monkeypatch):
+    loaded_types = list()
+    load_curve_type_data = curveslib._load_curve_type_data
+
+    def _load_curve_type_data(curve_type, curves_path=None):
+        loaded_types.append(curve_type)
+        return load_curve_type_data(curve_type, curves_path=curves_path)
+
+    def _create_curve_from_data(curve_data, name=None, **kwargs):
+        if name == 'broken':
+            raise RuntimeError('Curve creation failed')
+        return name, curve_data
+
+    monkeypatch.setattr(curveslib, '_load_curve_type_data', _load_curve_type_data)
+    monkeypatch.setattr(curveslib, 'create_curve_from_data', _create_curve_from_data)
+
+    curve_specs = [
+        {'curve_type': 'circle', 'curve_name': 'circle_a'},
+        {'curve_type': 'cube', 'curve_name': 'cube_a'},
+        {'curve_type': 'missing', 'curve_name': 'missing_a'},
+        {'curve_name': 'untyped'},
+        {'curve_type': 'circle', 'curve_name': 'broken'},
+        {'curve_type': 'circle', 'curve_name': 'circle_b', 'curve_size': 2.0}]
+    for curve_spec in curve_specs:
+        curve_spec['curves_path'] = curves_path
+    results, errors = curveslib.create_curves(curve_specs)
+
+    # Each curve type is loaded once and failures do not abort the creation of the other curves
+    assert loaded_types == ['circle', 'cube', 'missing']
+    assert [result[0] if result else None for result in results] == [
+        'circle_a', 'cube_a', None, None, None, 'circle_b']
+    assert list(errors.keys()) == [2, 3, 4]
+    assert errors[4] == 'Curve creation failed'
+
+    # Curves of the same type do not share their data
+    circle_cvs = results[0][1]['circleShape']['cvs']
+    assert results[5][1]['circleShape']['cvs'] == [[value * 2.0 for value in cv] for cv in circle_cvs]
+
+
+def test_similarity_index_in_place_edits(curves_path):
+    with open(os.path.join(curves_path, 'cube.curve'), 'r') as fh:
+        cube_data = json.load(fh)
+    circle_path = os.path.join(curves_path, 'circle.curve')
+    circle_source = curveslib.get_similarity_index(curves_path).get_source('circle')
+    circle_score = dict(curveslib.find_similar_curves(cube_data, curves_path=curves_path))['circle']
+    assert circle_score < 0.99
+
+    # Curve file overwritten in place (the folder is not modified) gets its descriptor computed again
+    with open(circle_path, 'w') as fh:
+        json.dump(cube_data, fh)
+    circle_mtime = os.stat(circle_path).st_mtime + 2.0
+    os.utime(circle_path, (circle_mtime, circle_mtime))
+    assert curveslib.get_similarity_index(curves_path).get_source('circle') != circle_source
+    assert dict(curveslib.find_similar_curves(cube_data, curves_path=curves_path))['circle'] > 0.99
@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves geometry functions
+"""
+
+import pytest
+
+from tpDcc.libs.curves.core import consts, geometry
+
+CURVE_DATA = {
+    'shapeA': {'degree': 1, 'form': 1, 'knots': [0.0, 1.0], 'cvs': [[0.0, 0.0, 0.0], [4.0, 2.0, -1.0]]},
+    'shapeB': {'degree': 1, 'form': 1, 'knots': [0.0, 1.0], 'cvs': [[2.0, -2.0, 1.0], [-2.0, 1.0, 3.0]]}
+}
+
+
+def test_normalize_max(use_numpy):
+    normalized = geometry.normalize_curve_data(CURVE_DATA)
+    assert normalized['shapeA']['cvs'] == [[0.0, 0.0, 0.0], [1.0, 0.5, -0.25]]
+    assert normalized['shapeB']['cvs'] == [[0.5, -0.5, 0.25], [-0.5, 0.25, 0.75]]
+    assert CURVE_DATA['shapeA']['cvs'][1] == [4.0, 2.0, -1.0]
+
+
+def test_normalize_axis(use_numpy):
+    normalized = geometry.normalize_curve_data(CURVE_DATA, mode=consts.NormalizeMode.AXIS)
+    assert normalized['shapeA']['cvs'][1] == pytest.approx([1.0, 1.0, -1.0 / 3.0])
+
+
+def test_normalize_bounding_box(use_numpy):
+    normalized = geometry.normalize_curve_data(CURVE_DATA, mode=consts.NormalizeMode.BOUNDING_BOX)
+    assert normalized['shapeA']['cvs'][1] == pytest.approx([1.0, 2.0 / 3.0, -2.0 / 3.0])
+    assert normalized['shapeB']['cvs'][1] == pytest.approx([-1.0, 1.0 / 3.0, 2.0 / 3.0])
+
+
+def test_curve_metadata():
+    cvs = [[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [-1.0, 0.0, 0.0], [0.0, -2.0, 0.0]]
+    curve_data = dict(CURVE_DATA, shapeC={'degree': 3, 'form': 3, 'cvs': cvs + cvs[:3]})
+    metadata = geometry.get_curve_metadata(curve_data)
+    assert metadata['bounding_box'] == [[-2.0, -2.0, -1.0], [4.0, 2.0, 3.0]]
+    assert metadata['size'] == [6.0, 4.0, 4.0]
+    assert metadata['cvs_count'] == 8
+    assert metadata['centroid'] == pytest.approx([0.5, 0.125, 0.375])
+    assert metadata['shapes']['shapeC']['cvs_count'] == 4
+    assert metadata['shapes']['shapeC']['closed'] is True
+    assert metadata['shapes']['shapeA']['closed'] is False
+    assert geometry.get_target_curve_size(metadata, 3.0) == 0.5
+
+
+def _transform_cv_baseline(cv, curve_size, translate_offset, scale, axis_order, mirror):
+    # Transforms applied one by one by DCC implementations before they were composed into a single matrix
+    order = [{'x': 0, 'y': 1, 'z': 2}[axis] for axis in axis_order.lower()]
+    mirror_vector = {None: [1, 1, 1], 'None': [1, 1, 1], 'XY': [1, 1, -1], 'YZ': [-1, 1, 1], 'ZX': [1, -1, 1]}[mirror]
+    cv = [value * curve_size * scale[i] for value, i in zip(cv, order)]
+    cv = [value + translate_offset[i] for value, i in zip(cv, order)]
+    cv = [value * factor for value, factor in zip(cv, mirror_vector)]
+
+    return [cv[i] for i in order]
+
+
+def test_transform_curve_data(use_numpy):
+    matrix = geometry.compose_transform_matrix(
+        curve_size=2.0, translate_offset=(1.0, 0.0, 0.0), scale=(1.0, 1.0, 3.0), axis_order='ZXY', mirror='YZ')
+    transformed = geometry.transform_curve_data(CURVE_DATA, matrix)
+    assert transformed['shapeA']['cvs'] == [[0.0, 0.0, 1.0], [-2.0, -24.0, 5.0]]
+    assert CURVE_DATA['shapeA']['cvs'][1] == [4.0, 2.0, -1.0]
+    assert geometry.is_identity_matrix(geometry.compose_transform_matrix())
+    assert geometry.is_identity_matrix(geometry.compose_transform_matrix(mirror='None'))
+    assert geometry.compose_transform_matrix(mirror='X') == geometry.compose_transform_matrix(mirror='YZ')
+    with pytest.raises(ValueError):
+        geometry.compose_transform_matrix(axis_order='XXY')
+    with pytest.raises(ValueError):
+        geometry.compose_transform_matrix(mirror='yz')
+
+
+@pytest.mark.parametrize('mirror', [None, 'None', 'XY', 'YZ', 'ZX'])
+@pytest.mark.parametrize('axis_order', ['XYZ', 'ZXY', 'YZX', 'XZY', 'ZYX'])
+def test_transform_curve_data_baseline(use_numpy, axis_order, mirror):
+    kwargs = {
+        'curve_size': 2.0, 'translate_offset': (1.0, -2.0, 3.0), 'scale': (1.0, 0.5, 3.0), 'axis_order': axis_order,
+        'mirror': mirror}
+    transformed = geometry.transform_curve_data(CURVE_DATA, geometry.compose_transform_matrix(**kwargs))
+    for shape_name, shape_data in CURVE_DATA.items():
+        expected_cvs = [_transform_cv_baseline(cv, **kwargs) for cv in shape_data['cvs']]
+        for cv, expected_cv in zip(transformed[shape_name]['cvs'], expected_cvs):
+            assert cv == pytest.approx(expected_cv)
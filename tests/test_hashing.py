@@ -0,0 +1,29 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves hashing functions
+"""
+
+from collections import OrderedDict
+
+from tpDcc.libs.curves.core import hashing
+
+SHAPE_A = {'degree': 1, 'form': 1, 'cvs': [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]}
+SHAPE_B = {'degree': 3, 'form': 1, 'knots': [0.0, 0.0, 0.0, 1.0, 1.0, 1.0],
+           'cvs': [[0.0, 0.0, 0.0], [1.0, 2.0, 0.0], [3.0, 2.0, 0.0], [4.0, 0.0, 0.0]]}
+
+
+def test_curve_hash_ignores_shape_names():
+    curve_hash = hashing.get_curve_hash(OrderedDict([('a', SHAPE_A), ('b', SHAPE_B)]))
+    assert hashing.get_curve_hash(OrderedDict([('shapeB', SHAPE_B), ('shapeA', SHAPE_A)])) == curve_hash
+    assert hashing.get_curve_hash(OrderedDict([('a', SHAPE_A)])) != curve_hash
+
+
+def test_shape_hash_is_canonical():
+    shape_hash = hashing.get_shape_hash(SHAPE_B)
+    assert hashing.get_shape_hash(dict(SHAPE_B, knots=[2.0, 2.0, 2.0, 4.0, 4.0, 4.0])) == shape_hash
+    assert hashing.get_shape_hash(dict(SHAPE_B, knots=None)) == shape_hash
+    assert hashing.get_shape_hash(dict(SHAPE_B, cvs=[[0.0, 0.0, 1e-9]] + SHAPE_B['cvs'][1:])) == shape_hash
+    assert hashing.get_shape_hash(dict(SHAPE_B, form=2)) != shape_hash
+    assert hashing.get_shape_hash(dict(SHAPE_B, cvs=SHAPE_B['cvs'][::-1])) != shape_hash
@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves package import
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+# Generous budget for the package import, it only guards against regressions such as heavy imports or file system
+# access during import
+IMPORT_TIME_BUDGET = 0.5
+
+IMPORT_SCRIPT = """
+import sys, json, time, logging
+start_time = time.time()
+import tpDcc.libs.curves
+elapsed_time = time.time() - start_time
+print(json.dumps({
+    'time': elapsed_time,
+    'handlers': len(logging.getLogger('tpDcc-libs-curves').handlers),
+    'logging_config': 'logging.config' in sys.modules}))
+"""
+
+
+def _run_import(home_path):
+    environ = dict(os.environ)
+    environ.update({
+        'HOME': str(home_path), 'USERPROFILE': str(home_path),
+        'PYTHONPATH': os.pathsep.join([os.path.dirname(os.path.dirname(os.path.abspath(__file__)))] + sys.path)})
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT], env=environ)
+
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def test_import_has_no_side_effects(tmp_path):
+    result = _run_import(tmp_path)
+
+    assert not os.listdir(str(tmp_path))
+    assert not result['handlers']
+    assert not result['logging_config']
+
+
+def test_import_time(tmp_path):
+    # Best of several runs to reduce noise from the machine load
+    elapsed_time = min(_run_import(tmp_path)['time'] for _ in range(3))
+
+    assert elapsed_time < IMPORT_TIME_BUDGET
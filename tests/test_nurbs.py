@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves NURBS functions
+"""
+
+import pytest
+
+from tpDcc.libs.curves.core import nurbs
+
+
+def test_default_knots():
+    assert nurbs.get_default_knots(4, 1) == [0.0, 1.0, 2.0, 3.0]
+    assert nurbs.get_default_knots(6, 3) == [0.0, 0.0, 0.0, 1.0, 2.0, 3.0, 3.0, 3.0]
+    assert nurbs.get_default_knots(5, 3, form=nurbs.FORM_PERIODIC) == [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_normalize_knots():
+    knots = [0.0, 0.0, 0.0, 1.0, 2.0, 3.0, 3.0, 3.0]
+    assert nurbs.normalize_knots(knots, 6, 3) == [0.0] + knots + [3.0]
+    assert len(knots) == 8
+
+    # Knots are always added in pairs, so an odd number of missing knots results in one extra knot
+    assert nurbs.normalize_knots([0.0, 1.0, 2.0], 4, 1) == [0.0, 0.0, 0.0, 1.0, 2.0, 2.0, 2.0]
+
+
+def test_normalize_curve_knots():
+    curve_data = {'shape': {'degree': 1, 'form': 1, 'cvs': [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]}}
+    normalized = nurbs.normalize_curve_knots(curve_data)
+    assert normalized['shape']['knots'] == [0.0, 0.0, 1.0, 1.0]
+    assert 'knots' not in curve_data['shape']
+
+
+def test_evaluate_open_curve(use_numpy):
+    shape_data = {'degree': 3, 'form': 1, 'cvs': [[0.0, 0.0, 0.0], [1.0, 2.0, 0.0], [3.0, 2.0, 0.0], [4.0, 0.0, 0.0]]}
+    points = nurbs.sample_shape(shape_data, count=3)
+    assert list(points[0]) == [0.0, 0.0, 0.0]
+    assert list(points[1]) == pytest.approx([2.0, 1.5, 0.0])
+    assert list(points[2]) == [4.0, 0.0, 0.0]
+    assert nurbs.evaluate_tangent(shape_data, 0.0) == pytest.approx([3.0, 6.0, 0.0])
+    assert nurbs.evaluate_tangent(shape_data, 0.5, normalize=True) == pytest.approx([1.0, 0.0, 0.0])
+
+
+def test_evaluate_periodic_curve(use_numpy):
+    cvs = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, -1.0, 0.0]]
+    shape_data = {'degree': 3, 'form': nurbs.FORM_PERIODIC, 'cvs': cvs + cvs[:3]}
+    points = nurbs.sample_shape(shape_data, count=9)
+    assert list(points[0]) == pytest.approx(list(points[-1]))
+    for point in points:
+        assert (point[0] ** 2 + point[1] ** 2) ** 0.5 == pytest.approx(2.0 / 3.0, abs=0.05)
@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves root paths resolution
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('tpDcc.libs.python')
+
+from tpDcc.libs.curves.core import roots
+
+
+def test_resolve_order(tmp_path, monkeypatch):
+    config_path, env_path, other_path = [tmp_path / name for name in ('config', 'env', 'other')]
+    for root_path in (config_path, env_path, other_path):
+        root_path.mkdir()
+    monkeypatch.setenv(roots.CURVES_PATH_ENV, os.pathsep.join([str(env_path), str(config_path), '']))
+
+    root_paths = roots.CurveRootPaths(lambda: [str(config_path), str(tmp_path / 'missing')])
+    assert [os.path.basename(root_path) for root_path in root_paths] == ['config', 'env']
+    assert os.path.basename(root_paths.default_path) == 'config'
+
+    # Changes of the environment variable or missing paths being created invalidate resolved paths
+    monkeypatch.setenv(roots.CURVES_PATH_ENV, str(other_path))
+    assert [os.path.basename(root_path) for root_path in root_paths] == ['config', 'other']
+    (tmp_path / 'missing').mkdir()
+    assert [os.path.basename(root_path) for root_path in root_paths] == ['config', 'missing', 'other']
+
+
+def test_resolve_once(tmp_path, monkeypatch):
+    monkeypatch.setenv(roots.CURVES_PATH_ENV, str(tmp_path))
+    calls = list()
+    root_paths = roots.CurveRootPaths(lambda: calls.append(True))
+    for _ in range(3):
+        assert len(root_paths) == 1
+    assert len(calls) == 1
+
+    root_paths.invalidate()
+    assert root_paths.paths
+    assert len(calls) == 2
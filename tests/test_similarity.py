@@ -0,0 +1,36 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves similarity functions
+"""
+
+import pytest
+
+from tpDcc.libs.curves.core import similarity
+
+CIRCLE_CVS = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, -1.0, 0.0]]
+CURVES = {
+    'circle': {'circleShape': {'degree': 3, 'form': 3, 'cvs': CIRCLE_CVS + CIRCLE_CVS[:3]}},
+    'line': {'lineShape': {'degree': 1, 'form': 1, 'cvs': [[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0]]}},
+    'square': {'squareShape': {'degree': 1, 'form': 1, 'cvs': [
+        [-1.0, -1.0, 0.0], [1.0, -1.0, 0.0], [1.0, 1.0, 0.0], [-1.0, 1.0, 0.0], [-1.0, -1.0, 0.0]]}}
+}
+
+
+def test_similarity_index(use_numpy):
+    similarity_index = similarity.SimilarityIndex()
+    for curve_name, curve_data in CURVES.items():
+        similarity_index.add(curve_name, curve_data)
+    assert len(similarity_index) == 3
+
+    # Same square, but scaled, moved and with a different shape name and start point
+    query = {'otherShape': {'degree': 1, 'form': 1, 'cvs': [
+        [x * 3.0 + 5.0, y * 3.0, 2.0] for x, y, _ in CURVES['square']['squareShape']['cvs'][1:] + [[1.0, -1.0, 0.0]]]}}
+    results = similarity_index.query(query, count=2)
+    assert [curve_name for curve_name, _ in results] == ['square', 'circle']
+    assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+    assert similarity_index.query(query, count=1, exclude=['square'])[0][0] == 'circle'
+
+    assert similarity_index.remove('square')
+    assert similarity_index.query(query, count=1)[0][0] == 'circle'
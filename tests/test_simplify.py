@@ -0,0 +1,53 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves simplify functions
+"""
+
+import math
+
+import pytest
+
+from tpDcc.libs.curves.core import nurbs, simplify
+
+
+def test_simplify_polyline_shape():
+    cvs = [[float(i), 0.0, 0.0] for i in range(10)] + [[9.0, float(i), 0.0] for i in range(1, 10)]
+    shape_data = {'degree': 1, 'form': 1, 'knots': [float(i) for i in range(len(cvs))], 'cvs': cvs}
+    simplified, report = simplify.simplify_shape(shape_data)
+    assert simplified['cvs'] == [[0.0, 0.0, 0.0], [9.0, 0.0, 0.0], [9.0, 9.0, 0.0]]
+    assert simplified['knots'] == [0.0, 1.0, 2.0]
+    assert report == {'cvs_count_before': 19, 'cvs_count_after': 3, 'max_deviation': 0.0}
+    assert len(shape_data['cvs']) == 19
+
+
+def test_simplify_periodic_shape():
+    if simplify.numpy is None:
+        pytest.skip('NumPy is not available')
+
+    count = 100
+    cvs = [[math.cos(2.0 * math.pi * i / count), math.sin(2.0 * math.pi * i / count), 0.0] for i in range(count)]
+    shape_data = {'degree': 3, 'form': 3, 'cvs': cvs + cvs[:3]}
+    simplified, report = simplify.simplify_shape(shape_data, tolerance=0.001)
+    assert report['cvs_count_after'] < 20
+    assert report['max_deviation'] <= 0.001
+    assert simplified['cvs'][-3:] == simplified['cvs'][:3]
+    radius = sum(sum(value * value for value in point) ** 0.5 for point in nurbs.sample_shape(shape_data, 8)) / 8
+    for point in nurbs.sample_shape(simplified, count=50):
+        assert sum(value * value for value in point) ** 0.5 == pytest.approx(radius, abs=0.001)
+
+
+def test_curve_lods():
+    cvs = [[float(i), 0.0, 0.0] for i in range(10)] + [[9.0, float(i), 0.0] for i in range(1, 10)]
+    curve_data = {'shape': {'degree': 1, 'form': 1, 'cvs': cvs}}
+    levels = [{'tolerance': 0.0}, {'max_cvs': 2}]
+    lod_curve_data = simplify.add_curve_lods(curve_data, levels=levels)
+    assert [len(lod['cvs']) for lod in lod_curve_data['shape']['lods']] == [3, 2]
+
+    assert simplify.get_curve_lod(lod_curve_data, lod=0)['shape']['cvs'] == cvs
+    assert 'lods' not in simplify.get_curve_lod(lod_curve_data, lod=0)['shape']
+    assert simplify.get_curve_lod(lod_curve_data, lod=1)['shape']['cvs'] == [
+        [0.0, 0.0, 0.0], [9.0, 0.0, 0.0], [9.0, 9.0, 0.0]]
+    assert simplify.get_curve_lod(lod_curve_data, lod=5)['shape']['cvs'] == [[0.0, 0.0, 0.0], [9.0, 9.0, 0.0]]
+    assert simplify.get_curve_lod(curve_data, lod=2, levels=levels)['shape']['knots'] == [0.0, 1.0]
@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves SQLite catalog
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip('tpDcc.libs.python')
+
+from tpDcc.libs.curves.core import sqlcatalog
+
+if not sqlcatalog.is_available():
+    pytest.skip('SQLite is not available', allow_module_level=True)
+
+
+def _write_curve(curve_path, size):
+    curve_data = {'squareShape': {'degree': 1, 'form': 1, 'cvs': [
+        [-size, 0.0, -size], [size, 0.0, -size], [size, 0.0, size], [-size, 0.0, size], [-size, 0.0, -size]]}}
+    curve_path.write_text(json.dumps(curve_data))
+
+
+def test_sql_catalog(tmp_path):
+    show_path, studio_path = tmp_path / 'show', tmp_path / 'studio'
+    (studio_path / 'sub').mkdir(parents=True)
+    show_path.mkdir()
+    _write_curve(studio_path / 'square.curve', 1.0)
+    _write_curve(studio_path / 'sub' / 'big_square.curve', 5.0)
+    _write_curve(show_path / 'square.curve', 2.0)
+
+    loaded_paths = list()
+
+    def _load(curve_path):
+        loaded_paths.append(curve_path)
+        return sqlcatalog._load_curve_file(curve_path)
+
+    root_paths = [str(show_path), str(studio_path)]
+    database_path = str(tmp_path / 'curves.db')
+    sql_catalog = sqlcatalog.SqlCurveCatalog(root_paths, database_path, curve_loader=_load)
+    assert sql_catalog.get_curve_names() == ['square', 'big_square']
+    assert sql_catalog.find_curve_path('square') == str(show_path / 'square.curve')
+    assert len(sql_catalog.get_curve_providers('square')) == 2
+    assert [row['name'] for row in sql_catalog.query(min_size=5.0)] == ['big_square']
+    assert len(sql_catalog.query(name_pattern='*square', include_shadowed=True)) == 3
+    assert sql_catalog.set_curve_tags(str(studio_path / 'sub' / 'big_square.curve'), ['fk', 'big'])
+    assert [row['name'] for row in sql_catalog.query(tags=['big', 'fk'])] == ['big_square']
+    assert not sql_catalog.query(tags=['big', 'ik'])
+    sql_catalog.close()
+
+    # Database persists between sessions and only changed curve files are parsed again
+    (show_path / 'square.curve').unlink()
+    sql_catalog = sqlcatalog.SqlCurveCatalog(root_paths, database_path, curve_loader=_load)
+    assert len(loaded_paths) == 3
+    assert sql_catalog.find_curve_path('square') == str(studio_path / 'square.curve')
+    assert len(loaded_paths) == 3
+    assert sql_catalog.get_tags() == {'big': 1, 'fk': 1}
+    sql_catalog.close()
+
+
+def test_sql_catalog_move_curve(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    _write_curve(tmp_path / 'square.curve', 1.0)
+    sql_catalog = sqlcatalog.SqlCurveCatalog([str(tmp_path)], str(tmp_path / 'curves.db'))
+    assert sql_catalog.set_curve_tags(str(tmp_path / 'square.curve'), ['fk'])
+
+    (tmp_path / 'square.curve').rename(tmp_path / 'sub' / 'box.curve')
+    assert sql_catalog.move_curve_path(str(tmp_path / 'square.curve'), str(tmp_path / 'sub' / 'box.curve'))
+    assert sql_catalog.get_curve_names() == ['box']
+    assert sql_catalog.get_curve_tags(str(tmp_path / 'sub' / 'box.curve')) == ['fk']
+    assert [row['name'] for row in sql_catalog.query(tags=['fk'])] == ['box']
+    sql_catalog.close()
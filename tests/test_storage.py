@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves storage functions
+"""
+
+import os
+import json
+import stat
+
+import pytest
+
+from tpDcc.libs.curves.core import storage
+
+
+def test_write_json_file(tmp_path):
+    curve_path = tmp_path / 'circle.curve'
+    curve_path.write_text('old contents')
+
+    storage.write_json_file({'circleShape': {'degree': 3}}, str(curve_path))
+
+    assert json.loads(curve_path.read_text()) == {'circleShape': {'degree': 3}}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['.circle.curve.lock', 'circle.curve']
+
+
+def test_write_file_atomic_failure(tmp_path, monkeypatch):
+    curve_path = tmp_path / 'circle.curve'
+    curve_path.write_text('old contents')
+
+    def _replace(source_path, target_path):
+        raise OSError('rename failed')
+
+    monkeypatch.setattr(storage, '_replace', _replace)
+    with pytest.raises(OSError):
+        storage.write_file_atomic(str(curve_path), b'new contents')
+
+    # Target file is untouched and temporary file is removed
+    assert curve_path.read_text() == 'old contents'
+    assert [path.name for path in tmp_path.iterdir()] == ['circle.curve']
+
+
+@pytest.mark.skipif(storage.fcntl is None, reason='fcntl is not available')
+def test_file_lock_timeout(tmp_path):
+    curve_path = str(tmp_path / 'circle.curve')
+    with storage.file_lock(curve_path):
+        # flock locks belong to open file descriptions, so a second lock from the same process also conflicts
+        with pytest.raises(storage.FileLockTimeoutError):
+            storage.write_json_file({}, curve_path, timeout=0.1)
+
+
+def test_get_cache_path(tmp_path, monkeypatch):
+    monkeypatch.setenv(storage.CACHE_PATH_ENV, str(tmp_path / 'cache'))
+    curves_path = str(tmp_path / 'curves')
+
+    cache_path = storage.get_cache_path(curves_path)
+    assert os.path.isdir(cache_path)
+    assert os.path.dirname(cache_path) == str(tmp_path / 'cache')
+    assert storage.get_cache_path([curves_path]) == cache_path
+    assert storage.get_cache_path([curves_path, str(tmp_path / 'show')], create=False) != cache_path
+
+
+def test_write_file_atomic_mode(tmp_path):
+    curve_path = tmp_path / 'circle.curve'
+    storage.write_file_atomic(str(curve_path), b'{}')
+    assert stat.S_IMODE(os.stat(str(curve_path)).st_mode) == 0o666 & ~storage._get_umask()
+
+    # Permissions of replaced files are kept
+    os.chmod(str(curve_path), 0o640)
+    storage.write_file_atomic(str(curve_path), b'{"circleShape": {}}')
+    assert stat.S_IMODE(os.stat(str(curve_path)).st_mode) == 0o640
@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves tessellation functions
+"""
+
+import pytest
+
+from tpDcc.libs.curves.core import nurbs, tessellation
+
+CIRCLE_CVS = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, -1.0, 0.0]]
+CIRCLE_SHAPE = {'degree': 3, 'form': 3, 'cvs': CIRCLE_CVS + CIRCLE_CVS[:3]}
+ARC_SHAPE = {'degree': 3, 'form': 1, 'cvs': [[0.0, 0.0, 0.0], [1.0, 2.0, 0.0], [3.0, 2.0, 0.0], [4.0, 0.0, 0.0]]}
+
+
+def _get_points(polyline):
+    values = [float(value) for value in (polyline.reshape(-1) if hasattr(polyline, 'reshape') else polyline)]
+
+    return [values[i:i + 3] for i in range(0, len(values), 3)]
+
+
+def test_tessellate_linear_shape(use_numpy):
+    shape_data = {'degree': 1, 'form': 1, 'cvs': [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0]]}
+    assert _get_points(tessellation.tessellate_shape(shape_data)) == shape_data['cvs']
+
+
+def test_tessellate_shape_tolerance(use_numpy):
+    # Without subdivisions only the knot spans limits are evaluated
+    assert len(_get_points(tessellation.tessellate_shape(ARC_SHAPE, max_depth=0))) == 2
+
+    loose_points = _get_points(tessellation.tessellate_shape(ARC_SHAPE, tolerance=0.1))
+    tight_points = _get_points(tessellation.tessellate_shape(ARC_SHAPE, tolerance=0.001))
+    assert 2 < len(loose_points) < len(tight_points)
+    for points in (loose_points, tight_points):
+        assert points[0] == pytest.approx([0.0, 0.0, 0.0], abs=1e-6)
+        assert points[-1] == pytest.approx([4.0, 0.0, 0.0], abs=1e-6)
+
+    # Polyline vertices lie on the curve
+    curve_points = [[float(value) for value in point] for point in nurbs.sample_shape(ARC_SHAPE, count=256)]
+    for point in tight_points:
+        assert min(sum((a - b) ** 2 for a, b in zip(point, curve_point)) ** 0.5 for curve_point in curve_points) < 0.05
+
+
+def test_tessellation_cache(use_numpy, monkeypatch):
+    tessellated_shapes = list()
+    tessellate_shape = tessellation.tessellate_shape
+
+    def _tessellate_shape(shape_data, **kwargs):
+        tessellated_shapes.append(shape_data)
+        return tessellate_shape(shape_data, **kwargs)
+
+    monkeypatch.setattr(tessellation, 'tessellate_shape', _tessellate_shape)
+
+    polylines = tessellation.tessellate_curve({'circleShape': CIRCLE_SHAPE, 'arcShape': ARC_SHAPE})
+    assert list(polylines.keys()) == ['circleShape', 'arcShape']
+    assert len(tessellated_shapes) == 2
+
+    # Cache is keyed by shape geometry hash, so shapes of other curves with the same geometry are not tessellated
+    other_circle = dict(CIRCLE_SHAPE, color=[1.0, 0.0, 0.0])
+    other_polylines = tessellation.tessellate_curve({'ringShape': other_circle})
+    assert len(tessellated_shapes) == 2
+    assert _get_points(other_polylines['ringShape']) == _get_points(polylines['circleShape'])
+
+    tessellation.tessellate_curve({'ringShape': other_circle}, tolerance=0.1)
+    assert len(tessellated_shapes) == 3
+
+    # Cached polylines cannot be modified by callers
+    polyline = tessellation.tessellate_curve({'arcShape': ARC_SHAPE})['arcShape']
+    if tessellation.numpy is not None:
+        assert not polyline.flags.writeable
+    else:
+        polyline[0] = 1.0
+        assert tessellation.tessellate_curve({'arcShape': ARC_SHAPE})['arcShape'][0] == 0.0
@@ -0,0 +1,65 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves thumbnails functions
+"""
+
+import json
+import zlib
+
+from tpDcc.libs.curves.core import storage, thumbnails
+
+CURVE_DATA = {
+    'squareShape': {
+        'degree': 1, 'form': 1,
+        'cvs': [[-1.0, 0.0, -1.0], [1.0, 0.0, -1.0], [1.0, 0.0, 1.0], [-1.0, 0.0, 1.0], [-1.0, 0.0, -1.0]]}
+}
+
+
+def test_render_curve(use_numpy):
+    pixels = thumbnails.render_curve(CURVE_DATA, size=16, margin=2)
+    alphas = [pixels[i] for i in range(3, len(pixels), 4)]
+
+    # Square lies in the XZ plane, so it is looked from the top and its outline fills the image minus the margins
+    assert [alphas[2 * 16 + column] for column in range(16)] == [0] * 2 + [255] * 12 + [0] * 2
+    assert [alphas[row * 16 + 2] for row in range(16)] == [0] * 2 + [255] * 12 + [0] * 2
+    assert alphas[8 * 16 + 8] == 0
+
+
+def test_render_curve_png():
+    png = thumbnails.render_curve_png(CURVE_DATA, size=16, view_axis='z')
+    assert png.startswith(b'\x89PNG\r\n\x1a\n')
+    raw_data = zlib.decompress(png[41:-12])
+    assert len(raw_data) == 16 * (16 * 4 + 1)
+
+
+def test_thumbnail_cache(tmp_path):
+    curve_path = tmp_path / 'square.curve'
+    curve_path.write_text(json.dumps(CURVE_DATA))
+    loaded_paths = list()
+
+    def _load(path):
+        loaded_paths.append(path)
+        with open(path) as fh:
+            return json.load(fh)
+
+    thumbnails_cache = thumbnails.ThumbnailCache(str(tmp_path), thumbnails_path=str(tmp_path / 'cache'))
+    thumbnail_path = thumbnails_cache.get_thumbnail(str(curve_path), _load, size=16)
+    assert thumbnail_path and open(thumbnail_path, 'rb').read().startswith(b'\x89PNG')
+    assert thumbnails.ThumbnailCache(str(tmp_path), thumbnails_path=str(tmp_path / 'cache')).get_thumbnail(
+        str(curve_path), _load, size=16) == thumbnail_path
+    assert len(loaded_paths) == 1
+
+
+def test_thumbnail_cache_path(tmp_path, monkeypatch):
+    monkeypatch.setenv(storage.CACHE_PATH_ENV, str(tmp_path / 'cache'))
+    curves_path = tmp_path / 'curves'
+    curves_path.mkdir()
+    (curves_path / 'square.curve').write_text(json.dumps(CURVE_DATA))
+
+    # Thumbnails are stored out of the curves root path, so its contents do not change
+    thumbnails_cache = thumbnails.ThumbnailCache(str(curves_path))
+    thumbnail_path = thumbnails_cache.get_thumbnail(str(curves_path / 'square.curve'), lambda path: CURVE_DATA, size=16)
+    assert thumbnail_path.startswith(str(tmp_path / 'cache'))
+    assert [path.name for path in curves_path.iterdir()] == ['square.curve']
@@ -0,0 +1,79 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-curves watcher
+"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip('tpDcc.libs.python')
+
+from tpDcc.libs.curves.core import watcher
+
+
+def _get_events(curves_watcher, timeout=1.0):
+    start_time = time.time()
+    while time.time() - start_time < timeout:
+        events = curves_watcher.poll(0.1)
+        if events:
+            return sorted((event.type, os.path.basename(event.path)) for event in events)
+
+    return list()
+
+
+@pytest.mark.parametrize('use_inotify', [True, False], ids=['inotify', 'polling'])
+def test_watcher_events(tmp_path, use_inotify):
+    if use_inotify and not watcher._get_libc():
+        pytest.skip('inotify is not available')
+
+    (tmp_path / 'circle.curve').write_text('{}')
+    curves_watcher = watcher.CurveWatcher([str(tmp_path)], coalesce_delay=0.05, use_inotify=use_inotify)
+    notified_events = list()
+    curves_watcher.add_callback(notified_events.append)
+    curves_watcher.start(threaded=False)
+    try:
+        assert isinstance(curves_watcher.backend, watcher.InotifyBackend) == use_inotify
+        assert [os.path.basename(path) for path in curves_watcher.get_curve_paths()] == ['circle.curve']
+
+        # Directory modification times may have a coarse resolution
+        time.sleep(0.01 if use_inotify else 1.1)
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'sub' / 'square.curve').write_text('{}')
+        (tmp_path / 'notes.txt').write_text('')
+        assert _get_events(curves_watcher) == [('created', 'square.curve')]
+
+        time.sleep(0.01 if use_inotify else 1.1)
+        (tmp_path / 'circle.curve').rename(tmp_path / 'ring.curve')
+        assert _get_events(curves_watcher) == [('moved', 'ring.curve')]
+
+        time.sleep(0.01 if use_inotify else 1.1)
+        temp_path = tmp_path / '.ring.curve.tmp'
+        temp_path.write_text('{"ringShape": {}}')
+        os.rename(str(temp_path), str(tmp_path / 'ring.curve'))
+        (tmp_path / 'sub' / 'square.curve').unlink()
+        assert _get_events(curves_watcher) == [('deleted', 'square.curve'), ('modified', 'ring.curve')]
+        assert len(notified_events) == 3
+    finally:
+        curves_watcher.stop()
+
+
+def test_watcher_thread(tmp_path):
+    curves_watcher = watcher.CurveWatcher([str(tmp_path)], interval=0.05, coalesce_delay=0.05)
+    notified_events = list()
+    curves_watcher.add_callback(notified_events.extend)
+    curves_watcher.start()
+    try:
+        time.sleep(1.1)
+        (tmp_path / 'circle.curve').write_text('{}')
+        start_time = time.time()
+        while not notified_events and time.time() - start_time < 3.0:
+            time.sleep(0.05)
+        assert [(event.type, os.path.basename(event.path)) for event in notified_events] == [
+            ('created', 'circle.curve')]
+    finally:
+        curves_watcher.stop()
+    assert not curves_watcher.running
@@ -8,33 +8,40 @@ Initialization module for tpDcc-libs-curves
 from __future__ import print_function, division, absolute_import
 
 import os
-import logging.config
+import logging
 
 from tpDcc.libs.curves.core import consts
 
 logger = logging.getLogger(consts.LIB_ID)
 
+_LOGGER_CREATED = False
+
 
 def create_logger(dev=False):
     """
-    Creates logger for current tpDcc-libs-curves package
+    Creates logger for current tpDcc-libs-curves package. Logger is configured only the first time this function is
+    called, so importing the package does not touch the file system.
     """
 
+    global _LOGGER_CREATED
+    if _LOGGER_CREATED:
+        return logging.getLogger(consts.LIB_ID)
+
+    from logging import config
+
     logger_directory = os.path.normpath(os.path.join(os.path.expanduser('~'), 'tpDcc', 'logs', 'libs'))
     if not os.path.isdir(logger_directory):
         os.makedirs(logger_directory)
 
     logging_config = os.path.normpath(os.path.join(os.path.dirname(__file__), '__logging__.ini'))
 
-    logging.config.fileConfig(logging_config, disable_existing_loggers=False)
+    config.fileConfig(logging_config, disable_existing_loggers=False)
     logger = logging.getLogger('tpDcc-libs-curves')
     dev = os.getenv('TPDCC_DEV', dev)
     if dev:
         logger.setLevel(logging.DEBUG)
         for handler in logger.handlers:
             handler.setLevel(logging.DEBUG)
+    _LOGGER_CREATED = True
 
     return logger
-
-
-create_logger()
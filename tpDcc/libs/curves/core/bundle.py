@@ -0,0 +1,559 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to compile curve data into binary bundle files and to read them back.
+
+Bundle layout (little endian):
+    - Header: magic, version, counts and the offsets of the rest of sections
+    - Names: UTF-8 blob that stores curve names, curve relative paths and shape names
+    - Curves table: one record per curve (name, relative path, first shape, shape count, source file size and mtime)
+    - Shapes table: one record per shape (name, degree, form, knots offset/count, cvs offset/count/dimension)
+    - Metadata: JSON blob with source directories mtimes and the non geometric keys of each shape
+    - Floats: contiguous float64 array (8 bytes aligned) that stores all knots and CVs
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import io
+import os
+import sys
+import json
+import mmap
+import array
+import struct
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpDcc.libs.curves.core import geometry, storage
+
+MAGIC = b'TPCURVES'
+VERSION = 1
+
+HEADER_STRUCT = struct.Struct('<8sIIIIQQQQQQQQ')
+CURVE_STRUCT = struct.Struct('<IIIIIIQd')
+SHAPE_STRUCT = struct.Struct('<IIiiQqQII')
+
+GEOMETRY_KEYS = ('degree', 'form', 'knots', 'cvs')
+
+
+class CurveBundleError(Exception):
+    pass
+
+
+def _align(offset, alignment=8):
+    """
+    Internal function that returns given offset aligned to the given alignment
+    :param offset: int
+    :param alignment: int
+    :return: int
+    """
+
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _floats_from_bytes(data):
+    """
+    Internal function that converts given little endian float64 buffer into a float array
+    :param data: bytes
+    :return: array.array
+    """
+
+    floats = array.array('d')
+    if hasattr(floats, 'frombytes'):
+        floats.frombytes(data)
+    else:
+        floats.fromstring(data)
+    if sys.byteorder != 'little':
+        floats.byteswap()
+
+    return floats
+
+
+def _floats_to_bytes(floats):
+    """
+    Internal function that converts given float array into a little endian float64 buffer
+    :param floats: array.array
+    :return: bytes
+    """
+
+    if sys.byteorder != 'little':
+        floats = array.array('d', floats)
+        floats.byteswap()
+
+    return floats.tobytes() if hasattr(floats, 'tobytes') else floats.tostring()
+
+
+class _NamesTable(object):
+    """
+    Internal class used to build the names section of a bundle
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = dict()
+
+    @property
+    def data(self):
+        return bytes(self._data)
+
+    def add(self, name):
+        encoded = name.encode('utf-8')
+        if encoded not in self._offsets:
+            self._offsets[encoded] = len(self._data)
+            self._data.extend(encoded)
+        return self._offsets[encoded], len(encoded)
+
+
+def write_bundle(bundle_path, curves, directories=None):
+    """
+    Compiles given curves into a binary bundle file
+    :param bundle_path: str, path where bundle file will be written
+    :param curves: list(tuple(str, str, dict, int, float)), list of curves to bundle. Each curve is defined by its
+        name, its path relative to the curves root, its curve data, the size of its source file and the modification
+        time of its source file
+    :param directories: list(tuple(str, float, list(str), list(str))) or None, relative path, mtime, sub directory
+        names and curve file names of each source directory
+    :return: str, bundle path
+    """
+
+    names = _NamesTable()
+    floats = array.array('d')
+    curve_records = list()
+    shape_records = list()
+    shape_templates = list()
+    curves_metadata = OrderedDict()
+
+    for curve_name, relative_path, curve_data, file_size, file_mtime in curves:
+        name_offset, name_length = names.add(curve_name)
+        path_offset, path_length = names.add(relative_path.replace('\\', '/'))
+        first_shape = len(shape_records)
+        for shape_name, shape_data in curve_data.items():
+            shape_name_offset, shape_name_length = names.add(shape_name)
+            knots = shape_data.get('knots', None)
+            if knots is None:
+                knots_offset, knots_count = 0, -1
+            else:
+                knots_offset, knots_count = len(floats), len(knots)
+                floats.extend(float(knot) for knot in knots)
+            cvs = shape_data.get('cvs', None) or list()
+            cvs_dimension = len(cvs[0]) if cvs else 3
+            cvs_offset = len(floats)
+            for cv in cvs:
+                if len(cv) != cvs_dimension:
+                    raise CurveBundleError(
+                        'Curve "{}" shape "{}" has CVs with different dimensions'.format(curve_name, shape_name))
+                floats.extend(float(value) for value in cv)
+            shape_records.append(SHAPE_STRUCT.pack(
+                shape_name_offset, shape_name_length, int(shape_data.get('degree', -1)),
+                int(shape_data.get('form', -1)), knots_offset, knots_count, cvs_offset, len(cvs), cvs_dimension))
+            shape_templates.append(OrderedDict(
+                (key, None if key in GEOMETRY_KEYS else value) for key, value in shape_data.items()))
+        curves_metadata[curve_name] = geometry.get_curve_metadata(curve_data)
+        curve_records.append(CURVE_STRUCT.pack(
+            name_offset, name_length, path_offset, path_length, first_shape, len(shape_records) - first_shape,
+            int(file_size or 0), float(file_mtime or 0.0)))
+
+    directories = [[directory[0].replace('\\', '/')] + list(directory[1:]) for directory in directories or list()]
+    metadata = json.dumps(
+        {'directories': directories,
+         'shapes': shape_templates, 'curves': curves_metadata}, separators=(',', ':')).encode('utf-8')
+    names_data = names.data
+
+    names_offset = HEADER_STRUCT.size
+    curves_offset = names_offset + len(names_data)
+    shapes_offset = curves_offset + CURVE_STRUCT.size * len(curve_records)
+    metadata_offset = shapes_offset + SHAPE_STRUCT.size * len(shape_records)
+    floats_offset = _align(metadata_offset + len(metadata))
+
+    header = HEADER_STRUCT.pack(
+        MAGIC, VERSION, len(curve_records), len(shape_records), 0, names_offset, len(names_data), curves_offset,
+        shapes_offset, metadata_offset, len(metadata), floats_offset, len(floats))
+
+    # Bundle is replaced instead of overwritten, so memory maps of the previous bundle keep reading its old contents
+    padding = b'\0' * (floats_offset - metadata_offset - len(metadata))
+    contents = b''.join([header, names_data] + curve_records + shape_records + [metadata, padding])
+    contents += _floats_to_bytes(floats)
+
+    return storage.write_file_atomic(bundle_path, contents)
+
+
+class CurveBundle(object):
+    """
+    Class that gives access to the curves stored in a binary bundle file
+    """
+
+    def __init__(self, buffer, bundle_path=None):
+        super(CurveBundle, self).__init__()
+
+        self._buffer = buffer
+        self._bundle_path = bundle_path
+        self._floats = None
+
+        if len(buffer) < HEADER_STRUCT.size:
+            raise CurveBundleError('Invalid curves bundle: "{}"'.format(bundle_path))
+        header = HEADER_STRUCT.unpack_from(buffer, 0)
+        if header[0] != MAGIC:
+            raise CurveBundleError('Invalid curves bundle: "{}"'.format(bundle_path))
+        if header[1] != VERSION:
+            raise CurveBundleError('Curves bundle version {} not supported: "{}"'.format(header[1], bundle_path))
+        (_, _, curve_count, shape_count, _, names_offset, names_size, curves_offset, shapes_offset,
+         metadata_offset, metadata_size, floats_offset, floats_count) = header
+        self._names_offset = names_offset
+        self._shapes_offset = shapes_offset
+        self._floats_offset = floats_offset
+        self._floats_count = floats_count
+        self._shape_count = shape_count
+
+        metadata = json.loads(
+            bytes(buffer[metadata_offset:metadata_offset + metadata_size]).decode('utf-8'),
+            object_pairs_hook=OrderedDict)
+        self._directories = [tuple(directory) for directory in metadata.get('directories', list())]
+        self._shape_templates = metadata.get('shapes', list())
+        self._curves_metadata = metadata.get('curves', dict())
+
+        self._curves = OrderedDict()        # curve name > (relative path, first shape, shape count, size, mtime)
+        self._paths = dict()                # relative path > curve name
+        for i in range(curve_count):
+            (name_offset, name_length, path_offset, path_length, first_shape, shapes, file_size,
+             file_mtime) = CURVE_STRUCT.unpack_from(buffer, curves_offset + i * CURVE_STRUCT.size)
+            curve_name = self._get_name(name_offset, name_length)
+            relative_path = self._get_name(path_offset, path_length)
+            if curve_name in self._curves:
+                continue
+            self._curves[curve_name] = (relative_path, first_shape, shapes, file_size, file_mtime)
+            self._paths[relative_path] = curve_name
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def bundle_path(self):
+        return self._bundle_path
+
+    @property
+    def directories(self):
+        return list(self._directories)
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def get_curve_names(self):
+        """
+        Returns the names of all curves stored in the bundle
+        :return: list(str)
+        """
+
+        return list(self._curves.keys())
+
+    def has_curve(self, curve_name):
+        """
+        Returns whether a curve with given name is stored in the bundle
+        :param curve_name: str
+        :return: bool
+        """
+
+        return curve_name in self._curves
+
+    def get_curve_name(self, relative_path):
+        """
+        Returns the name of the curve whose source file is located in the given relative path
+        :param relative_path: str
+        :return: str or None
+        """
+
+        return self._paths.get(relative_path.replace('\\', '/'), None)
+
+    def get_relative_path(self, curve_name):
+        """
+        Returns source file path, relative to bundle curves root, of the curve with given name
+        :param curve_name: str
+        :return: str or None
+        """
+
+        curve_info = self._curves.get(curve_name, None)
+
+        return curve_info[0] if curve_info else None
+
+    def get_source_stat(self, curve_name):
+        """
+        Returns the size and modification time source file of the given curve had when bundle was compiled
+        :param curve_name: str
+        :return: tuple(int, float) or None
+        """
+
+        curve_info = self._curves.get(curve_name, None)
+
+        return (curve_info[3], curve_info[4]) if curve_info else None
+
+    def iterate_shape_records(self, curve_name):
+        """
+        Iterates over the raw shape records of the given curve
+        :param curve_name: str
+        :return: generator(tuple(int, str, int, int, int, int, int, int, int)), shape index, shape name, degree, form,
+            knots offset, knots count, cvs offset, cvs count and cvs dimension
+        """
+
+        curve_info = self._curves.get(curve_name, None)
+        if not curve_info:
+            return
+        first_shape, shape_count = curve_info[1], curve_info[2]
+        for shape_index in range(first_shape, first_shape + shape_count):
+            (name_offset, name_length, degree, form, knots_offset, knots_count, cvs_offset, cvs_count,
+             cvs_dimension) = SHAPE_STRUCT.unpack_from(
+                self._buffer, self._shapes_offset + shape_index * SHAPE_STRUCT.size)
+            yield (shape_index, self._get_name(name_offset, name_length), degree, form, knots_offset, knots_count,
+                   cvs_offset, cvs_count, cvs_dimension)
+
+    def get_shapes_info(self, curve_name):
+        """
+        Returns basic info of all the shapes of the given curve without decoding their knots and CVs
+        :param curve_name: str
+        :return: list(dict), list of dictionaries containing name, degree, form, knots count, cvs count and shape
+            parent of each shape
+        """
+
+        shapes_info = list()
+        for (shape_index, shape_name, degree, form, _, knots_count, _, cvs_count,
+             _) in self.iterate_shape_records(curve_name):
+            shapes_info.append({
+                'name': shape_name,
+                'degree': degree,
+                'form': form,
+                'knots_count': knots_count,
+                'cvs_count': cvs_count,
+                'shape_parent': self._shape_templates[shape_index].get('shape_parent', None)
+            })
+
+        return shapes_info
+
+    def get_curve_metadata(self, curve_name):
+        """
+        Returns the metadata (bounds and shape statistics) of the given curve computed when the bundle was compiled
+        :param curve_name: str
+        :return: dict or None
+        """
+
+        return self._curves_metadata.get(curve_name, None)
+
+    def get_curve_data(self, curve_name):
+        """
+        Returns the curve data of the given curve with the same structure stored in curve files
+        :param curve_name: str
+        :return: OrderedDict or None
+        """
+
+        if curve_name not in self._curves:
+            return None
+
+        floats = self._get_floats()
+        curve_data = OrderedDict()
+        for (shape_index, shape_name, degree, form, knots_offset, knots_count, cvs_offset, cvs_count,
+             cvs_dimension) in self.iterate_shape_records(curve_name):
+            shape_geometry = {
+                'degree': degree,
+                'form': form,
+                'knots': floats[knots_offset:knots_offset + knots_count].tolist() if knots_count >= 0 else None,
+                'cvs': [floats[i:i + cvs_dimension].tolist() for i in range(
+                    cvs_offset, cvs_offset + cvs_count * cvs_dimension, cvs_dimension)]
+            }
+            shape_data = OrderedDict()
+            for key, value in self._shape_templates[shape_index].items():
+                shape_data[key] = shape_geometry[key] if key in GEOMETRY_KEYS else value
+            curve_data[shape_name] = shape_data
+
+        return curve_data
+
+    def get_directories_state(self, curves_path):
+        """
+        Returns current modification time of the source directories of the bundle located in the given curves path.
+        It is a cheap way to detect curve files created, removed or renamed since the bundle was validated.
+        :param curves_path: str, root directory bundle was compiled from
+        :return: tuple(float or None)
+        """
+
+        directories_state = list()
+        for directory in self._directories:
+            try:
+                directories_state.append(os.stat(os.path.join(curves_path, directory[0])).st_mtime)
+            except OSError:
+                directories_state.append(None)
+
+        return tuple(directories_state)
+
+    def is_up_to_date(self, curves_path):
+        """
+        Returns whether bundle data is still valid for the source files located in the given curves path.
+        Bundle is considered outdated if the curve files or sub directories of any of its source directories or the
+        bundled curve files changed since it was compiled.
+        :param curves_path: str, root directory bundle was compiled from
+        :return: bool
+        """
+
+        for directory in self._directories:
+            directory_path = os.path.join(curves_path, directory[0])
+            try:
+                if os.stat(directory_path).st_mtime == directory[1]:
+                    continue
+                # Directory modification time also changes when non curve files (such as the bundle itself) are
+                # created or replaced, so its contents are compared if they were stored
+                if len(directory) < 4 or storage.list_curves_directory(directory_path) != (
+                        list(directory[2]), list(directory[3])):
+                    return False
+            except OSError:
+                return False
+
+        for relative_path, _, _, file_size, file_mtime in self._curves.values():
+            try:
+                file_stat = os.stat(os.path.join(curves_path, relative_path))
+            except OSError:
+                return False
+            if file_stat.st_mtime != file_mtime or file_stat.st_size != file_size:
+                return False
+
+        return True
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _get_name(self, offset, length):
+        """
+        Internal function that returns a string stored in the names section
+        :param offset: int
+        :param length: int
+        :return: str
+        """
+
+        start = self._names_offset + offset
+
+        return bytes(self._buffer[start:start + length]).decode('utf-8')
+
+    def _get_floats(self):
+        """
+        Internal function that returns floats section as a float array. Array is only created once.
+        :return: array.array
+        """
+
+        if self._floats is None:
+            self._floats = _floats_from_bytes(
+                bytes(self._buffer[self._floats_offset:self._floats_offset + self._floats_count * 8]))
+
+        return self._floats
+
+
+def read_bundle(bundle_path):
+    """
+    Reads the given curves bundle file
+    :param bundle_path: str
+    :return: CurveBundle
+    """
+
+    with io.open(bundle_path, 'rb') as fh:
+        buffer = fh.read()
+
+    return CurveBundle(buffer, bundle_path=bundle_path)
+
+
+class CurveBundleView(CurveBundle):
+    """
+    Class that gives read-only access to a curves bundle file through a memory map. Knots and CVs are returned as
+    views into the mapped file, so all the processes that open the same bundle share a single physical copy of it
+    and no data is deserialized. Views are NumPy arrays if NumPy is available; memoryview objects otherwise.
+    """
+
+    def __init__(self, bundle_path):
+        self._file = io.open(bundle_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            self._file.close()
+            raise
+        super(CurveBundleView, self).__init__(self._map, bundle_path=bundle_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def get_shape_arrays(self, curve_name):
+        """
+        Returns the knots and CVs of all the shapes of the given curve as read-only views into the mapped bundle
+        :param curve_name: str
+        :return: OrderedDict(str, dict), dictionary containing degree, form, knots and cvs of each shape. Knots are
+            returned as 1D views (or None if shape has no knots) and CVs are returned as (cvs count, dimension) views
+        """
+
+        shape_arrays = OrderedDict()
+        for (_, shape_name, degree, form, knots_offset, knots_count, cvs_offset, cvs_count,
+             cvs_dimension) in self.iterate_shape_records(curve_name):
+            shape_arrays[shape_name] = {
+                'degree': degree,
+                'form': form,
+                'knots': self._get_view(knots_offset, knots_count) if knots_count >= 0 else None,
+                'cvs': self._get_view(cvs_offset, cvs_count * cvs_dimension, shape=(cvs_count, cvs_dimension))
+            }
+
+        return shape_arrays
+
+    def close(self):
+        """
+        Closes the memory map. If views returned by this bundle are still alive the map is kept open until they are
+        garbage collected.
+        :return: bool, True if the map was closed; False otherwise
+        """
+
+        try:
+            self._map.close()
+        except BufferError:
+            return False
+        self._file.close()
+
+        return True
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _get_view(self, offset, count, shape=None):
+        """
+        Internal function that returns a read-only view of the given range of floats stored in the floats section
+        :param offset: int, index of the first float
+        :param count: int, number of floats
+        :param shape: tuple(int, int) or None
+        :return: numpy.ndarray or memoryview or array.array
+        """
+
+        start = self._floats_offset + offset * 8
+        if numpy is not None:
+            view = numpy.frombuffer(self._map, dtype='<f8', count=count, offset=start)
+            return view.reshape(shape) if shape else view
+
+        # memoryview casting is only available in Python 3 and it uses native byte order, so we fallback to copy
+        # floats in any other case
+        if sys.byteorder == 'little' and hasattr(memoryview, 'cast'):
+            view = memoryview(self._map)[start:start + count * 8]
+            return view.cast('d', shape=list(shape)) if shape and count else view.cast('d')
+
+        return _floats_from_bytes(bytes(self._map[start:start + count * 8]))
+
+
+def open_bundle_view(bundle_path):
+    """
+    Opens the given curves bundle file through a read-only memory map
+    :param bundle_path: str
+    :return: CurveBundleView
+    """
+
+    return CurveBundleView(bundle_path)
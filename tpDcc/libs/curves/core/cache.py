@@ -0,0 +1,216 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains cache implementation used to store parsed curve data in memory
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+from tpDcc.libs.python import jsonio, path as path_utils
+
+from tpDcc.libs.curves.core import consts
+
+logger = logging.getLogger(consts.LIB_ID)
+
+
+def copy_curve_data(curve_data):
+    """
+    Returns a copy of the given curve data. Dictionaries and lists are copied recursively so mutating the returned
+    data never modifies the original one. Faster than copy.deepcopy for the plain JSON data stored in curve files
+    :param curve_data: dict
+    :return: dict
+    """
+
+    if isinstance(curve_data, dict):
+        new_data = curve_data.__class__()
+        for key, value in curve_data.items():
+            new_data[key] = copy_curve_data(value)
+        return new_data
+    elif isinstance(curve_data, list):
+        return [copy_curve_data(value) for value in curve_data]
+
+    return curve_data
+
+
+class CurveDataCache(object):
+    """
+    Class that stores parsed curve data keyed by absolute curve file path. Entries are validated against the file
+    modification time and size and evicted following a LRU policy once the entries or bytes limits are reached.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        super(CurveDataCache, self).__init__()
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()           # curve path > (mtime, size, curve data)
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def max_entries(self):
+        return self._max_entries
+
+    @max_entries.setter
+    def max_entries(self, value):
+        with self._lock:
+            self._max_entries = value
+            self._evict()
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def get(self, curve_path):
+        """
+        Returns a copy of the parsed curve data of the given curve file. If the file is not cached or it changed
+        since it was cached, the file is read from disk again
+        :param curve_path: str
+        :return: dict or None
+        """
+
+        curve_path = path_utils.clean_path(os.path.abspath(curve_path))
+        try:
+            file_stat = os.stat(curve_path)
+        except OSError:
+            self.invalidate(curve_path)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(curve_path, None)
+            if entry is not None and entry[0] == file_stat.st_mtime and entry[1] == file_stat.st_size:
+                self._entries.pop(curve_path)
+                self._entries[curve_path] = entry
+                self._hits += 1
+                return copy_curve_data(entry[2])
+            self._misses += 1
+
+        curve_data = jsonio.read_file(curve_path, as_ordered_dict=True)
+        if not curve_data:
+            self.invalidate(curve_path)
+            return curve_data
+
+        self.set(curve_path, curve_data, mtime=file_stat.st_mtime, size=file_stat.st_size)
+
+        return copy_curve_data(curve_data)
+
+    def set(self, curve_path, curve_data, mtime=None, size=None):
+        """
+        Stores a copy of the given curve data into the cache
+        :param curve_path: str
+        :param curve_data: dict
+        :param mtime: float or None, modification time of the curve file. If not given, file will be checked.
+        :param size: int or None, size in bytes of the curve file. If not given, file will be checked.
+        """
+
+        curve_path = path_utils.clean_path(os.path.abspath(curve_path))
+        if mtime is None or size is None:
+            try:
+                file_stat = os.stat(curve_path)
+            except OSError:
+                self.invalidate(curve_path)
+                return
+            mtime, size = file_stat.st_mtime, file_stat.st_size
+
+        with self._lock:
+            self._pop(curve_path)
+            if self._max_entries <= 0 or size > self._max_bytes:
+                return
+            self._entries[curve_path] = (mtime, size, copy_curve_data(curve_data))
+            self._total_bytes += size
+            self._evict()
+
+    def invalidate(self, curve_path):
+        """
+        Removes the cached data of the given curve file
+        :param curve_path: str
+        """
+
+        curve_path = path_utils.clean_path(os.path.abspath(curve_path))
+        with self._lock:
+            self._pop(curve_path)
+
+    def clear(self):
+        """
+        Removes all cached data and resets cache counters
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        """
+        Returns a dictionary with current cache statistics
+        :return: dict
+        """
+
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'max_entries': self._max_entries,
+                'max_bytes': self._max_bytes
+            }
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _pop(self, curve_path):
+        """
+        Internal function that removes given entry from cache. Must be called with the lock acquired
+        :param curve_path: str
+        """
+
+        entry = self._entries.pop(curve_path, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def _evict(self):
+        """
+        Internal function that removes least recently used entries until cache limits are satisfied.
+        Must be called with the lock acquired
+        """
+
+        while self._entries and (len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry[1]
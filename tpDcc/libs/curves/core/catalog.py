@@ -0,0 +1,591 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains curve catalog implementation used to index curve files located in curves paths
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+from tpDcc.libs.python import path as path_utils
+
+from tpDcc.libs.curves.core import consts, storage
+
+logger = logging.getLogger(consts.LIB_ID)
+
+
+class CurveCatalog(object):
+    """
+    Class that scans curves root paths once and keeps an in-memory index of the curve files found on them.
+    Subsequent refreshes only list again the directories whose modification time changed since last scan.
+    Root paths are layered by precedence: when several root paths contain a curve with the same name, the curve of
+    the first root path wins and shadows the others.
+    Catalog can be shared between threads, such as the one of a threaded curves watcher.
+    """
+
+    def __init__(self, root_paths=None):
+        super(CurveCatalog, self).__init__()
+
+        self._root_paths = [path_utils.clean_path(root_path) for root_path in (root_paths or list()) if root_path]
+        self._directories = dict()          # directory path > (mtime, list(sub directories), dict(curve file > mtime))
+        self._names = OrderedDict()         # curve name > curve path
+        self._providers = OrderedDict()     # curve name > list(curve paths), sorted by precedence
+        self._curve_roots = dict()          # curve path > root path
+        self._mtimes = OrderedDict()        # curve path > mtime
+        self._metadata = dict()             # curve path > ((mtime, size), curve metadata)
+        self._sorted = True                 # Whether names and mtimes dictionaries follow scan order
+        self._scanned = False
+        self._lock = threading.RLock()
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def root_paths(self):
+        return list(self._root_paths)
+
+    @property
+    def scanned(self):
+        return self._scanned
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def refresh(self, force=False):
+        """
+        Updates catalog index. Only directories whose modification time changed since last scan are listed again
+        :param force: bool, Whether to discard all cached directories info and rescan all root paths from scratch
+        :return: bool, True if the catalog index changed; False otherwise
+        """
+
+        with self._lock:
+            if force:
+                self._directories.clear()
+
+            visited = set()
+            changed = force or not self._scanned
+            for root_path in self._root_paths:
+                changed = self._scan_directory(root_path, visited) or changed
+
+            for directory in [directory for directory in self._directories if directory not in visited]:
+                self._directories.pop(directory, None)
+                changed = True
+
+            if changed:
+                self._rebuild_index()
+            self._scanned = True
+
+            return changed
+
+    def find_curve_path(self, curve_name):
+        """
+        Returns the absolute path of the curve file with given name
+        :param curve_name: str, name of the curve (without extension)
+        :return: str or None
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+
+            return self._names.get(curve_name, None)
+
+    def get_curve_names(self):
+        """
+        Returns a list with all the curve names indexed by the catalog
+        :return: list(str)
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+            self._sort_index()
+
+            return list(self._names.keys())
+
+    def get_curve_providers(self, curve_name):
+        """
+        Returns the paths of all the curve files with the given name sorted by precedence. First one is the curve
+        file returned by find_curve_path and the others are the curve files shadowed by it.
+        :param curve_name: str, name of the curve (without extension)
+        :return: list(str)
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+
+            return list(self._providers.get(curve_name, list()))
+
+    def get_shadowed_curves(self):
+        """
+        Returns the curves whose name is provided by more than one curve file
+        :return: OrderedDict(str, list(str)), curve paths of each curve name sorted by precedence
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+            self._sort_index()
+
+            return OrderedDict(
+                (curve_name, list(self._providers[curve_name])) for curve_name in self._names
+                if len(self._providers[curve_name]) > 1)
+
+    def get_curve_root_path(self, curve_path):
+        """
+        Returns the root path (layer) the given indexed curve file belongs to
+        :param curve_path: str
+        :return: str or None
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+
+            return self._curve_roots.get(path_utils.clean_path(curve_path), None)
+
+    def get_curve_paths(self, root_path=None):
+        """
+        Returns a list with all the curve file paths indexed by the catalog
+        :param root_path: str or None, if given only curve files located in this root path will be returned
+        :return: list(str)
+        """
+
+        return list(self.get_curve_mtimes(root_path=root_path).keys())
+
+    def get_curve_mtimes(self, root_path=None):
+        """
+        Returns a dictionary with the modification time of all the curve files indexed by the catalog
+        :param root_path: str or None, if given only curve files located in this root path will be returned
+        :return: OrderedDict(str, float)
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+
+            if not root_path:
+                self._sort_index()
+                return OrderedDict(self._mtimes)
+
+            return OrderedDict(self._iterate_directory_files(path_utils.clean_path(root_path), set()))
+
+    def get_directories(self, root_path=None):
+        """
+        Returns a list with all the directories scanned by the catalog and their modification times
+        :param root_path: str or None, if given only directories located in this root path will be returned
+        :return: list(tuple(str, float))
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+
+            root_paths = [path_utils.clean_path(root_path)] if root_path else self._root_paths
+            directories = list()
+            for directory in sorted(self._directories.keys()):
+                for root in root_paths:
+                    if directory == root or directory.startswith(root.rstrip('/') + '/'):
+                        directories.append((directory, self._directories[directory][0]))
+                        break
+
+            return directories
+
+    def get_directory_contents(self, directory):
+        """
+        Returns the sub directories and curve files found in the given directory during last scan
+        :param directory: str
+        :return: tuple(list(str), list(str)) or None, sorted names of sub directories and curve files
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+
+            cached = self._directories.get(path_utils.clean_path(directory), None)
+            if not cached:
+                return None
+
+            return (sorted(os.path.basename(path) for path in cached[1]),
+                    sorted(os.path.basename(path) for path in cached[2]))
+
+    def get_curve_mtime(self, curve_path):
+        """
+        Returns modification time of the given curve path stored during last scan
+        :param curve_path: str
+        :return: float or None
+        """
+
+        with self._lock:
+            if not self._scanned:
+                self.refresh()
+
+            return self._mtimes.get(path_utils.clean_path(curve_path), None)
+
+    def get_curve_metadata(self, curve_path):
+        """
+        Returns the metadata (bounds and shape statistics) stored for the given curve path. Metadata is only returned
+        if the modification time and size of the curve file did not change since the metadata was stored.
+        :param curve_path: str
+        :return: dict or None
+        """
+
+        with self._lock:
+            cached = self._metadata.get(path_utils.clean_path(curve_path), None)
+            if not cached or cached[0] != self._get_file_state(curve_path):
+                return None
+
+            return cached[1]
+
+    def set_curve_metadata(self, curve_path, metadata, mtime=None, size=None):
+        """
+        Stores the metadata of the given curve path. Curve path must be indexed by the catalog.
+        :param curve_path: str
+        :param metadata: dict
+        :param mtime: float or None, modification time of the file the metadata was computed from. If not given,
+            current file modification time is used.
+        :param size: int or None, size of the file the metadata was computed from. If not given, current file size
+            is used.
+        :return: bool
+        """
+
+        with self._lock:
+            curve_path = path_utils.clean_path(curve_path)
+            if self.get_curve_mtime(curve_path) is None:
+                return False
+            if mtime is None or size is None:
+                file_state = self._get_file_state(curve_path)
+                if file_state is None:
+                    return False
+                mtime, size = file_state
+            self._metadata[curve_path] = ((mtime, size), metadata)
+
+            return True
+
+    def get_curve_aliases(self, curve_path):
+        """
+        Returns the paths of the other indexed curves with the same content than the given one. Only curves whose
+        metadata is stored in the catalog are taken into account.
+        :param curve_path: str
+        :return: list(str)
+        """
+
+        with self._lock:
+            curve_metadata = self.get_curve_metadata(curve_path)
+            if not curve_metadata or not curve_metadata.get('hash', None):
+                return list()
+
+            curve_path = path_utils.clean_path(curve_path)
+            return [path for path in self._get_hash_groups().get(curve_metadata['hash'], list()) if path != curve_path]
+
+    def get_duplicate_curves(self):
+        """
+        Returns the groups of indexed curves that share the same content. Only curves whose metadata is stored in the
+        catalog are taken into account.
+        :return: OrderedDict(str, list(str)), curve paths of each group by content hash, following index order
+        """
+
+        with self._lock:
+            return OrderedDict(
+                (curve_hash, curve_paths) for curve_hash, curve_paths in self._get_hash_groups().items()
+                if len(curve_paths) > 1)
+
+    def add_curve_path(self, curve_path):
+        """
+        Registers given curve file into the catalog without rescanning its directory. Stored modification time of
+        the directory is kept, so other files created or removed in the directory are still found by next refresh.
+        :param curve_path: str
+        :return: bool
+        """
+
+        with self._lock:
+            curve_path = path_utils.clean_path(curve_path)
+            mtime = self._get_mtime(curve_path)
+            if mtime is None or not os.path.isfile(curve_path):
+                return False
+
+            directory = os.path.dirname(curve_path)
+            root_path = self._get_directory_root_path(directory)
+            if directory not in self._directories or not root_path:
+                return False
+
+            directory_mtime, sub_directories, curve_files = self._directories[directory]
+            is_new = curve_path not in curve_files
+            curve_files[curve_path] = mtime
+            if is_new:
+                curve_files = OrderedDict(sorted(curve_files.items()))
+                self._directories[directory] = (directory_mtime, sub_directories, curve_files)
+
+            curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+            self._curve_roots[curve_path] = root_path
+            self._mtimes[curve_path] = mtime
+            providers = self._providers.setdefault(curve_name, list())
+            if curve_path not in providers:
+                providers.append(curve_path)
+                providers.sort(key=self._get_order_key)
+            # Indexed files are only sorted again when they are requested
+            self._sorted = self._sorted and not is_new and self._names.get(curve_name, None) == providers[0]
+            self._names[curve_name] = providers[0]
+
+            return True
+
+    def remove_curve_path(self, curve_path):
+        """
+        Unregisters given curve file from the catalog without rescanning its directory. Stored modification time of
+        the directory is kept, so other files created or removed in the directory are still found by next refresh.
+        :param curve_path: str
+        :return: bool
+        """
+
+        with self._lock:
+            curve_path = path_utils.clean_path(curve_path)
+            directory = os.path.dirname(curve_path)
+            if directory not in self._directories:
+                return False
+
+            curve_files = self._directories[directory][2]
+            if curve_path not in curve_files:
+                return False
+            curve_files.pop(curve_path)
+
+            curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+            self._curve_roots.pop(curve_path, None)
+            self._mtimes.pop(curve_path, None)
+            self._metadata.pop(curve_path, None)
+            providers = self._providers.get(curve_name, list())
+            if curve_path in providers:
+                providers.remove(curve_path)
+            if providers:
+                self._sorted = self._sorted and self._names.get(curve_name, None) == providers[0]
+                self._names[curve_name] = providers[0]
+            else:
+                self._providers.pop(curve_name, None)
+                self._names.pop(curve_name, None)
+
+            return True
+
+    def invalidate_directory(self, directory):
+        """
+        Forces the given directory to be listed again during next refresh. If the directory is not indexed yet, its
+        nearest indexed parent directory is invalidated instead, so the new directory is found.
+        :param directory: str
+        :return: bool
+        """
+
+        with self._lock:
+            directory = path_utils.clean_path(directory)
+            while directory not in self._directories:
+                parent_directory = os.path.dirname(directory)
+                if not parent_directory or parent_directory == directory:
+                    return False
+                directory = parent_directory
+
+            _, sub_directories, curve_files = self._directories[directory]
+            self._directories[directory] = (None, sub_directories, curve_files)
+
+            return True
+
+    def clear(self):
+        """
+        Clears all the info stored in the catalog
+        """
+
+        with self._lock:
+            self._directories.clear()
+            self._names.clear()
+            self._providers.clear()
+            self._curve_roots.clear()
+            self._mtimes.clear()
+            self._metadata.clear()
+            self._sorted = True
+            self._scanned = False
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _get_mtime(self, file_path):
+        """
+        Internal function that returns the modification time of the given path
+        :param file_path: str
+        :return: float or None
+        """
+
+        try:
+            return os.stat(file_path).st_mtime
+        except OSError:
+            return None
+
+    def _get_file_state(self, file_path):
+        """
+        Internal function that returns the modification time and size of the given file
+        :param file_path: str
+        :return: tuple(float, int) or None
+        """
+
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        return file_stat.st_mtime, file_stat.st_size
+
+    def _get_directory_root_path(self, directory):
+        """
+        Internal function that returns the root path the given directory is indexed from. When root paths are nested,
+        directories belong to the first root path that contains them, as it is the first one to scan them.
+        :param directory: str
+        :return: str or None
+        """
+
+        for root_path in self._root_paths:
+            if directory == root_path or directory.startswith(root_path.rstrip('/') + '/'):
+                return root_path
+
+        return None
+
+    def _get_order_key(self, curve_path):
+        """
+        Internal function that returns the key that sorts indexed curve paths following scan order: root paths by
+        precedence, and within each directory, its curve files sorted by name before the ones of its sub directories
+        :param curve_path: str
+        :return: tuple
+        """
+
+        root_path = self._curve_roots[curve_path]
+        path_parts = curve_path[len(root_path):].strip('/').split('/')
+
+        return (self._root_paths.index(root_path),) + tuple(
+            (1, path_part) for path_part in path_parts[:-1]) + ((0, path_parts[-1]),)
+
+    def _sort_index(self):
+        """
+        Internal function that sorts names and mtimes dictionaries following scan order after curve files were
+        registered without rescanning their directories
+        """
+
+        if self._sorted:
+            return
+
+        self._mtimes = OrderedDict(sorted(self._mtimes.items(), key=lambda item: self._get_order_key(item[0])))
+        self._names = OrderedDict(
+            sorted(self._names.items(), key=lambda item: self._get_order_key(item[1])))
+        self._sorted = True
+
+    def _scan_directory(self, directory, visited):
+        """
+        Internal function that scans given directory and its sub directories recursively
+        :param directory: str
+        :param visited: set(str), set of directories already visited during current scan
+        :return: bool, True if any directory contents changed; False otherwise
+        """
+
+        if directory in visited:
+            return False
+
+        mtime = self._get_mtime(directory)
+        if mtime is None:
+            return directory in self._directories
+        visited.add(directory)
+
+        changed = False
+        cached = self._directories.get(directory, None)
+        if cached and cached[0] == mtime:
+            sub_directories, curve_files = cached[1], cached[2]
+        else:
+            changed = True
+            sub_directories = list()
+            curve_files = OrderedDict()
+            try:
+                sub_directory_names, curve_file_names = storage.list_curves_directory(directory)
+            except OSError as exc:
+                logger.warning('Impossible to list curves directory "{}": {}'.format(directory, exc))
+                sub_directory_names, curve_file_names = list(), list()
+            for sub_directory_name in sub_directory_names:
+                sub_directories.append(path_utils.clean_path(os.path.join(directory, sub_directory_name)))
+            for curve_file_name in curve_file_names:
+                file_path = path_utils.clean_path(os.path.join(directory, curve_file_name))
+                curve_files[file_path] = self._get_mtime(file_path)
+            self._directories[directory] = (mtime, sub_directories, curve_files)
+
+        for sub_directory in sub_directories:
+            changed = self._scan_directory(sub_directory, visited) or changed
+
+        return changed
+
+    def _iterate_directory_files(self, directory, visited):
+        """
+        Internal function that iterates all curve files of the given directory following the scan order
+        :param directory: str
+        :param visited: set(str)
+        :return: generator(tuple(str, float))
+        """
+
+        if directory in visited or directory not in self._directories:
+            return
+        visited.add(directory)
+        _, sub_directories, curve_files = self._directories[directory]
+        for curve_file, mtime in curve_files.items():
+            yield curve_file, mtime
+        for sub_directory in sub_directories:
+            for curve_file, mtime in self._iterate_directory_files(sub_directory, visited):
+                yield curve_file, mtime
+
+    def _get_hash_groups(self):
+        """
+        Internal function that groups indexed curve paths by the content hash stored in their metadata. Only the
+        curve files of groups with several curves are checked to be unchanged since their metadata was stored.
+        :return: OrderedDict(str, list(str))
+        """
+
+        hash_groups = OrderedDict()
+        self._sort_index()
+        for curve_path in self._mtimes:
+            cached = self._metadata.get(curve_path, None)
+            if not cached or not cached[1].get('hash', None):
+                continue
+            hash_groups.setdefault(cached[1]['hash'], list()).append(curve_path)
+
+        for curve_hash, curve_paths in list(hash_groups.items()):
+            if len(curve_paths) > 1:
+                hash_groups[curve_hash] = [path for path in curve_paths if self.get_curve_metadata(path) is not None]
+
+        return hash_groups
+
+    def _rebuild_index(self):
+        """
+        Internal function that rebuilds name and mtime dictionaries from the cached directories info
+        """
+
+        names = OrderedDict()
+        providers = OrderedDict()
+        curve_roots = dict()
+        mtimes = OrderedDict()
+        visited = set()
+        for root_path in self._root_paths:
+            for curve_path, mtime in self._iterate_directory_files(root_path, visited):
+                curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+                mtimes[curve_path] = mtime
+                curve_roots[curve_path] = root_path
+                providers.setdefault(curve_name, list()).append(curve_path)
+                if curve_name not in names:
+                    names[curve_name] = curve_path
+
+        self._names = names
+        self._providers = providers
+        self._curve_roots = curve_roots
+        self._mtimes = mtimes
+        self._sorted = True
+
+        # Metadata of removed curve files is discarded
+        for curve_path in list(self._metadata.keys()):
+            if curve_path not in mtimes:
+                self._metadata.pop(curve_path)
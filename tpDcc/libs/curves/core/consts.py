@@ -10,3 +10,14 @@ from __future__ import print_function, division, absolute_import
 
 LIB_ID = 'tpDcc-libs-curves'
 CURVE_EXT = '.curve'
+CURVE_BUNDLE_EXT = '.curvebundle'
+CURVE_BUNDLE_NAME = 'curves{}'.format(CURVE_BUNDLE_EXT)
+THUMBNAILS_FOLDER = 'thumbnails'
+THUMBNAILS_INDEX = 'index.json'
+CURVE_DATABASE_NAME = 'curves.db'
+
+
+class NormalizeMode(object):
+    MAX = 'max'                 # Uniform scale using the maximum absolute coordinate of all CVs
+    AXIS = 'axis'               # Independent scale per axis using the maximum absolute coordinate of each axis
+    BOUNDING_BOX = 'bbox'       # Centers CVs bounding box in the origin and uniform scales it to fit -1 to 1 space
@@ -8,38 +8,539 @@ Module that contains tpDcc-libs-curves function core implementations
 from __future__ import print_function, division, absolute_import
 
 import os
+import fnmatch
 import logging
+import threading
+from collections import OrderedDict
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
 
 from tpDcc.core import reroute
-from tpDcc.managers import configs
 from tpDcc.libs.python import python, fileio, jsonio, path as path_utils
 
-from tpDcc.libs.curves.core import consts
+from tpDcc.libs.curves.core import consts, catalog, cache, bundle, geometry, roots, similarity, simplify, storage, \
+    sqlcatalog, thumbnails, watcher
 
 logger = logging.getLogger(consts.LIB_ID)
 
+_CATALOGS = dict()
+_CURVE_DATA_CACHE = cache.CurveDataCache()
+_CURVE_BUNDLES = dict()
+_CURVE_BUNDLE_VIEWS = dict()
+_THUMBNAIL_CACHES = dict()
+_SIMILARITY_INDICES = dict()
+_CURVE_WATCHERS = dict()
+_SQL_CATALOGS = dict()
+
+# Guards module caches updated by threaded curve watchers
+_CACHES_LOCK = threading.RLock()
+
+
+def _get_config_curve_paths():
+    """
+    Internal function that returns the curves root paths defined in the library configuration
+    :return: list(str)
+    """
+
+    # Configs manager is imported lazily because it is expensive to import and it is not needed by most operations
+    from tpDcc.managers import configs
+
+    shape_lib_config = configs.get_library_config(consts.LIB_ID)
+    if not shape_lib_config:
+        return list()
+
+    return python.force_list(shape_lib_config.get('curve_paths'))
+
+
+_CURVE_ROOT_PATHS = roots.CurveRootPaths(_get_config_curve_paths)
+
+
+def get_curve_root_paths():
+    """
+    Returns the resolved locations where curve files can be located, sorted by precedence
+    :return: CurveRootPaths
+    """
+
+    return _CURVE_ROOT_PATHS
+
+
+def invalidate_curve_root_paths():
+    """
+    Forces curves root paths to be resolved again. Must be called after library configuration curve paths change.
+    """
+
+    _CURVE_ROOT_PATHS.invalidate()
+
 
 def iterate_curve_root_paths():
     """
-    Returns generator that iterates the locations where shape files can be located
+    Returns generator that iterates the locations where shape files can be located, sorted by precedence
     :return: generator(str)
     """
 
-    all_curves_paths = list()
-    shape_lib_config = configs.get_library_config('tpDcc-libs-curves')
-    if shape_lib_config:
-        curve_paths = shape_lib_config.get('curve_paths')
-        curve_paths = python.force_list(curve_paths)
-        all_curves_paths.extend(curve_paths)
+    for curve_path in _CURVE_ROOT_PATHS.paths:
+        yield curve_path
+
+
+def get_curves_catalog(curves_path=None):
+    """
+    Returns the catalog that indexes the curve files located in the given curves path
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be indexed
+    :return: CurveCatalog
+    """
+
+    if curves_path and os.path.isdir(curves_path):
+        root_paths = [path_utils.clean_path(curves_path)]
+    else:
+        root_paths = list(get_curve_root_paths())
+
+    catalog_key = tuple(root_paths)
+    with _CACHES_LOCK:
+        curves_catalog = _CATALOGS.get(catalog_key, None)
+        if curves_catalog is None:
+            curves_catalog = catalog.CurveCatalog(root_paths)
+            _CATALOGS[catalog_key] = curves_catalog
+
+    return curves_catalog
+
+
+def get_curve_data_cache():
+    """
+    Returns the cache used to store parsed curve data during current session
+    :return: CurveDataCache
+    """
+
+    return _CURVE_DATA_CACHE
+
+
+def enable_sql_catalog(curves_path=None, database_path=None):
+    """
+    Enables the SQLite catalog of the given curves path. Once enabled, curve names, curve paths lookups and curve
+    queries are resolved using the indexed database instead of traversing curve directories. Database persists
+    between sessions and it is synced incrementally.
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be indexed
+    :param database_path: str or None, path of the database file. If not given, it is stored in the local curves
+        cache folder of the indexed root paths.
+    :return: SqlCurveCatalog or None
+    """
+
+    if not sqlcatalog.is_available():
+        logger.warning('Impossible to enable SQL curves catalog because SQLite is not available')
+        return None
+
+    catalog_key = tuple(get_curves_catalog(curves_path).root_paths)
+    sql_catalog = _SQL_CATALOGS.get(catalog_key, None)
+    if sql_catalog is not None:
+        return sql_catalog
+    if not catalog_key:
+        logger.warning('Impossible to enable SQL curves catalog because no curves path defined')
+        return None
+
+    try:
+        # Database is stored in a local per user folder because SQLite locking is not reliable in network drives and
+        # its journal files would modify the mtime of curve directories
+        database_path = database_path or os.path.join(
+            storage.get_cache_path(catalog_key), consts.CURVE_DATABASE_NAME)
+        sql_catalog = sqlcatalog.SqlCurveCatalog(catalog_key, database_path, curve_loader=load_curve_from_path)
+        sql_catalog.sync()
+    except Exception as exc:
+        logger.warning('Impossible to enable SQL curves catalog "{}": {}'.format(database_path, exc))
+        return None
+    with _CACHES_LOCK:
+        _SQL_CATALOGS[catalog_key] = sql_catalog
+
+    return sql_catalog
+
+
+def disable_sql_catalog(curves_path=None):
+    """
+    Disables the SQLite catalog of the given curves path
+    :param curves_path: str, path where curves are located. If not given, all curve root paths catalog is disabled
+    :return: bool
+    """
+
+    with _CACHES_LOCK:
+        sql_catalog = _SQL_CATALOGS.pop(tuple(get_curves_catalog(curves_path).root_paths), None)
+    if not sql_catalog:
+        return False
+    sql_catalog.close()
+
+    return True
+
+
+def get_sql_catalog(curves_path=None):
+    """
+    Returns the enabled SQLite catalog of the given curves path
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: SqlCurveCatalog or None
+    """
+
+    if not _SQL_CATALOGS:
+        return None
+
+    return _SQL_CATALOGS.get(tuple(get_curves_catalog(curves_path).root_paths), None)
+
+
+def query_curves(curves_path=None, **filters):
+    """
+    Returns the curves that match the given filters. SQL catalog of the curves path must be enabled.
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :param filters: dict, filters supported by SqlCurveCatalog query function (name_pattern, root_path, tags,
+        curve_hash, min_size, max_size, min_cvs, max_cvs, include_shadowed and limit)
+    :return: list(dict), info of each curve (name, path, root, hash, bounds, CVs count, ...)
+    """
+
+    sql_catalog = get_sql_catalog(curves_path)
+    if not sql_catalog:
+        logger.warning('Impossible to query curves because SQL curves catalog is not enabled')
+        return list()
+
+    return sql_catalog.query(**filters)
+
+
+def get_curve_tags(curve_name, curves_path=None):
+    """
+    Returns the tags of the curve with the given name. SQL catalog of the curves path must be enabled.
+    :param curve_name: str, name of the curve without extension
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: list(str)
+    """
+
+    sql_catalog = get_sql_catalog(curves_path)
+    curve_path = find_curve_path_by_name(curve_name, curves_path=curves_path) if sql_catalog else None
+    if not curve_path:
+        return list()
+
+    return sql_catalog.get_curve_tags(curve_path)
+
+
+def set_curve_tags(curve_name, tags, curves_path=None):
+    """
+    Replaces the tags of the curve with the given name. SQL catalog of the curves path must be enabled.
+    :param curve_name: str, name of the curve without extension
+    :param tags: list(str)
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: bool
+    """
+
+    sql_catalog = get_sql_catalog(curves_path)
+    if not sql_catalog:
+        logger.warning('Impossible to set curve tags because SQL curves catalog is not enabled')
+        return False
+    curve_path = find_curve_path_by_name(curve_name, curves_path=curves_path)
+    if not curve_path:
+        logger.warning('Impossible to set tags of curve "{}" because it does not exists'.format(curve_name))
+        return False
+
+    return sql_catalog.set_curve_tags(curve_path, tags)
+
+
+def refresh_curves_catalogs(force=False):
+    """
+    Refreshes all the curve catalogs created during current session
+    :param force: bool, Whether to rescan all curve directories or only the ones that changed since last scan
+    """
+
+    with _CACHES_LOCK:
+        for curves_catalog in _CATALOGS.values():
+            curves_catalog.refresh(force=force)
+        for sql_catalog in _SQL_CATALOGS.values():
+            sql_catalog.sync(full=force)
+
+        # Bundles validity must be checked again against the updated source files
+        for bundle_path, (bundle_mtime, bundle_size, curves_bundle, _) in list(_CURVE_BUNDLES.items()):
+            _CURVE_BUNDLES[bundle_path] = (bundle_mtime, bundle_size, curves_bundle, None)
+
+
+def compile_curves_bundle(curves_path=None, bundle_path=None):
+    """
+    Compiles all the curves located in the given curves path into a single binary bundle file
+    :param curves_path: str, path where curves are located. If not given, first curve path found will be used
+    :param bundle_path: str, path of the bundle file. If not given, bundle will be stored in the curves path
+    :return: str or None, path of the compiled bundle file
+    """
+
+    if not curves_path or not os.path.isdir(curves_path):
+        curves_path = get_curve_root_paths().default_path
+        if not curves_path:
+            logger.warning('Impossible to compile curves bundle because no curves path defined')
+            return None
+    curves_path = path_utils.clean_path(curves_path)
+    bundle_path = path_utils.clean_path(bundle_path or os.path.join(curves_path, consts.CURVE_BUNDLE_NAME))
+
+    curves_catalog = get_curves_catalog(curves_path)
+    curves_catalog.refresh()
+
+    curves_to_bundle = list()
+    added_names = set()
+    for curve_path in curves_catalog.get_curve_paths(curves_path):
+        curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+        if curve_name in added_names:
+            continue
+        try:
+            file_stat = os.stat(curve_path)
+        except OSError:
+            continue
+        curve_data = _CURVE_DATA_CACHE.get(curve_path)
+        if not curve_data:
+            logger.warning('Curve "{}" was not bundled because its data is not valid: "{}"'.format(
+                curve_name, curve_path))
+            continue
+        added_names.add(curve_name)
+        curves_to_bundle.append(
+            (curve_name, os.path.relpath(curve_path, curves_path), curve_data, file_stat.st_size, file_stat.st_mtime))
+
+    # Directories contents are stored so the bundle is still valid when the directories are modified by files that
+    # are not curves (such as the bundle itself)
+    directories = list()
+    for directory, mtime in curves_catalog.get_directories(curves_path):
+        sub_directory_names, curve_file_names = curves_catalog.get_directory_contents(directory) or (list(), list())
+        directories.append(
+            (os.path.relpath(directory, curves_path), mtime, sub_directory_names, curve_file_names))
+
+    bundle.write_bundle(bundle_path, curves_to_bundle, directories=directories)
+    with _CACHES_LOCK:
+        _CURVE_BUNDLES.pop(bundle_path, None)
+
+    return bundle_path
+
+
+def get_curves_bundle(curves_path, validate=True):
+    """
+    Returns the compiled bundle of the given curves path
+    :param curves_path: str, curves root path the bundle was compiled from
+    :param validate: bool, Whether to return the bundle only if it is up to date with the curves source files
+    :return: CurveBundle or None
+    """
+
+    if not curves_path:
+        return None
+
+    bundle_path = path_utils.clean_path(os.path.join(curves_path, consts.CURVE_BUNDLE_NAME))
+    with _CACHES_LOCK:
+        try:
+            file_stat = os.stat(bundle_path)
+        except OSError:
+            _CURVE_BUNDLES.pop(bundle_path, None)
+            return None
+
+        cached = _CURVE_BUNDLES.get(bundle_path, None)
+        if cached and cached[0] == file_stat.st_mtime and cached[1] == file_stat.st_size:
+            curves_bundle, validated_state = cached[2], cached[3]
+        else:
+            try:
+                curves_bundle = bundle.read_bundle(bundle_path)
+            except (IOError, OSError, ValueError, bundle.CurveBundleError) as exc:
+                logger.warning('Impossible to read curves bundle "{}": {}'.format(bundle_path, exc))
+                _CURVE_BUNDLES.pop(bundle_path, None)
+                return None
+            validated_state = None
+
+        # Full validation stats every bundled curve file, so it is only done again when the source directories changed
+        # since last validation (curves created, removed or renamed by other processes) or catalogs were refreshed
+        is_valid = True
+        if validate:
+            directories_state = curves_bundle.get_directories_state(curves_path)
+            if directories_state != validated_state:
+                is_valid = curves_bundle.is_up_to_date(curves_path)
+                validated_state = directories_state if is_valid else None
+        _CURVE_BUNDLES[bundle_path] = (file_stat.st_mtime, file_stat.st_size, curves_bundle, validated_state)
+
+        return curves_bundle if is_valid else None
+
+
+def _update_catalogs(added_path=None, removed_path=None, added_data=None):
+    """
+    Internal function that updates all curve catalogs after adding or removing curve files from disk
+    :param added_path: str or None, curve file path that was created
+    :param removed_path: str or None, curve file path that was removed
+    :param added_data: dict or None, curve data stored in the created curve file. Used to update curve metadata.
+    """
+
+    for curve_path in (added_path, removed_path):
+        if curve_path:
+            _CURVE_DATA_CACHE.invalidate(curve_path)
+    added_metadata = geometry.get_curve_metadata(added_data) if added_path and added_data else None
+
+    with _CACHES_LOCK:
+        for curves_catalog in _CATALOGS.values():
+            if removed_path:
+                curves_catalog.remove_curve_path(removed_path)
+            if added_path:
+                curves_catalog.add_curve_path(added_path)
+                if added_metadata:
+                    curves_catalog.set_curve_metadata(added_path, added_metadata)
+
+        for sql_catalog in _SQL_CATALOGS.values():
+            # Moved curves keep their tags
+            if removed_path and added_path:
+                sql_catalog.move_curve_path(removed_path, added_path, curve_data=added_data)
+            elif removed_path:
+                sql_catalog.remove_curve_path(removed_path)
+            elif added_path:
+                sql_catalog.add_curve_path(added_path, curve_data=added_data)
+
+        for bundle_path, (bundle_mtime, bundle_size, curves_bundle, _) in list(_CURVE_BUNDLES.items()):
+            _CURVE_BUNDLES[bundle_path] = (bundle_mtime, bundle_size, curves_bundle, None)
+
+
+def _on_curve_events(events):
+    """
+    Internal function that updates curve catalogs and caches with the curve file changes notified by a watcher
+    :param events: list(watcher.CurveEvent)
+    """
+
+    with _CACHES_LOCK:
+        added_paths = list()
+        for event in events:
+            if event.type == watcher.DELETED:
+                _update_catalogs(removed_path=event.path)
+            elif event.type == watcher.MOVED:
+                _update_catalogs(added_path=event.path, removed_path=event.old_path)
+                added_paths.append(event.path)
+            else:
+                _update_catalogs(added_path=event.path)
+                added_paths.append(event.path)
+
+        # Curve files created in new directories are not indexed yet, so catalogs list the changed directories again
+        for curves_catalog in _CATALOGS.values():
+            if not curves_catalog.scanned:
+                continue
+            missing_paths = [path for path in added_paths if curves_catalog.get_curve_mtime(path) is None]
+            for curve_path in missing_paths:
+                curves_catalog.invalidate_directory(os.path.dirname(curve_path))
+            if missing_paths:
+                curves_catalog.refresh()
+
+
+def watch_curves(callback=None, curves_path=None, threaded=True, interval=watcher.DEFAULT_INTERVAL):
+    """
+    Starts watching the curve files of the given curves path, so curve files created, modified, deleted or renamed by
+    other processes are updated in the curves catalogs and caches without rescanning curves paths
+    :param callback: callable or None, function called with the list of watcher.CurveEvent each time curve files
+        change. It is called from the thread that processes the changes, so when threaded it must not access DCC
+        scenes or UI directly. Curve catalogs and caches are updated under locks and can be read from any thread.
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be watched
+    :param threaded: bool, Whether to process changes in a background thread. If False, watcher poll function must
+        be called periodically (for example, from a UI timer)
+    :param interval: float, seconds between checks of watched directories when they need to be polled
+    :return: CurveWatcher
+    """
+
+    curves_catalog = get_curves_catalog(curves_path)
+    watcher_key = tuple(curves_catalog.root_paths)
+    curves_watcher = _CURVE_WATCHERS.get(watcher_key, None)
+    if curves_watcher is None:
+        curves_watcher = watcher.CurveWatcher(watcher_key, interval=interval)
+        curves_watcher.add_callback(_on_curve_events)
+        _CURVE_WATCHERS[watcher_key] = curves_watcher
+    if callback:
+        curves_watcher.add_callback(callback)
+    curves_watcher.start(threaded=threaded)
+
+    return curves_watcher
+
+
+def stop_watching_curves(curves_path=None):
+    """
+    Stops watching the curve files of the given curves path
+    :param curves_path: str, path where curves are located. If not given, all curve root paths watcher is stopped
+    :return: bool
+    """
+
+    watcher_key = tuple(get_curves_catalog(curves_path).root_paths)
+    curves_watcher = _CURVE_WATCHERS.pop(watcher_key, None)
+    if not curves_watcher:
+        return False
+    curves_watcher.stop()
+
+    return True
+
+
+def get_curves_bundle_view(curves_path=None):
+    """
+    Returns a read-only memory mapped view of the compiled bundle of the given curves path. Knots and CVs returned
+    by the view are shared by all the processes that map the same bundle file.
+    :param curves_path: str, path where curves are located. If not given, first curve path found will be used
+    :return: CurveBundleView or None
+    """
+
+    if not curves_path or not os.path.isdir(curves_path):
+        curves_path = get_curve_root_paths().default_path
+        if not curves_path:
+            return None
+
+    bundle_path = path_utils.clean_path(os.path.join(curves_path, consts.CURVE_BUNDLE_NAME))
+    try:
+        file_stat = os.stat(bundle_path)
+    except OSError:
+        _CURVE_BUNDLE_VIEWS.pop(bundle_path, None)
+        return None
+
+    cached = _CURVE_BUNDLE_VIEWS.get(bundle_path, None)
+    if cached and cached[0] == file_stat.st_mtime and cached[1] == file_stat.st_size:
+        return cached[2]
+
+    try:
+        bundle_view = bundle.open_bundle_view(bundle_path)
+    except (IOError, OSError, ValueError, bundle.CurveBundleError) as exc:
+        logger.warning('Impossible to map curves bundle "{}": {}'.format(bundle_path, exc))
+        return None
+    if not bundle_view.is_up_to_date(curves_path):
+        bundle_view.close()
+        logger.warning('Curves bundle "{}" is outdated. Compile it again to access it.'.format(bundle_path))
+        return None
+
+    if cached:
+        cached[2].close()
+    _CURVE_BUNDLE_VIEWS[bundle_path] = (file_stat.st_mtime, file_stat.st_size, bundle_view)
+
+    return bundle_view
+
 
-    curve_paths = os.environ.get(consts.LIB_ID.replace('-', '_').upper(), '').split(os.pathsep)
-    all_curves_paths.extend(curve_paths)
+def _find_curve_in_bundle(curve_path):
+    """
+    Internal function that returns the compiled bundle that contains up to date data of the given curve file
+    :param curve_path: str
+    :return: tuple(CurveBundle, str) or tuple(None, None), bundle and name of the curve within the bundle
+    """
 
-    all_curves_paths = list(set(all_curves_paths))
-    for curve_path in all_curves_paths:
-        if not curve_path or not os.path.isdir(curve_path):
+    curve_path = path_utils.clean_path(curve_path)
+    for root_path in get_curves_catalog().root_paths:
+        if not curve_path.startswith(root_path.rstrip('/') + '/'):
+            continue
+        curves_bundle = get_curves_bundle(root_path, validate=False)
+        if not curves_bundle:
             continue
-        yield path_utils.clean_path(curve_path)
+        curve_name = curves_bundle.get_curve_name(os.path.relpath(curve_path, root_path))
+        if not curve_name:
+            continue
+        try:
+            file_stat = os.stat(curve_path)
+        except OSError:
+            return None, None
+        if curves_bundle.get_source_stat(curve_name) != (file_stat.st_size, file_stat.st_mtime):
+            return None, None
+        return curves_bundle, curve_name
+
+    return None, None
+
+
+def _load_curve_from_bundle(curve_path):
+    """
+    Internal function that loads the curve data of the given curve file from the compiled bundle of its root path
+    :param curve_path: str
+    :return: dict or None
+    """
+
+    curves_bundle, curve_name = _find_curve_in_bundle(curve_path)
+    if not curves_bundle:
+        return None
+
+    return curves_bundle.get_curve_data(curve_name)
 
 
 def iterate_curve_files(curves_path=None):
@@ -49,16 +550,10 @@ def iterate_curve_files(curves_path=None):
     :return: generator(str)
     """
 
-    if curves_path and os.path.isdir(curves_path):
-        paths_to_find = [curves_path]
-    else:
-        paths_to_find = iterate_curve_root_paths()
-
-    for curve_path in paths_to_find:
-        for root_dir, _, filenames in os.walk(curve_path):
-            for file_name in filenames:
-                if file_name.endswith(consts.CURVE_EXT):
-                    yield path_utils.clean_path(os.path.join(root_dir, file_name))
+    curves_catalog = get_curves_catalog(curves_path)
+    curves_catalog.refresh()
+    for curve_path in curves_catalog.get_curve_paths():
+        yield curve_path
 
 
 def iterate_available_curve_names(curves_path=None):
@@ -79,7 +574,23 @@ def get_curve_names(curves_path=None):
     :return: list(str)
     """
 
-    return list(iterate_available_curve_names(curves_path))
+    sql_catalog = get_sql_catalog(curves_path)
+    if sql_catalog:
+        return sql_catalog.get_curve_names()
+
+    curve_names = list()
+    curves_catalog = get_curves_catalog(curves_path)
+    for root_path in curves_catalog.root_paths:
+        curves_bundle = get_curves_bundle(root_path)
+        if curves_bundle:
+            curve_names.extend(curves_bundle.get_curve_names())
+        else:
+            curves_catalog.refresh()
+            curve_names.extend(
+                os.path.splitext(os.path.basename(curve_path))[0] for curve_path in
+                curves_catalog.get_curve_paths(root_path))
+
+    return curve_names
 
 
 def find_curve_path_by_name(curve_name, curves_path=None):
@@ -90,12 +601,72 @@ def find_curve_path_by_name(curve_name, curves_path=None):
     :return: str
     """
 
-    for curve_path in iterate_curve_files(curves_path=curves_path):
-        split_name = os.path.splitext(os.path.basename(curve_path))
-        if split_name[0] == curve_name:
-            return curve_path
+    sql_catalog = get_sql_catalog(curves_path)
+    if sql_catalog:
+        curve_path = sql_catalog.find_curve_path(curve_name)
+        if not curve_path or not os.path.isfile(curve_path):
+            sql_catalog.sync()
+            curve_path = sql_catalog.find_curve_path(curve_name)
+        return curve_path if curve_path and os.path.isfile(curve_path) else None
+
+    curves_catalog = get_curves_catalog(curves_path)
+
+    # If curves were not indexed yet, we try to resolve the curve using the compiled bundles of the root paths
+    if not curves_catalog.scanned:
+        for root_path in curves_catalog.root_paths:
+            curves_bundle = get_curves_bundle(root_path)
+            if not curves_bundle:
+                break
+            relative_path = curves_bundle.get_relative_path(curve_name)
+            if relative_path:
+                return path_utils.clean_path(os.path.join(root_path, relative_path))
+
+    curve_path = curves_catalog.find_curve_path(curve_name)
+    if curve_path and os.path.isfile(curve_path):
+        return curve_path
+
+    # Curve is not indexed or its file was removed, so we update the directories that changed since last scan
+    if not curves_catalog.refresh():
+        return None
+    curve_path = curves_catalog.find_curve_path(curve_name)
+    if not curve_path or not os.path.isfile(curve_path):
+        return None
+
+    return curve_path
 
-    return None
+
+def get_curve_providers(curve_name, curves_path=None):
+    """
+    Returns all the curve files that provide the curve with the given name sorted by root paths precedence. First
+    one is the curve file used by the library and the others are shadowed by it.
+    :param curve_name: str, name of the curve without extension
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: list(tuple(str, str)), root path (layer) and path of each curve file
+    """
+
+    curves_catalog = get_curves_catalog(curves_path)
+    curve_paths = curves_catalog.get_curve_providers(curve_name)
+    missing = not curve_paths or not all(os.path.isfile(curve_path) for curve_path in curve_paths)
+    if missing and curves_catalog.refresh():
+        curve_paths = curves_catalog.get_curve_providers(curve_name)
+
+    return [(curves_catalog.get_curve_root_path(curve_path), curve_path) for curve_path in curve_paths]
+
+
+def get_shadowed_curves(curves_path=None):
+    """
+    Returns the curves whose name is provided by more than one curve file
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: OrderedDict(str, list(tuple(str, str))), root path (layer) and path of the curve files of each curve
+        name sorted by precedence. First one wins and shadows the others.
+    """
+
+    curves_catalog = get_curves_catalog(curves_path)
+    curves_catalog.refresh()
+
+    return OrderedDict(
+        (curve_name, [(curves_catalog.get_curve_root_path(curve_path), curve_path) for curve_path in curve_paths])
+        for curve_name, curve_paths in curves_catalog.get_shadowed_curves().items())
 
 
 def load_curve_from_name(curve_name, curves_path=None):
@@ -106,20 +677,9 @@ def load_curve_from_name(curve_name, curves_path=None):
     :return: dict, dictionary containing curve data
     """
 
-    if curves_path and os.path.isdir(curves_path):
-        curve_path = None
-        for root_dir, _, filenames in os.walk(curves_path):
-            if curve_path:
-                break
-            for file_name in filenames:
-                if file_name.endswith(consts.CURVE_EXT) and file_name:
-                    curve_path = path_utils.clean_path(os.path.join(root_dir, file_name))
-                    break
-    else:
-        curve_path = find_curve_path_by_name(curve_name)
-
+    curve_path = find_curve_path_by_name(curve_name, curves_path=curves_path)
     if not curve_path:
-        logger.warning('Curve with name "{}" does not exists!'.format(curve_path))
+        logger.warning('Curve with name "{}" does not exists!'.format(curve_name))
         return None
 
     return load_curve_from_path(curve_path)
@@ -138,11 +698,212 @@ def load_curve_from_path(curve_path):
     if not path_ext != consts.CURVE_EXT:
         return None
 
-    curve_data = jsonio.read_file(curve_path)
+    curve_data = _load_curve_from_bundle(curve_path)
+    if curve_data is None:
+        curve_data = _CURVE_DATA_CACHE.get(curve_path)
 
     return curve_data
 
 
+def get_curve_metadata(curve_name, curves_path=None):
+    """
+    Returns the metadata of the curve with the given name: bounding box, centroid, size and CVs count of the curve and
+    bounding box, centroid, CVs count, degree and closedness of each one of its shapes
+    :param curve_name: str, name of the curve without extension
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: OrderedDict or None
+    """
+
+    curve_path = find_curve_path_by_name(curve_name, curves_path=curves_path)
+    if not curve_path:
+        return None
+
+    return get_curve_metadata_from_path(curve_path, curves_path=curves_path)
+
+
+def get_curve_metadata_from_path(curve_path, curves_path=None):
+    """
+    Returns the metadata of the given curve file. Metadata is stored in the curves catalog, so it is only computed
+    again when the curve file changes. Metadata stored in compiled bundles is used if available.
+    :param curve_path: str
+    :param curves_path: str, path used to retrieve the curves catalog. If not given, all curve root paths will be used
+    :return: OrderedDict or None
+    """
+
+    curve_metadata = _get_curve_metadata(get_curves_catalog(curves_path), curve_path)
+
+    return cache.copy_curve_data(curve_metadata) if curve_metadata is not None else None
+
+
+def _get_curve_metadata(curves_catalog, curve_path):
+    """
+    Internal function that returns the metadata of the given curve file stored in the given catalog, computing and
+    storing it if necessary. Returned metadata must not be modified.
+    :param curves_catalog: CurveCatalog
+    :param curve_path: str
+    :return: dict or None
+    """
+
+    curve_metadata = curves_catalog.get_curve_metadata(curve_path)
+    if curve_metadata is None:
+        # File is checked before computing its metadata, so metadata of files modified meanwhile is not kept
+        try:
+            file_stat = os.stat(curve_path)
+        except OSError:
+            return None
+        curves_bundle, curve_name = _find_curve_in_bundle(curve_path)
+        if curves_bundle:
+            curve_metadata = curves_bundle.get_curve_metadata(curve_name)
+        if curve_metadata is None or 'hash' not in curve_metadata:
+            curve_data = load_curve_from_path(curve_path)
+            if not curve_data:
+                return None
+            curve_metadata = geometry.get_curve_metadata(curve_data)
+        curves_catalog.set_curve_metadata(
+            curve_path, curve_metadata, mtime=file_stat.st_mtime, size=file_stat.st_size)
+
+    return curve_metadata
+
+
+def get_curves_metadata(curves_path=None):
+    """
+    Returns the metadata of all the curves located in the given curves path
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: OrderedDict(str, OrderedDict), metadata of each curve by curve name
+    """
+
+    curves_metadata = OrderedDict()
+    for curve_name in get_curve_names(curves_path=curves_path):
+        if curve_name in curves_metadata:
+            continue
+        curve_metadata = get_curve_metadata(curve_name, curves_path=curves_path)
+        if curve_metadata is not None:
+            curves_metadata[curve_name] = curve_metadata
+
+    return curves_metadata
+
+
+def get_curve_hash(curve_name, curves_path=None):
+    """
+    Returns the canonical content hash of the curve with the given name. Curves with the same geometry get the same
+    hash no matter their name or the name and order of their shapes.
+    :param curve_name: str, name of the curve without extension
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: str or None
+    """
+
+    curve_metadata = get_curve_metadata(curve_name, curves_path=curves_path)
+
+    return curve_metadata.get('hash', None) if curve_metadata else None
+
+
+def find_duplicate_curves(curves_path=None):
+    """
+    Returns all the curve files that share the same content, including curves with the same name located in
+    different curve root paths
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: OrderedDict(str, list(str)), curve paths of each group of duplicated curves by content hash
+    """
+
+    curves_catalog = get_curves_catalog(curves_path)
+    curves_catalog.refresh()
+    for curve_path in curves_catalog.get_curve_paths():
+        _get_curve_metadata(curves_catalog, curve_path)
+
+    return curves_catalog.get_duplicate_curves()
+
+
+def get_curve_aliases(curve_name, curves_path=None):
+    """
+    Returns the names of the curves that have the same content than the curve with the given name
+    :param curve_name: str, name of the curve without extension
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: list(str)
+    """
+
+    curve_path = find_curve_path_by_name(curve_name, curves_path=curves_path)
+    if not curve_path:
+        return list()
+
+    # Metadata of all the curves must be available to find the aliases
+    find_duplicate_curves(curves_path=curves_path)
+
+    aliases = list()
+    for alias_path in get_curves_catalog(curves_path).get_curve_aliases(curve_path):
+        alias_name = os.path.splitext(os.path.basename(alias_path))[0]
+        if alias_name != curve_name and alias_name not in aliases:
+            aliases.append(alias_name)
+
+    return aliases
+
+
+def _match_shapes_info(shapes_info, shape_count=None, degree=None, has_shape_parent=None):
+    """
+    Internal function that returns whether the given shapes info matches the given filters
+    :param shapes_info: list(dict), list of dictionaries containing at least degree and shape parent of each shape
+    :param shape_count: int or None
+    :param degree: int or None
+    :param has_shape_parent: bool or None
+    :return: bool
+    """
+
+    if shape_count is not None and len(shapes_info) != shape_count:
+        return False
+    if degree is not None and not any(shape_info.get('degree', None) == degree for shape_info in shapes_info):
+        return False
+    if has_shape_parent is not None and any(
+            shape_info.get('shape_parent', None) for shape_info in shapes_info) != has_shape_parent:
+        return False
+
+    return True
+
+
+def iterate_curves(curves_path=None, name_pattern=None, shape_count=None, degree=None, has_shape_parent=None):
+    """
+    Generator function that lazily loads the curves located in the given curves path.
+    Name filter is evaluated before parsing curve files. If curves path has an up to date compiled bundle, shape
+    filters are also evaluated before decoding curves data.
+    :param curves_path: str, path where curves are located. If not given, first curve path found will be used
+    :param name_pattern: str or None, glob pattern curve names must match (for example, "arrow_*")
+    :param shape_count: int or None, number of shapes curves must have
+    :param degree: int or None, degree that at least one of the shapes of the curves must have
+    :param has_shape_parent: bool or None, Whether curves must have (or not) shapes with a shape parent defined
+    :return: generator(tuple(str, str, dict)), name, path and data of each curve
+    """
+
+    if not curves_path or not os.path.isdir(curves_path):
+        curves_path = get_curve_root_paths().default_path
+        if not curves_path:
+            return
+    curves_path = path_utils.clean_path(curves_path)
+
+    curves_bundle = get_curves_bundle(curves_path)
+    if curves_bundle:
+        for curve_name in curves_bundle.get_curve_names():
+            if name_pattern and not fnmatch.fnmatchcase(curve_name, name_pattern):
+                continue
+            if not _match_shapes_info(
+                    curves_bundle.get_shapes_info(curve_name), shape_count=shape_count, degree=degree,
+                    has_shape_parent=has_shape_parent):
+                continue
+            curve_path = path_utils.clean_path(os.path.join(curves_path, curves_bundle.get_relative_path(curve_name)))
+            yield curve_name, curve_path, curves_bundle.get_curve_data(curve_name)
+        return
+
+    for curve_path in get_curves_catalog(curves_path).get_curve_paths():
+        curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+        if name_pattern and not fnmatch.fnmatchcase(curve_name, name_pattern):
+            continue
+        curve_data = load_curve_from_path(curve_path)
+        if not curve_data:
+            continue
+        shapes_info = [shape_data for shape_data in curve_data.values() if isinstance(shape_data, dict)]
+        if not _match_shapes_info(
+                shapes_info, shape_count=shape_count, degree=degree, has_shape_parent=has_shape_parent):
+            continue
+        yield curve_name, curve_path, curve_data
+
+
 def load_curves(curves_path=None):
     """
     Loads all the curves located in the given curves path
@@ -151,26 +912,284 @@ def load_curves(curves_path=None):
     """
 
     if not curves_path or not os.path.isdir(curves_path):
-        curves_path = list(iterate_curve_root_paths())
+        curves_path = get_curve_root_paths().default_path
         if not curves_path:
             return None
-        curves_path = curves_path[0]
     if not curves_path or not os.path.isdir(curves_path):
         return False
 
-    curves_data = list()
-    for root_dir, _, filenames in os.walk(curves_path):
-        for file_name in filenames:
-            if file_name.endswith(consts.CURVE_EXT):
-                curve_data = load_curve_from_path(path_utils.clean_path(os.path.join(root_dir, file_name)))
-                if not curve_data:
-                    continue
-                curves_data.append(curve_data)
+    return [curve_data for _, _, curve_data in iterate_curves(curves_path)]
+
+
+def get_similarity_index(curves_path=None):
+    """
+    Returns the similarity index of the curves located in the given curves path. Index is built the first time it is
+    requested and later calls only compute again the descriptors of the curves whose files changed (modification time
+    or size) since their descriptor was computed.
+    :param curves_path: str, path where curves are located. If not given, first curve path found will be used
+    :return: SimilarityIndex or None
+    """
+
+    if not curves_path or not os.path.isdir(curves_path):
+        curves_path = get_curve_root_paths().default_path
+        if not curves_path:
+            return None
+    curves_path = path_utils.clean_path(curves_path)
+
+    similarity_index = _SIMILARITY_INDICES.get(curves_path, None)
+    if similarity_index is None:
+        similarity_index = similarity.SimilarityIndex()
+        _SIMILARITY_INDICES[curves_path] = similarity_index
+
+    curves_catalog = get_curves_catalog(curves_path)
+    curves_catalog.refresh()
+    sources = OrderedDict()
+    for curve_path in curves_catalog.get_curve_mtimes(curves_path):
+        curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+        if curve_name in sources:
+            continue
+        try:
+            file_stat = os.stat(curve_path)
+        except OSError:
+            continue
+        sources[curve_name] = (curve_path, file_stat.st_mtime, file_stat.st_size)
+    for curve_name in similarity_index.names:
+        if curve_name not in sources:
+            similarity_index.remove(curve_name)
+    if all(similarity_index.get_source(curve_name) == source for curve_name, source in sources.items()):
+        return similarity_index
+
+    for curve_name, curve_path, curve_data in iterate_curves(curves_path):
+        source = sources.get(curve_name, None)
+        if source and similarity_index.get_source(curve_name) != source:
+            similarity_index.add(curve_name, curve_data, source=source)
+
+    return similarity_index
+
+
+def find_similar_curves(curve_data, count=5, curves_path=None, exclude=None):
+    """
+    Returns the library curves that are geometrically most similar to the given curve data. Similarity does not
+    depend on curves position, size or shape names.
+    :param curve_data: dict
+    :param count: int, maximum number of curves to return
+    :param curves_path: str, path where curves are located. If not given, first curve path found will be used
+    :param exclude: list(str) or None, names of the curves to ignore
+    :return: list(tuple(str, float)), names of the most similar curves with their similarity score (from 0 to 1)
+    """
+
+    similarity_index = get_similarity_index(curves_path=curves_path)
+    if not similarity_index or not curve_data:
+        return list()
+
+    return similarity_index.query(curve_data, count=count, exclude=exclude)
+
+
+def bulk_load_curves(curves_path=None, max_workers=None, use_processes=False):
+    """
+    Loads all the curves located in the given curves path overlapping files I/O and parsing across a pool of workers.
+    A curve file that fails to load does not abort the loading of the rest of files.
+    :param curves_path: str, path where curves are located. If not given, first curve path found will be used
+    :param max_workers: int or None, maximum number of workers used to load curves. If None, pool default is used
+    :param use_processes: bool, Whether to parse curve files in a process pool instead of a thread pool
+    :return: tuple(OrderedDict(str, dict), OrderedDict(str, str)), loaded curves data by curve name (following
+        curve files order) and error messages by curve file path of the curves that could not be loaded
+    """
+
+    curves_data = OrderedDict()
+    errors = OrderedDict()
+
+    if not curves_path or not os.path.isdir(curves_path):
+        curves_path = get_curve_root_paths().default_path
+        if not curves_path:
+            return curves_data, errors
+
+    curves_bundle = get_curves_bundle(curves_path)
+    if curves_bundle:
+        for curve_name in curves_bundle.get_curve_names():
+            curves_data[curve_name] = curves_bundle.get_curve_data(curve_name)
+        return curves_data, errors
+
+    curve_paths = list()
+    for curve_path in get_curves_catalog(curves_path).get_curve_paths():
+        curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+        if curve_name not in curves_data:
+            curves_data[curve_name] = None
+            curve_paths.append(curve_path)
+
+    results = dict()
+    if futures is None or max_workers == 1:
+        for curve_path in curve_paths:
+            try:
+                results[curve_path] = (_CURVE_DATA_CACHE.get(curve_path), None)
+            except Exception as exc:
+                results[curve_path] = (None, exc)
+    else:
+        if use_processes:
+            executor, load_fn = futures.ProcessPoolExecutor(max_workers=max_workers), _read_curve_file
+        else:
+            executor, load_fn = futures.ThreadPoolExecutor(max_workers=max_workers), _CURVE_DATA_CACHE.get
+        with executor:
+            pending = dict((executor.submit(load_fn, curve_path), curve_path) for curve_path in curve_paths)
+            for future in futures.as_completed(pending):
+                curve_path = pending[future]
+                try:
+                    results[curve_path] = (future.result(), None)
+                except Exception as exc:
+                    results[curve_path] = (None, exc)
+        if use_processes:
+            for curve_path, (curve_data, _) in results.items():
+                if curve_data:
+                    _CURVE_DATA_CACHE.set(curve_path, curve_data)
+
+    for curve_path in curve_paths:
+        curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+        curve_data, exc = results[curve_path]
+        if curve_data:
+            curves_data[curve_name] = curve_data
+            continue
+        curves_data.pop(curve_name, None)
+        errors[curve_path] = str(exc) if exc else 'Curve file does not contain valid curve data'
+        logger.warning('Impossible to load curve "{}": {}'.format(curve_path, errors[curve_path]))
+
+    return curves_data, errors
+
+
+def _read_curve_file(curve_path):
+    """
+    Internal function that reads the given curve file. Used by process pools, so it does not rely on session caches
+    :param curve_path: str
+    :return: dict
+    """
+
+    return jsonio.read_file(curve_path, as_ordered_dict=True)
+
+
+def get_thumbnails_cache(curves_path):
+    """
+    Returns the cache that stores the thumbnails of the curves located in the given curves root path
+    :param curves_path: str
+    :return: ThumbnailCache
+    """
+
+    curves_path = path_utils.clean_path(curves_path)
+    thumbnails_cache = _THUMBNAIL_CACHES.get(curves_path, None)
+    if thumbnails_cache is None:
+        thumbnails_cache = thumbnails.ThumbnailCache(curves_path)
+        _THUMBNAIL_CACHES[curves_path] = thumbnails_cache
+
+    return thumbnails_cache
+
+
+def get_curve_thumbnail(curve_name, size=64, view_axis=None, curves_path=None):
+    """
+    Returns the path of the PNG thumbnail of the given curve. Thumbnail is rendered without a DCC if it does not
+    exist yet or if the curve changed since it was rendered.
+    :param curve_name: str, name of the curve
+    :param size: int, width and height of the thumbnail in pixels
+    :param view_axis: str or None, axis the curve is looked from ('x', 'y' or 'z'). If None, the axis along which
+        the curve is flattest is used
+    :param curves_path: str
+    :return: str or None
+    """
+
+    curve_path = find_curve_path_by_name(curve_name, curves_path=curves_path)
+    if not curve_path:
+        return None
+
+    for root_path in get_curves_catalog(curves_path).root_paths:
+        if curve_path.startswith(root_path.rstrip('/') + '/'):
+            return get_thumbnails_cache(root_path).get_thumbnail(
+                curve_path, load_curve_from_path, size=size, view_axis=view_axis)
+
+    return None
+
+
+def build_curve_thumbnails(curves_path=None, size=64, view_axis=None):
+    """
+    Makes sure all the curves located in the given curves path have an up to date thumbnail
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :param size: int, width and height of the thumbnails in pixels
+    :param view_axis: str or None, axis the curves are looked from ('x', 'y' or 'z'). If None, it is automatically
+        selected for each curve
+    :return: OrderedDict(str, str), thumbnail path of each curve
+    """
+
+    thumbnail_paths = OrderedDict()
+    curves_catalog = get_curves_catalog(curves_path)
+    curves_catalog.refresh()
+    for root_path in curves_catalog.root_paths:
+        thumbnails_cache = get_thumbnails_cache(root_path)
+        for curve_path in curves_catalog.get_curve_paths(root_path):
+            curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+            if curve_name in thumbnail_paths:
+                continue
+            thumbnail_path = thumbnails_cache.get_thumbnail(
+                curve_path, load_curve_from_path, size=size, view_axis=view_axis, save=False)
+            if thumbnail_path:
+                thumbnail_paths[curve_name] = thumbnail_path
+        thumbnails_cache.save()
+
+    return thumbnail_paths
+
+
+def _simplify_curve_data(curve_data, curve_name, tolerance):
+    """
+    Internal function that simplifies the CVs of the given curve data before saving it and logs the result
+    :param curve_data: dict
+    :param curve_name: str
+    :param tolerance: float
+    :return: OrderedDict
+    """
+
+    curve_data, report = simplify.simplify_curve(curve_data, tolerance=tolerance)
+    logger.info('Curve "{}" simplified from {} to {} CVs (max deviation: {:.6f})'.format(
+        curve_name, report['cvs_count_before'], report['cvs_count_after'], report['max_deviation']))
+
+    return curve_data
+
+
+def _write_curve_file(curve_data, curve_path, lock=True):
+    """
+    Internal function that atomically writes given curve data into the given curve file and updates the library
+    catalogs and caches once the new file is in place
+    :param curve_data: dict
+    :param curve_path: str
+    :param lock: bool, Whether to serialize writes of the same file from different processes
+    :return: bool
+    """
+
+    try:
+        storage.write_json_file(curve_data, curve_path, lock=lock)
+    except (IOError, OSError, storage.FileLockTimeoutError) as exc:
+        logger.error('Impossible to write curve file "{}": {}'.format(curve_path, exc))
+        return False
+    _update_catalogs(added_path=curve_path, added_data=curve_data)
+
+    return True
+
+
+def _check_curve_shadowing(curve_path):
+    """
+    Internal function that warns if the given saved curve file is shadowed by a curve with the same name located in
+    a curves root path with more precedence
+    :param curve_path: str
+    """
 
-    return curves_data
+    # Saving must not trigger a scan of all the curve root paths
+    curves_catalog = get_curves_catalog()
+    if not curves_catalog.scanned:
+        return
 
+    curve_name = os.path.splitext(os.path.basename(curve_path))[0]
+    curve_paths = curves_catalog.get_curve_providers(curve_name)
+    if curve_paths and curve_paths[0] != curve_path and curve_path in curve_paths:
+        logger.warning('Curve "{}" saved into "{}" is shadowed by "{}"'.format(curve_name, curve_path, curve_paths[0]))
 
-def save_curve(curve_node, curve_name, curves_path=None, override=True, save_matrix=False, normalize=True):
+
+def save_curve(
+        curve_node, curve_name, curves_path=None, override=True, save_matrix=False, normalize=True,
+        normalize_mode=consts.NormalizeMode.MAX, simplify_tolerance=None, lod_levels=None, lock=True, layer=None):
     """
     Saves the given curve transform node shapes into the given directory path
     :param curve_node: str
@@ -179,15 +1198,27 @@ def save_curve(curve_node, curve_name, curves_path=None, override=True, save_mat
     :param override: bool
     :param save_matrix: bool
     :param normalize: bool
+    :param normalize_mode: str, mode used to normalize curve CVs (consts.NormalizeMode)
+    :param simplify_tolerance: float or None, if given, curve CVs are simplified before saving keeping the curve
+        shape within this tolerance
+    :param lod_levels: list(dict) or None, if given, LOD variants of the curve are generated with these levels and
+        stored with the curve (simplify.LOD_LEVELS contains the default levels)
+    :param lock: bool, Whether to serialize writes of the same curve file from different processes
+    :param layer: int or str or None, curves root path to save the curve into, given by its precedence index (0 is
+        the root path with more precedence) or by the root path itself. If given, curves_path is ignored.
     :return:
     """
 
-    if not curves_path or not os.path.isdir(curves_path):
-        curves_path = list(iterate_curve_root_paths())
+    if layer is not None:
+        curves_path = get_curve_root_paths().get_layer_path(layer)
+        if not curves_path:
+            logger.warning('Impossible to save curve because curves layer "{}" does not exists'.format(layer))
+            return False
+    elif not curves_path or not os.path.isdir(curves_path):
+        curves_path = get_curve_root_paths().default_path
         if not curves_path:
             logger.warning('Impossible to save curve because no path to save curve defined')
             return False
-        curves_path = curves_path[0]
     if not curves_path or not os.path.isdir(curves_path):
         logger.warning(
             'Impossible to save curve because path to save curve into does not exists: "{}"'.format(curves_path))
@@ -201,34 +1232,53 @@ def save_curve(curve_node, curve_name, curves_path=None, override=True, save_mat
         logger.warning('Curve name: "{}" already exists in curves paths'.format(curve_name))
         return None, None
 
-    curve_data = serialize_curve(curve_node, normalize=normalize)
+    curve_data = serialize_curve(curve_node, normalize=normalize, normalize_mode=normalize_mode)
     if not save_matrix:
         for curve_shape in curve_data:
             curve_data[curve_shape].pop('matrix', None)
+    if simplify_tolerance is not None:
+        curve_data = _simplify_curve_data(curve_data, curve_name, simplify_tolerance)
+    if lod_levels:
+        curve_data = simplify.add_curve_lods(curve_data, levels=lod_levels)
 
     curve_path = path_utils.clean_path(os.path.join(curves_path, curve_file_name))
 
-    jsonio.write_to_file(curve_data, curve_path)
+    if not _write_curve_file(curve_data, curve_path, lock=lock):
+        return None, None
+    _check_curve_shadowing(curve_path)
 
     return curve_data, curve_path
 
 
-def save_curve_from_data(curve_data, curve_name, curves_path=None, override=True):
+def save_curve_from_data(
+        curve_data, curve_name, curves_path=None, override=True, simplify_tolerance=None, lod_levels=None,
+        lock=True, layer=None):
     """
     Saves the given curve data into the given directory path
     :param curve_data: dict
     :param curve_name: str
     :param curves_path: str
     :param override: bool
+    :param simplify_tolerance: float or None, if given, curve CVs are simplified before saving keeping the curve
+        shape within this tolerance
+    :param lod_levels: list(dict) or None, if given, LOD variants of the curve are generated with these levels and
+        stored with the curve (simplify.LOD_LEVELS contains the default levels)
+    :param lock: bool, Whether to serialize writes of the same curve file from different processes
+    :param layer: int or str or None, curves root path to save the curve into, given by its precedence index (0 is
+        the root path with more precedence) or by the root path itself. If given, curves_path is ignored.
     :return:
     """
 
-    if not curves_path or not os.path.isdir(curves_path):
-        curves_path = list(iterate_curve_root_paths())
+    if layer is not None:
+        curves_path = get_curve_root_paths().get_layer_path(layer)
+        if not curves_path:
+            logger.warning('Impossible to save curve because curves layer "{}" does not exists'.format(layer))
+            return False
+    elif not curves_path or not os.path.isdir(curves_path):
+        curves_path = get_curve_root_paths().default_path
         if not curves_path:
             logger.warning('Impossible to save curve because no path to save curve defined')
             return False
-        curves_path = curves_path[0]
     if not curves_path or not os.path.isdir(curves_path):
         logger.warning(
             'Impossible to save curve because path to save curve into does not exists: "{}"'.format(curves_path))
@@ -242,13 +1292,39 @@ def save_curve_from_data(curve_data, curve_name, curves_path=None, override=True
         logger.warning('Control name: "{}" already exists in curves paths'.format(curve_name))
         return None, None
 
+    if simplify_tolerance is not None:
+        curve_data = _simplify_curve_data(curve_data, curve_name, simplify_tolerance)
+    if lod_levels:
+        curve_data = simplify.add_curve_lods(curve_data, levels=lod_levels)
     curve_path = path_utils.clean_path(os.path.join(curves_path, curve_file_name))
 
-    jsonio.write_to_file(curve_data, curve_path)
+    if not _write_curve_file(curve_data, curve_path, lock=lock):
+        return None, None
+    _check_curve_shadowing(curve_path)
 
     return curve_data, curve_path
 
 
+def generate_curve_lods(curve_name, levels=simplify.LOD_LEVELS, curves_path=None):
+    """
+    Generates the LOD variants of the given library curve and stores them in its curve file
+    :param curve_name: str, name of the curve without extension
+    :param levels: list(dict), LOD levels definition. Each level is a dictionary with a tolerance key (relative to
+        the size of each shape) or a max_cvs key
+    :param curves_path: str, path where curves are located. If not given, all curve root paths will be used
+    :return: bool
+    """
+
+    curve_path = find_curve_path_by_name(curve_name, curves_path=curves_path)
+    curve_data = load_curve_from_path(curve_path) if curve_path else None
+    if not curve_data:
+        logger.warning('Impossible to generate LODs of curve "{}" because it does not exists'.format(curve_name))
+        return False
+
+    curve_data = simplify.add_curve_lods(curve_data, levels=levels)
+    return _write_curve_file(curve_data, curve_path)
+
+
 def rename_curve(curve_name, new_name, curves_path=None):
     """
     Renames the curve from the library with the new name
@@ -269,7 +1345,7 @@ def rename_curve(curve_name, new_name, curves_path=None):
     curve_directory = os.path.dirname(curve_path)
     curve_file_name = '{}{}'.format(curve_name, consts.CURVE_EXT)
     new_name = '{}{}'.format(new_name, consts.CURVE_EXT)
-    new_curve_path = path_utils.clean_path(os.path.join(curve_path, new_name))
+    new_curve_path = path_utils.clean_path(os.path.join(curve_directory, new_name))
     if os.path.isfile(new_curve_path):
         logger.warning(
             'Cannot rename curve, because a curve with the same path already exists: "{}"'.format(new_curve_path))
@@ -279,6 +1355,7 @@ def rename_curve(curve_name, new_name, curves_path=None):
     if not os.path.isfile(renamed_path):
         logger.warning('Was not possible to rename curve "{}" file: "{}'.format(curve_name, curve_path))
         return False
+    _update_catalogs(added_path=renamed_path, removed_path=curve_path)
 
     logger.info(
         'Curve "{}" has been renamed successfully: "{}" >> "{}"'.format(curve_name, curve_path, renamed_path))
@@ -306,6 +1383,7 @@ def delete_curve(curve_name, curves_path=None):
     if os.path.isfile(curve_path):
         logger.warning('Was not possible to remove curve "{}" file: "{}'.format(curve_name, curve_path))
         return False
+    _update_catalogs(removed_path=curve_path)
 
     logger.info('Curve "{}" has been deleted successfully: "{}"'.format(curve_name, curve_path))
 
@@ -314,7 +1392,7 @@ def delete_curve(curve_name, curves_path=None):
 
 def create_curve(
         curve_type, curves_path=None, curve_name='new_curve', curve_size=1.0, translate_offset=(0.0, 0.0, 0.0),
-        scale=(1.0, 1.0, 1.0), axis_order='XYZ', mirror=None, color=None, parent=None):
+        scale=(1.0, 1.0, 1.0), axis_order='XYZ', mirror=None, color=None, parent=None, target_size=None, lod=0):
     """
     Creates the curve stored in the given path
     :param curve_type: str, type of the control to create
@@ -324,12 +1402,89 @@ def create_curve(
     :param translate_offset: tuple(float, float, float), XYZ translation offset to apply to the curve
     :param scale: tuple(float, float, float), XYZ scale to apply to the curve
     :param axis_order: str, axis order of the curve. Default is XYZ.
-    :param mirror: str or None, axis mirror to apply to the curve shapes (None, 'X', 'Y' or 'Z')
+    :param mirror: str or None, plane to mirror the curve shapes across (None, 'XY', 'YZ' or 'ZX') or axis to flip
+        ('X', 'Y' or 'Z')
     :param color: tuple(float, float, float) or int, color of the curve
     :param parent: str or None, if given control shapes will be parented into this transform
+    :param target_size: float or None, if given, curve size is computed from the curve cached bounds so the largest
+        side of the curve bounding box matches this size. Given curve size is ignored.
+    :param lod: int, LOD level of the curve to create. 0 creates the full resolution curve. LODs stored in the curve
+        file are used if available; otherwise they are generated with the default LOD levels.
     :return:
     """
 
+    control_path = _find_curve_type_path(curve_type, curves_path=curves_path)
+    control_data = load_curve_from_path(control_path) if control_path else None
+    if not control_data:
+        return None
+
+    if target_size is not None:
+        curve_size = geometry.get_target_curve_size(
+            get_curve_metadata_from_path(control_path, curves_path=curves_path), target_size, default_size=curve_size)
+
+    return _create_curve_from_type_data(
+        control_data, curve_name=curve_name, curve_size=curve_size, translate_offset=translate_offset, scale=scale,
+        axis_order=axis_order, mirror=mirror, color=color, parent=parent, lod=lod)
+
+
+def create_curves(curve_specs):
+    """
+    Creates multiple curves at once. Each different curve type is resolved and parsed only once no matter how many
+    curves of that type are created.
+    :param curve_specs: list(dict), list of curves to create. Each spec is a dictionary that must contain a
+        curve_type key and can contain any other create_curve keyword argument (curves_path, curve_name, curve_size,
+        translate_offset, scale, axis_order, mirror, color, parent, target_size and lod).
+    :return: tuple(list, OrderedDict(int, str)), list with the result of each created curve (following specs order,
+        None if a curve could not be created) and error messages by spec index of the curves that failed
+    """
+
+    results = [None] * len(curve_specs)
+    errors = OrderedDict()
+
+    curve_types_data = dict()
+    curve_types_metadata = dict()
+    for curve_spec in curve_specs:
+        curve_type_key = (curve_spec.get('curve_type', None), curve_spec.get('curves_path', None))
+        if curve_type_key[0] and curve_type_key not in curve_types_data:
+            curve_types_data[curve_type_key] = _load_curve_type_data(curve_type_key[0], curves_path=curve_type_key[1])
+
+    for i, curve_spec in enumerate(curve_specs):
+        curve_spec = dict(curve_spec)
+        curve_type = curve_spec.pop('curve_type', None)
+        curves_path = curve_spec.pop('curves_path', None)
+        if not curve_type:
+            errors[i] = 'No curve type defined'
+            continue
+        control_data = curve_types_data.get((curve_type, curves_path), None)
+        if not control_data:
+            errors[i] = 'Curve type "{}" does not exists'.format(curve_type)
+            continue
+        target_size = curve_spec.pop('target_size', None)
+        if target_size is not None:
+            if (curve_type, curves_path) not in curve_types_metadata:
+                curve_types_metadata[(curve_type, curves_path)] = geometry.get_curve_metadata(control_data)
+            curve_spec['curve_size'] = geometry.get_target_curve_size(
+                curve_types_metadata[(curve_type, curves_path)], target_size,
+                default_size=curve_spec.get('curve_size', 1.0))
+        try:
+            results[i] = _create_curve_from_type_data(cache.copy_curve_data(control_data), **curve_spec)
+        except Exception as exc:
+            errors[i] = str(exc)
+
+    for i, error in errors.items():
+        logger.warning('Impossible to create curve "{}": {}'.format(curve_specs[i].get('curve_type', None), error))
+
+    return results, errors
+
+
+def _find_curve_type_path(curve_type, curves_path=None):
+    """
+    Internal function that returns the curve file path of the given curve type
+    :param curve_type: str, type of the control to find
+    :param curves_path: str, path that stores control data
+    :return: str or None
+    """
+
     if not curves_path or not os.path.isdir(curves_path):
         control_path = find_curve_path_by_name(curve_type)
     else:
@@ -337,13 +1492,46 @@ def create_curve(
     if not control_path or not os.path.isfile(control_path):
         return None
 
-    control_data = jsonio.read_file(control_path, as_ordered_dict=True)
-    if not control_data:
+    return control_path
+
+
+def _load_curve_type_data(curve_type, curves_path=None):
+    """
+    Internal function that returns the curve data of the given curve type
+    :param curve_type: str, type of the control to load
+    :param curves_path: str, path that stores control data
+    :return: dict or None
+    """
+
+    control_path = _find_curve_type_path(curve_type, curves_path=curves_path)
+    if not control_path:
         return None
 
-    return create_curve_from_data(
-        control_data, name=curve_name, curve_size=curve_size, translate_offset=translate_offset, scale=scale,
-        axis_order=axis_order, mirror=mirror, color=color, parent=parent)
+    return load_curve_from_path(control_path)
+
+
+def _create_curve_from_type_data(
+        control_data, curve_name='new_curve', curve_size=1.0, translate_offset=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0),
+        axis_order='XYZ', mirror=None, color=None, parent=None, lod=0):
+    """
+    Internal function that creates a curve from the given curve type data using create_curve arguments.
+    LOD is resolved, CVs are converted into DCC space and size, offset, scale, axis order and mirror are applied to
+    them in a single transform before calling the DCC, so DCC implementations receive curve data ready to be created.
+    :param control_data: dict
+    :return:
+    """
+
+    control_data = simplify.get_curve_lod(control_data, lod=lod)
+
+    # Creation transforms are defined in DCC space, so CVs must be converted into that space before applying them
+    control_data = convert_curve_data_to_dcc(control_data)
+
+    matrix = geometry.compose_transform_matrix(
+        curve_size=curve_size, translate_offset=translate_offset, scale=scale, axis_order=axis_order, mirror=mirror)
+    if not geometry.is_identity_matrix(matrix):
+        control_data = geometry.transform_curve_data(control_data, matrix)
+
+    return create_curve_from_data(control_data, name=curve_name, color=color, parent=parent)
 
 
 @reroute.reroute_factory(consts.LIB_ID, 'curveslib')
@@ -357,6 +1545,18 @@ def create_curve_from_data(curve_data, **kwargs):
     raise NotImplementedError('Function create_control_from_data not implemented for current DCC!')
 
 
+@reroute.reroute_factory(consts.LIB_ID, 'curveslib')
+def convert_curve_data_to_dcc(curve_data):
+    """
+    Returns the given curve data with its CVs converted into the space (up axis) of current DCC. By default, curve
+    data space is the same as DCC one and given curve data is returned.
+    :param curve_data: dict
+    :return: dict
+    """
+
+    return curve_data
+
+
 @reroute.reroute_factory(consts.LIB_ID, 'curveslib')
 def get_curve_data(curve_shape_node, space=None, color_data=False):
     """
@@ -0,0 +1,295 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains DCC agnostic geometric operations over curve data
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpDcc.libs.curves.core import consts, nurbs, hashing
+
+# Mirror key > XYZ factors. Plane keys are the ones used by DCC implementations, axis keys flip the given axis.
+MIRROR_VECTORS = {
+    None: (1.0, 1.0, 1.0),
+    'None': (1.0, 1.0, 1.0),
+    'XY': (1.0, 1.0, -1.0),
+    'YZ': (-1.0, 1.0, 1.0),
+    'ZX': (1.0, -1.0, 1.0),
+    'X': (-1.0, 1.0, 1.0),
+    'Y': (1.0, -1.0, 1.0),
+    'Z': (1.0, 1.0, -1.0)
+}
+
+
+def _copy_shapes(curve_data):
+    """
+    Internal function that returns a shallow copy of the given curve data where each shape dictionary is also copied
+    :param curve_data: dict
+    :return: OrderedDict
+    """
+
+    return OrderedDict((shape_name, OrderedDict(shape_data)) for shape_name, shape_data in curve_data.items())
+
+
+def stack_cvs(curve_data):
+    """
+    Returns all the CVs of all the shapes of the given curve data stacked in a single array
+    :param curve_data: dict
+    :return: tuple(numpy.ndarray, list(tuple(str, int, int))), (N, 3) float64 array with all CVs and the list of
+        shape names with the start and end rows of their CVs in the array
+    """
+
+    ranges = list()
+    all_cvs = list()
+    for shape_name, shape_data in curve_data.items():
+        cvs = shape_data.get('cvs', None) or list()
+        ranges.append((shape_name, len(all_cvs), len(all_cvs) + len(cvs)))
+        all_cvs.extend(cvs)
+
+    stacked_cvs = numpy.array(all_cvs, dtype=numpy.float64)
+    if not all_cvs:
+        stacked_cvs = stacked_cvs.reshape(0, 3)
+
+    return stacked_cvs, ranges
+
+
+def unstack_cvs(curve_data, stacked_cvs, ranges):
+    """
+    Returns a copy of the given curve data where shapes CVs are replaced by the ones stored in the given stacked array
+    :param curve_data: dict
+    :param stacked_cvs: numpy.ndarray
+    :param ranges: list(tuple(str, int, int)), shape names with the start and end rows of their CVs
+    :return: OrderedDict
+    """
+
+    new_curve_data = _copy_shapes(curve_data)
+    for shape_name, start, end in ranges:
+        if 'cvs' in new_curve_data[shape_name]:
+            new_curve_data[shape_name]['cvs'] = stacked_cvs[start:end].tolist()
+
+    return new_curve_data
+
+
+def _get_normalize_factors(mode, minimum, maximum, max_abs):
+    """
+    Internal function that returns the offset and the size CVs must be translated and divided by to normalize them
+    :param mode: str
+    :param minimum: list(float), minimum coordinate per axis
+    :param maximum: list(float), maximum coordinate per axis
+    :param max_abs: list(float), maximum absolute coordinate per axis
+    :return: tuple(list(float), list(float)), offset and size per axis
+    """
+
+    if mode == consts.NormalizeMode.AXIS:
+        offset = [0.0] * len(max_abs)
+        size = [value or 1.0 for value in max_abs]
+    elif mode == consts.NormalizeMode.BOUNDING_BOX:
+        offset = [-(low + high) * 0.5 for low, high in zip(minimum, maximum)]
+        half_size = max((high - low) * 0.5 for low, high in zip(minimum, maximum))
+        size = [half_size or 1.0] * len(max_abs)
+    elif mode == consts.NormalizeMode.MAX:
+        offset = [0.0] * len(max_abs)
+        size = [max(max_abs) or 1.0] * len(max_abs)
+    else:
+        raise ValueError('Normalize mode "{}" is not supported'.format(mode))
+
+    return offset, size
+
+
+def normalize_curve_data(curve_data, mode=consts.NormalizeMode.MAX):
+    """
+    Returns a copy of the given curve data with the CVs of all its shapes normalized to stay in -1 to 1 space
+    :param curve_data: dict
+    :param mode: str, normalization mode (consts.NormalizeMode)
+    :return: OrderedDict
+    """
+
+    if not curve_data:
+        return curve_data
+
+    if numpy is not None:
+        stacked_cvs, ranges = stack_cvs(curve_data)
+        if not len(stacked_cvs):
+            return _copy_shapes(curve_data)
+        offset, size = _get_normalize_factors(
+            mode, stacked_cvs.min(axis=0).tolist(), stacked_cvs.max(axis=0).tolist(),
+            numpy.abs(stacked_cvs).max(axis=0).tolist())
+        stacked_cvs += offset
+        stacked_cvs /= size
+        return unstack_cvs(curve_data, stacked_cvs, ranges)
+
+    all_cvs = [cv for shape_data in curve_data.values() for cv in shape_data.get('cvs', None) or list()]
+    if not all_cvs:
+        return _copy_shapes(curve_data)
+    axes = list(zip(*all_cvs))
+    offset, size = _get_normalize_factors(
+        mode, [min(axis) for axis in axes], [max(axis) for axis in axes], [max(abs(p) for p in axis) for axis in axes])
+    new_curve_data = _copy_shapes(curve_data)
+    for shape_data in new_curve_data.values():
+        if 'cvs' in shape_data:
+            shape_data['cvs'] = [[(p + o) / s for p, o, s in zip(cv, offset, size)] for cv in shape_data['cvs']]
+
+    return new_curve_data
+
+
+def _get_points_bounds(points):
+    """
+    Internal function that returns the bounding box and the centroid of the given points
+    :param points: list(list(float))
+    :return: tuple(list(list(float)), list(float)), minimum and maximum corners of the bounding box and centroid
+    """
+
+    if not points:
+        return [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]], [0.0, 0.0, 0.0]
+
+    axes = list(zip(*points))
+
+    return [[min(axis) for axis in axes], [max(axis) for axis in axes]], [sum(axis) / len(points) for axis in axes]
+
+
+def get_shape_metadata(shape_data):
+    """
+    Returns bounding box, centroid, CVs count, degree and closedness of the given curve shape.
+    Bounding box is computed from the CVs, which always enclose the curve. The repeated CVs of periodic shapes are
+    not taken into account to compute the centroid.
+    :param shape_data: dict
+    :return: OrderedDict
+    """
+
+    cvs = shape_data.get('cvs', None) or list()
+    degree = shape_data.get('degree', 1)
+    form = shape_data.get('form', nurbs.FORM_OPEN)
+    unique_cvs = cvs
+    if form == nurbs.FORM_PERIODIC and 0 < degree < len(cvs) and cvs[-degree:] == cvs[:degree]:
+        unique_cvs = cvs[:-degree]
+    bounding_box, centroid = _get_points_bounds(unique_cvs)
+
+    return OrderedDict([
+        ('bounding_box', bounding_box),
+        ('centroid', centroid),
+        ('cvs_count', len(unique_cvs)),
+        ('degree', degree),
+        ('closed', form in (nurbs.FORM_CLOSED, nurbs.FORM_PERIODIC))
+    ])
+
+
+def get_curve_metadata(curve_data):
+    """
+    Returns bounding box, centroid, size and canonical content hash of the given curve data and the metadata of each
+    one of its shapes
+    :param curve_data: dict
+    :return: OrderedDict
+    """
+
+    shapes_metadata = OrderedDict(
+        (shape_name, get_shape_metadata(shape_data)) for shape_name, shape_data in curve_data.items())
+    corners = [corner for shape_metadata in shapes_metadata.values() if shape_metadata['cvs_count'] for corner in
+               shape_metadata['bounding_box']]
+    bounding_box, _ = _get_points_bounds(corners)
+    cvs_count = sum(shape_metadata['cvs_count'] for shape_metadata in shapes_metadata.values())
+    centroid = [0.0, 0.0, 0.0]
+    if cvs_count:
+        centroid = [sum(shape_metadata['centroid'][i] * shape_metadata['cvs_count'] for shape_metadata in
+                        shapes_metadata.values()) / cvs_count for i in range(3)]
+
+    return OrderedDict([
+        ('bounding_box', bounding_box),
+        ('centroid', centroid),
+        ('size', [high - low for low, high in zip(*bounding_box)]),
+        ('cvs_count', cvs_count),
+        ('hash', hashing.get_curve_hash(curve_data)),
+        ('shapes', shapes_metadata)
+    ])
+
+
+def get_target_curve_size(curve_metadata, target_size, default_size=1.0):
+    """
+    Returns the global size a curve must be created with so its largest bounding box side matches the given size
+    :param curve_metadata: dict, curve metadata as returned by get_curve_metadata
+    :param target_size: float
+    :param default_size: float, size returned if the curve has no extent
+    :return: float
+    """
+
+    max_extent = max(curve_metadata['size']) if curve_metadata else 0.0
+
+    return target_size / max_extent if max_extent > 0.0 else default_size
+
+
+def compose_transform_matrix(
+        curve_size=1.0, translate_offset=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0), axis_order='XYZ', mirror=None):
+    """
+    Composes curve creation parameters into a single 4x4 matrix. Matrix follows row vector convention (points are
+    multiplied on the left) and gives the same result than the DCC implementations did when they applied the
+    parameters one by one: CVs are multiplied by global size and scale, offset is added, the result is mirrored and
+    finally its axes are reordered. Scale and offset are reordered following the axis order before applying them.
+    :param curve_size: float, global size of the curve
+    :param translate_offset: tuple(float, float, float), XYZ translation offset
+    :param scale: tuple(float, float, float), XYZ scale
+    :param axis_order: str, axis order of the curve. 'ZXY' means X coordinates are taken from the original Z
+        coordinates, Y coordinates from the original X ones and Z coordinates from the original Y ones
+    :param mirror: str or None, plane to mirror the curve across (None, 'None', 'XY', 'YZ' or 'ZX') or axis to
+        flip ('X', 'Y' or 'Z')
+    :return: list(list(float)), 4x4 row major matrix
+    """
+
+    axis_order = (axis_order or 'XYZ').upper()
+    if sorted(axis_order) != ['X', 'Y', 'Z']:
+        raise ValueError('Axis order "{}" is not valid'.format(axis_order))
+    if mirror not in MIRROR_VECTORS:
+        raise ValueError('Mirror "{}" is not valid'.format(mirror))
+    mirror_vector = MIRROR_VECTORS[mirror]
+    scale = scale or (1.0, 1.0, 1.0)
+    translate_offset = translate_offset or (0.0, 0.0, 0.0)
+
+    order = ['XYZ'.index(axis) for axis in axis_order]
+    matrix = [[0.0, 0.0, 0.0, 0.0] for _ in range(3)] + [[0.0, 0.0, 0.0, 1.0]]
+    for i, source_axis in enumerate(order):
+        reordered_axis = order[source_axis]
+        matrix[source_axis][i] = curve_size * scale[reordered_axis] * mirror_vector[source_axis]
+        matrix[3][i] = translate_offset[reordered_axis] * mirror_vector[source_axis]
+
+    return [[float(value) for value in row] for row in matrix]
+
+
+def is_identity_matrix(matrix):
+    """
+    Returns whether the given 4x4 matrix is the identity matrix
+    :param matrix: list(list(float))
+    :return: bool
+    """
+
+    return all(matrix[i][j] == (1.0 if i == j else 0.0) for i in range(4) for j in range(4))
+
+
+def transform_curve_data(curve_data, matrix):
+    """
+    Returns a copy of the given curve data with the CVs of all its shapes transformed by the given matrix
+    :param curve_data: dict
+    :param matrix: list(list(float)), 4x4 row major matrix following row vector convention
+    :return: OrderedDict
+    """
+
+    if numpy is not None:
+        stacked_cvs, ranges = stack_cvs(curve_data)
+        if not len(stacked_cvs):
+            return _copy_shapes(curve_data)
+        matrix = numpy.asarray(matrix, dtype=numpy.float64)
+        return unstack_cvs(curve_data, stacked_cvs.dot(matrix[:3, :3]) + matrix[3, :3], ranges)
+
+    new_curve_data = _copy_shapes(curve_data)
+    rotation, translation = [row[:3] for row in matrix[:3]], matrix[3][:3]
+    for shape_data in new_curve_data.values():
+        if 'cvs' in shape_data:
+            shape_data['cvs'] = [[sum(cv[j] * rotation[j][i] for j in range(3)) + translation[i] for i in range(3)]
+                                 for cv in shape_data['cvs']]
+
+    return new_curve_data
@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to compute canonical content hashes of curve data
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import json
+import hashlib
+
+from tpDcc.libs.curves.core import nurbs
+
+# Coordinates closer than this are considered equal when hashing
+DEFAULT_PRECISION = 1e-6
+
+
+def _quantize(values, precision):
+    """
+    Internal function that converts given float values into integers with the given precision
+    :param values: list(float)
+    :param precision: float
+    :return: list(int)
+    """
+
+    return [int(round(value / precision)) for value in values]
+
+
+def get_shape_hash(shape_data, precision=DEFAULT_PRECISION):
+    """
+    Returns a canonical hash of the geometry of the given curve shape. Shape name and non geometric keys are ignored,
+    knot vectors are expanded and remapped to the 0 to 1 domain and CVs and knots are quantized, so shapes describing
+    the same curve get the same hash.
+    :param shape_data: dict
+    :param precision: float, quantization step used for CVs and knots
+    :return: str
+    """
+
+    cvs, knots, degree, (start, end) = nurbs.get_evaluation_data(shape_data)
+    length = end - start
+    if length:
+        knots = [(knot - start) / length for knot in knots]
+    canonical_data = [
+        degree, shape_data.get('form', nurbs.FORM_OPEN), _quantize(knots, precision),
+        [_quantize(cv, precision) for cv in cvs]]
+
+    return hashlib.sha1(json.dumps(canonical_data, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def get_curve_hash(curve_data, precision=DEFAULT_PRECISION):
+    """
+    Returns a canonical hash of the geometry of the given curve data. Hash does not depend on the names of the shapes
+    nor on the order they are stored in.
+    :param curve_data: dict
+    :param precision: float, quantization step used for CVs and knots
+    :return: str
+    """
+
+    shape_hashes = sorted(get_shape_hash(shape_data, precision=precision) for shape_data in curve_data.values())
+
+    return hashlib.sha1(','.join(shape_hashes).encode('utf-8')).hexdigest()
@@ -8,12 +8,13 @@ Module that contains library definition for tpDcc-libs-curveslib
 from __future__ import print_function, division, absolute_import
 
 import os
-import logging.config
+import logging
 
 from tpDcc import dcc
 from tpDcc.core import library, command
 from tpDcc.libs.python import path as path_utils
 
+from tpDcc.libs import curves
 from tpDcc.libs.curves.core import consts
 
 logger = logging.getLogger(consts.LIB_ID)
@@ -43,6 +44,8 @@ class CurvesLib(library.DccLibrary, object):
 
     @classmethod
     def load(cls):
+        curves.create_logger()
+
         # Initialize environment variable that contains paths were curves libs command are located
         # This environment variable is used by the command runner
         dcc_name = dcc.client().get_name()
@@ -0,0 +1,327 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains DCC agnostic NURBS functions to work with curve data
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FORM_OPEN = 1
+FORM_CLOSED = 2
+FORM_PERIODIC = 3
+
+
+def get_default_knots(cvs_count, degree, form=FORM_OPEN):
+    """
+    Returns a uniform knot vector for a curve with the given number of CVs, degree and form. Knot vector follows
+    curve files layout (cvs count + degree - 1 knots): clamped for open and closed curves and unclamped for periodic
+    curves.
+    :param cvs_count: int
+    :param degree: int
+    :param form: int
+    :return: list(float)
+    """
+
+    if form == FORM_PERIODIC:
+        return [float(i) for i in range(-degree + 1, cvs_count)]
+
+    spans = max(cvs_count - degree, 0)
+
+    return [0.0] * (degree - 1) + [float(i) for i in range(spans + 1)] + [float(spans)] * (degree - 1)
+
+
+def normalize_knots(knots, cvs_count, degree, form=FORM_OPEN):
+    """
+    Returns a new knot vector with cvs count + degree + 1 knots, padding given knots with copies of their first and
+    last values. Given knots list is not modified.
+    :param knots: list(float) or None, knots vector. If None, a default knot vector will be generated.
+    :param cvs_count: int
+    :param degree: int
+    :param form: int
+    :return: list(float)
+    """
+
+    if not knots:
+        knots = get_default_knots(cvs_count, degree, form=form)
+
+    knots_count = len(knots)
+    total_knots = cvs_count + degree + 1
+    if knots_count >= total_knots:
+        return list(knots)
+
+    # Knots are added in pairs, one at the start and one at the end of the vector
+    padding = (total_knots - knots_count + 1) // 2
+    new_knots = [knots[0]] * (knots_count + padding * 2)
+    new_knots[padding:padding + knots_count] = knots
+    new_knots[padding + knots_count:] = [knots[-1]] * padding
+
+    return new_knots
+
+
+def normalize_curve_knots(curve_data):
+    """
+    Returns a copy of the given curve data where the knot vectors of all its shapes have been normalized
+    :param curve_data: dict
+    :return: OrderedDict
+    """
+
+    new_curve_data = OrderedDict()
+    for shape_name, shape_data in curve_data.items():
+        new_shape_data = OrderedDict(shape_data)
+        new_shape_data['knots'] = normalize_knots(
+            shape_data.get('knots', None), len(shape_data['cvs']), shape_data['degree'],
+            form=shape_data.get('form', FORM_OPEN))
+        new_curve_data[shape_name] = new_shape_data
+
+    return new_curve_data
+
+
+def get_evaluation_data(shape_data):
+    """
+    Returns the data needed to evaluate the given curve shape
+    Periodic shapes are expected to store their first degree CVs repeated at the end of the CVs list, as curve files
+    do. If they are not repeated, they are appended to the returned CVs.
+    :param shape_data: dict
+    :return: tuple(list(list(float)), list(float), int, tuple(float, float)), CVs, knot vector with cvs count + degree
+        + 1 knots, degree and evaluation domain of the curve
+    """
+
+    cvs = [list(cv) for cv in shape_data['cvs']]
+    degree = shape_data['degree']
+    form = shape_data.get('form', FORM_OPEN)
+    knots = shape_data.get('knots', None)
+
+    if form == FORM_PERIODIC and degree > 0 and len(cvs) > degree and cvs[-degree:] != cvs[:degree]:
+        cvs.extend(cvs[:degree])
+        knots = None
+
+    if knots and len(knots) not in (len(cvs) + degree - 1, len(cvs) + degree + 1):
+        knots = None
+    knots = normalize_knots(knots, len(cvs), degree, form=form)
+
+    return cvs, knots, degree, (knots[degree], knots[len(cvs)])
+
+
+def get_derivative_data(cvs, knots, degree):
+    """
+    Returns the evaluation data of the derivative curve of the given curve
+    :param cvs: list(list(float))
+    :param knots: list(float), knot vector with cvs count + degree + 1 knots
+    :param degree: int
+    :return: tuple(list(list(float)), list(float), int)
+    """
+
+    derivative_cvs = list()
+    for i in range(len(cvs) - 1):
+        span = knots[i + degree + 1] - knots[i + 1]
+        factor = degree / span if span else 0.0
+        derivative_cvs.append([(b - a) * factor for a, b in zip(cvs[i], cvs[i + 1])])
+
+    return derivative_cvs, knots[1:-1], degree - 1
+
+
+def _find_span(knots, cvs_count, degree, param):
+    """
+    Internal function that returns the index of the knot span that contains the given parameter
+    :param knots: list(float)
+    :param cvs_count: int
+    :param degree: int
+    :param param: float
+    :return: int
+    """
+
+    low, high = degree, cvs_count
+    if param >= knots[cvs_count]:
+        return cvs_count - 1
+    while high - low > 1:
+        middle = (low + high) // 2
+        if knots[middle] <= param:
+            low = middle
+        else:
+            high = middle
+
+    return low
+
+
+def _de_boor(cvs, knots, degree, params):
+    """
+    Internal function that evaluates the given curve in the given parameters using de Boor algorithm
+    :param cvs: list(list(float))
+    :param knots: list(float), knot vector with cvs count + degree + 1 knots
+    :param degree: int
+    :param params: list(float)
+    :return: list(list(float))
+    """
+
+    points = list()
+    for param in params:
+        span = _find_span(knots, len(cvs), degree, param)
+        points_to_blend = [list(cvs[j + span - degree]) for j in range(degree + 1)]
+        for r in range(1, degree + 1):
+            for j in range(degree, r - 1, -1):
+                low = knots[j + span - degree]
+                denominator = knots[j + 1 + span - r] - low
+                alpha = (param - low) / denominator if denominator else 0.0
+                points_to_blend[j] = [
+                    (1.0 - alpha) * a + alpha * b for a, b in zip(points_to_blend[j - 1], points_to_blend[j])]
+        points.append(points_to_blend[degree])
+
+    return points
+
+
+def _de_boor_vectorized(cvs, knots, degree, params):
+    """
+    Internal function that evaluates the given curve in all the given parameters at once using de Boor algorithm
+    :param cvs: numpy.ndarray, (cvs count, dimension) array
+    :param knots: numpy.ndarray
+    :param degree: int
+    :param params: numpy.ndarray
+    :return: numpy.ndarray, (parameters count, dimension) array
+    """
+
+    cvs_count = len(cvs)
+    spans = numpy.clip(numpy.searchsorted(knots, params, side='right') - 1, degree, cvs_count - 1)
+    points_to_blend = [cvs[spans + j - degree] for j in range(degree + 1)]
+    for r in range(1, degree + 1):
+        for j in range(degree, r - 1, -1):
+            low = knots[spans + j - degree]
+            denominator = knots[spans + j + 1 - r] - low
+            safe_denominator = numpy.where(denominator == 0.0, 1.0, denominator)
+            alpha = numpy.where(denominator == 0.0, 0.0, (params - low) / safe_denominator)[:, None]
+            points_to_blend[j] = (1.0 - alpha) * points_to_blend[j - 1] + alpha * points_to_blend[j]
+
+    return points_to_blend[degree]
+
+
+def evaluate_cvs(cvs, knots, degree, params):
+    """
+    Evaluates the curve defined by the given CVs, knots and degree in the given parameters. Vectorized with NumPy if
+    it is available.
+    :param cvs: list(list(float)) or numpy.ndarray
+    :param knots: list(float), knot vector with cvs count + degree + 1 knots
+    :param degree: int
+    :param params: list(float)
+    :return: list(list(float)) or numpy.ndarray
+    """
+
+    if not len(cvs):
+        return numpy.zeros((len(params), 3)) if numpy is not None else [[0.0, 0.0, 0.0] for _ in params]
+    if numpy is not None:
+        return _de_boor_vectorized(
+            numpy.asarray(cvs, dtype=numpy.float64), numpy.asarray(knots, dtype=numpy.float64), degree,
+            numpy.asarray(params, dtype=numpy.float64))
+
+    return _de_boor(cvs, knots, degree, params)
+
+
+def evaluate_points(shape_data, params):
+    """
+    Returns the points of the given curve shape at the given parameters
+    :param shape_data: dict
+    :param params: list(float), parameters within the shape evaluation domain
+    :return: list(list(float)) or numpy.ndarray, (parameters count, 3) array if NumPy is available
+    """
+
+    cvs, knots, degree, _ = get_evaluation_data(shape_data)
+
+    return evaluate_cvs(cvs, knots, degree, params)
+
+
+def evaluate_point(shape_data, param):
+    """
+    Returns the point of the given curve shape at the given parameter
+    :param shape_data: dict
+    :param param: float
+    :return: list(float)
+    """
+
+    return list(evaluate_points(shape_data, [param])[0])
+
+
+def evaluate_tangent(shape_data, param, normalize=False):
+    """
+    Returns the first derivative of the given curve shape at the given parameter
+    :param shape_data: dict
+    :param param: float
+    :param normalize: bool, Whether to return an unit length tangent
+    :return: list(float)
+    """
+
+    return list(evaluate_tangents(shape_data, [param], normalize=normalize)[0])
+
+
+def evaluate_tangents(shape_data, params, normalize=False):
+    """
+    Returns the first derivatives of the given curve shape at the given parameters
+    :param shape_data: dict
+    :param params: list(float), parameters within the shape evaluation domain
+    :param normalize: bool, Whether to return unit length tangents
+    :return: list(list(float)) or numpy.ndarray, (parameters count, 3) array if NumPy is available
+    """
+
+    cvs, knots, degree, _ = get_evaluation_data(shape_data)
+    if degree < 1:
+        tangents = evaluate_cvs([[0.0, 0.0, 0.0]], [0.0, 1.0], 0, params)
+    else:
+        tangents = evaluate_cvs(*get_derivative_data(cvs, knots, degree), params=params)
+    if not normalize:
+        return tangents
+
+    if numpy is not None:
+        lengths = numpy.linalg.norm(tangents, axis=1)[:, None]
+        return numpy.divide(tangents, lengths, out=numpy.zeros_like(tangents), where=lengths > 0.0)
+    normalized_tangents = list()
+    for tangent in tangents:
+        length = sum(value * value for value in tangent) ** 0.5
+        normalized_tangents.append([value / length for value in tangent] if length else list(tangent))
+
+    return normalized_tangents
+
+
+def get_uniform_params(domain, count):
+    """
+    Returns given number of parameters uniformly distributed along the given domain, both ends included
+    :param domain: tuple(float, float)
+    :param count: int
+    :return: list(float)
+    """
+
+    if count < 2:
+        return [domain[0]] * count
+
+    step = (domain[1] - domain[0]) / (count - 1)
+
+    return [domain[0] + step * i for i in range(count - 1)] + [domain[1]]
+
+
+def sample_shape(shape_data, count=64):
+    """
+    Returns a polyline with the given number of points uniformly sampled along the domain of the given curve shape
+    :param shape_data: dict
+    :param count: int
+    :return: list(list(float)) or numpy.ndarray, (count, 3) array if NumPy is available
+    """
+
+    cvs, knots, degree, domain = get_evaluation_data(shape_data)
+
+    return evaluate_cvs(cvs, knots, degree, get_uniform_params(domain, count))
+
+
+def sample_curve(curve_data, count=64):
+    """
+    Returns a polyline for each one of the shapes of the given curve data
+    :param curve_data: dict
+    :param count: int, number of points to sample per shape
+    :return: OrderedDict(str, list(list(float)) or numpy.ndarray)
+    """
+
+    return OrderedDict(
+        (shape_name, sample_shape(shape_data, count=count)) for shape_name, shape_data in curve_data.items())
@@ -0,0 +1,167 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the resolution of the root paths where curve files are located
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import threading
+
+from tpDcc.libs.python import path as path_utils
+
+from tpDcc.libs.curves.core import consts
+
+# Environment variable that contains additional curves root paths separated by os.pathsep
+CURVES_PATH_ENV = consts.LIB_ID.replace('-', '_').upper()
+
+
+def _get_path_key(root_path):
+    """
+    Internal function that returns the key used to know whether two root paths point to the same directory
+    :param root_path: str
+    :return: str
+    """
+
+    return os.path.normcase(os.path.normpath(os.path.abspath(os.path.expanduser(root_path))))
+
+
+class CurveRootPaths(object):
+    """
+    Class that resolves the curves root paths defined in the library configuration and in the curves environment
+    variable once and reuses them until the environment variable changes or until they are invalidated explicitly.
+    Configuration paths take precedence over environment ones and duplicated paths only keep their first occurrence,
+    so curves with the same name located in different roots are always resolved in the same order.
+    """
+
+    def __init__(self, config_paths_getter=None):
+        """
+        :param config_paths_getter: callable or None, function that returns the list of root paths defined in the
+            library configuration
+        """
+
+        super(CurveRootPaths, self).__init__()
+
+        self._config_paths_getter = config_paths_getter
+        self._env_value = None
+        self._paths = None
+        self._missing_paths = tuple()
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __bool__(self):
+        return bool(self.paths)
+
+    __nonzero__ = __bool__
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def paths(self):
+        """
+        Returns the existing root paths sorted by precedence
+        :return: tuple(str)
+        """
+
+        paths = self._paths
+        if paths is None or not self.is_valid():
+            paths = self.resolve()
+
+        return paths
+
+    @property
+    def default_path(self):
+        """
+        Returns the root path with more precedence, which is the one used to save new curves
+        :return: str or None
+        """
+
+        paths = self.paths
+
+        return paths[0] if paths else None
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def is_valid(self):
+        """
+        Returns whether resolved root paths are still valid. They are not valid if the environment variable changed
+        or if a root path that did not exist when they were resolved exists now.
+        :return: bool
+        """
+
+        if self._paths is None or os.environ.get(CURVES_PATH_ENV, '') != self._env_value:
+            return False
+
+        return not any(os.path.isdir(missing_path) for missing_path in self._missing_paths)
+
+    def invalidate(self):
+        """
+        Forces root paths to be resolved again next time they are requested. Must be called when library
+        configuration changes.
+        """
+
+        with self._lock:
+            self._paths = None
+
+    def resolve(self):
+        """
+        Resolves root paths from library configuration and environment variable
+        :return: tuple(str)
+        """
+
+        env_value = os.environ.get(CURVES_PATH_ENV, '')
+        candidate_paths = list(self._config_paths_getter() or list()) if self._config_paths_getter else list()
+        candidate_paths.extend(env_value.split(os.pathsep))
+
+        paths = list()
+        missing_paths = list()
+        visited = set()
+        for root_path in candidate_paths:
+            if not root_path:
+                continue
+            path_key = _get_path_key(root_path)
+            if path_key in visited:
+                continue
+            visited.add(path_key)
+            if os.path.isdir(root_path):
+                paths.append(path_utils.clean_path(root_path))
+            else:
+                missing_paths.append(root_path)
+
+        paths = tuple(paths)
+        with self._lock:
+            self._env_value = env_value
+            self._paths = paths
+            self._missing_paths = tuple(missing_paths)
+
+        return paths
+
+    def get_layer_path(self, layer):
+        """
+        Returns the root path of the given layer
+        :param layer: int or str, precedence index of the root path (0 is the root path with more precedence) or
+            root path itself
+        :return: str or None
+        """
+
+        paths = self.paths
+        if isinstance(layer, int):
+            return paths[layer] if -len(paths) <= layer < len(paths) else None
+
+        layer_key = _get_path_key(layer)
+        for root_path in paths:
+            if _get_path_key(root_path) == layer_key:
+                return root_path
+
+        return None
@@ -0,0 +1,300 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to compute geometric descriptors of curves and to find similar curves
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import array
+import bisect
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpDcc.libs.curves.core import tessellation
+
+# Number of points curves are resampled into to compute their descriptors
+SAMPLES_COUNT = 256
+
+# Number of cells per axis of the occupancy grid part of the descriptors. It is odd so planar curves, which are
+# very common, lie in the middle of a row of cells instead of in the boundary between two of them
+GRID_SIZE = 7
+
+# Number of bins of the pairwise distances histogram part of the descriptors
+DISTANCE_BINS = 16
+
+# Every Nth sample is used to compute pairwise distances
+DISTANCE_STRIDE = 4
+
+DESCRIPTOR_SIZE = GRID_SIZE ** 3 + DISTANCE_BINS
+
+
+def _get_polylines_points(curve_data):
+    """
+    Internal function that returns the tessellated points of all the shapes of the given curve data
+    :param curve_data: dict
+    :return: list(list(list(float)))
+    """
+
+    polylines = list()
+    for polyline in tessellation.tessellate_curve(curve_data).values():
+        if numpy is not None:
+            points = polyline.tolist()
+        else:
+            points = [list(polyline[i:i + 3]) for i in range(0, len(polyline), 3)]
+        if points:
+            polylines.append(points)
+
+    return polylines
+
+
+def resample_curve(curve_data, count=SAMPLES_COUNT):
+    """
+    Returns the given number of points uniformly distributed by arc length along all the shapes of the given curve
+    :param curve_data: dict
+    :param count: int
+    :return: list(list(float))
+    """
+
+    polylines = _get_polylines_points(curve_data)
+    segments = list()
+    for points in polylines:
+        segments.extend(zip(points[:-1], points[1:]))
+    if not segments:
+        return [point for points in polylines for point in points]
+
+    lengths = [sum((b - a) ** 2 for a, b in zip(start, end)) ** 0.5 for start, end in segments]
+    total_length = sum(lengths)
+    if not total_length:
+        return [start for start, _ in segments]
+
+    cumulative_lengths = list()
+    current_length = 0.0
+    for length in lengths:
+        current_length += length
+        cumulative_lengths.append(current_length)
+
+    samples = list()
+    for i in range(count):
+        target_length = (i + 0.5) / count * total_length
+        index = min(bisect.bisect_right(cumulative_lengths, target_length), len(segments) - 1)
+        start, end = segments[index]
+        factor = 0.0
+        if lengths[index]:
+            factor = (target_length - (cumulative_lengths[index] - lengths[index])) / lengths[index]
+        samples.append([a + (b - a) * factor for a, b in zip(start, end)])
+
+    return samples
+
+
+def _normalize_samples(samples):
+    """
+    Internal function that centers given samples in their centroid and scales them to fit the unit sphere
+    :param samples: list(list(float))
+    :return: list(list(float))
+    """
+
+    centroid = [sum(axis) / len(samples) for axis in zip(*samples)]
+    centered = [[value - center for value, center in zip(sample, centroid)] for sample in samples]
+    radius = max(sum(value * value for value in sample) ** 0.5 for sample in centered) or 1.0
+
+    return [[value / radius for value in sample] for sample in centered]
+
+
+def _unit(values):
+    """
+    Internal function that returns given values scaled to unit length
+    :param values: list(float)
+    :return: list(float)
+    """
+
+    length = sum(value * value for value in values) ** 0.5
+
+    return [value / length for value in values] if length else list(values)
+
+
+def get_descriptor(curve_data):
+    """
+    Returns the geometric descriptor of the given curve. Descriptor combines the occupancy grid of the curve points
+    (each point is distributed between its 8 nearest cells) with the histogram of distances between them, both
+    computed after centering the curve and scaling it to the unit sphere, so it does not depend on curve position,
+    size, shape names or CVs parameterization.
+    :param curve_data: dict
+    :return: numpy.ndarray or array.array, unit length float32 vector of DESCRIPTOR_SIZE values
+    """
+
+    samples = resample_curve(curve_data)
+    if not samples:
+        return numpy.zeros(DESCRIPTOR_SIZE, dtype=numpy.float32) if numpy is not None else array.array(
+            'f', [0.0] * DESCRIPTOR_SIZE)
+
+    if numpy is not None:
+        points = numpy.asarray(samples, dtype=numpy.float64)
+        points -= points.mean(axis=0)
+        radius = numpy.linalg.norm(points, axis=1).max()
+        points /= radius or 1.0
+        coordinates = numpy.clip((points + 1.0) * 0.5 * GRID_SIZE - 0.5, 0.0, GRID_SIZE - 1.0)
+        lower_cells = numpy.minimum(numpy.floor(coordinates).astype(numpy.int64), GRID_SIZE - 2)
+        factors = coordinates - lower_cells
+        grid = numpy.zeros(GRID_SIZE ** 3, dtype=numpy.float64)
+        for corner in range(8):
+            offsets = numpy.array([(corner >> 2) & 1, (corner >> 1) & 1, corner & 1])
+            cells = lower_cells + offsets
+            weights = numpy.prod(numpy.where(offsets, factors, 1.0 - factors), axis=1)
+            grid += numpy.bincount(
+                (cells[:, 0] * GRID_SIZE + cells[:, 1]) * GRID_SIZE + cells[:, 2], weights=weights,
+                minlength=GRID_SIZE ** 3)
+        subset = points[::DISTANCE_STRIDE]
+        distances = numpy.linalg.norm(subset[:, None, :] - subset[None, :, :], axis=2)
+        distances = distances[numpy.triu_indices(len(subset), k=1)]
+        histogram = numpy.histogram(distances, bins=DISTANCE_BINS, range=(0.0, 2.0))[0]
+        parts = [part.astype(numpy.float64) for part in (grid, histogram)]
+        parts = [part / (numpy.linalg.norm(part) or 1.0) for part in parts]
+        return (numpy.concatenate(parts) * 0.5 ** 0.5).astype(numpy.float32)
+
+    points = _normalize_samples(samples)
+    grid = [0.0] * GRID_SIZE ** 3
+    for point in points:
+        coordinates = [min(max((value + 1.0) * 0.5 * GRID_SIZE - 0.5, 0.0), GRID_SIZE - 1.0) for value in point]
+        lower_cells = [min(int(coordinate), GRID_SIZE - 2) for coordinate in coordinates]
+        factors = [coordinate - cell for coordinate, cell in zip(coordinates, lower_cells)]
+        for corner in range(8):
+            offsets = [(corner >> 2) & 1, (corner >> 1) & 1, corner & 1]
+            weight = 1.0
+            for offset, factor in zip(offsets, factors):
+                weight *= factor if offset else 1.0 - factor
+            x, y, z = [cell + offset for cell, offset in zip(lower_cells, offsets)]
+            grid[(x * GRID_SIZE + y) * GRID_SIZE + z] += weight
+    subset = points[::DISTANCE_STRIDE]
+    histogram = [0.0] * DISTANCE_BINS
+    for i, point in enumerate(subset):
+        for other_point in subset[i + 1:]:
+            distance = sum((a - b) ** 2 for a, b in zip(point, other_point)) ** 0.5
+            histogram[min(int(distance * 0.5 * DISTANCE_BINS), DISTANCE_BINS - 1)] += 1.0
+
+    return array.array('f', [value * 0.5 ** 0.5 for value in _unit(grid) + _unit(histogram)])
+
+
+class SimilarityIndex(object):
+    """
+    Class that stores the descriptors of multiple curves in a compact array to find the curves most similar to a
+    given one
+    """
+
+    def __init__(self):
+        super(SimilarityIndex, self).__init__()
+
+        self._descriptors = OrderedDict()       # curve name > descriptor
+        self._sources = dict()                  # curve name > source info (for example, curve path, mtime and size)
+        self._matrix = None
+        self._names = list()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._descriptors)
+
+    def __contains__(self, curve_name):
+        return curve_name in self._descriptors
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def names(self):
+        return list(self._descriptors.keys())
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def get_source(self, curve_name):
+        """
+        Returns the source info stored with the descriptor of the given curve
+        :param curve_name: str
+        :return: object or None
+        """
+
+        return self._sources.get(curve_name, None)
+
+    def add(self, curve_name, curve_data, source=None):
+        """
+        Computes the descriptor of the given curve and adds it into the index, replacing the previous one if any
+        :param curve_name: str
+        :param curve_data: dict
+        :param source: object or None, info used to know whether the curve changed since it was indexed
+        """
+
+        descriptor = get_descriptor(curve_data)
+        with self._lock:
+            self._descriptors[curve_name] = descriptor
+            self._sources[curve_name] = source
+            self._matrix = None
+
+    def remove(self, curve_name):
+        """
+        Removes the given curve from the index
+        :param curve_name: str
+        :return: bool
+        """
+
+        with self._lock:
+            if curve_name not in self._descriptors:
+                return False
+            self._descriptors.pop(curve_name)
+            self._sources.pop(curve_name, None)
+            self._matrix = None
+
+        return True
+
+    def clear(self):
+        """
+        Removes all the curves from the index
+        """
+
+        with self._lock:
+            self._descriptors.clear()
+            self._sources.clear()
+            self._matrix = None
+
+    def query(self, curve_data, count=5, exclude=None):
+        """
+        Returns the indexed curves most similar to the given curve data
+        :param curve_data: dict
+        :param count: int, maximum number of curves to return
+        :param exclude: list(str) or None, names of the curves to ignore
+        :return: list(tuple(str, float)), names of the most similar curves with their similarity score (from 0 to 1)
+            sorted from most to less similar
+        """
+
+        descriptor = get_descriptor(curve_data)
+        exclude = set(exclude or list())
+
+        with self._lock:
+            if not self._descriptors or count <= 0:
+                return list()
+            if self._matrix is None:
+                self._names = list(self._descriptors.keys())
+                if numpy is not None:
+                    self._matrix = numpy.vstack(list(self._descriptors.values()))
+                else:
+                    self._matrix = list(self._descriptors.values())
+            names, matrix = self._names, self._matrix
+
+        if numpy is not None:
+            scores = matrix.dot(descriptor)
+            candidates_count = min(count + len(exclude), len(names))
+            candidates = numpy.argpartition(-scores, candidates_count - 1)[:candidates_count]
+            candidates = candidates[numpy.argsort(-scores[candidates], kind='stable')]
+            results = [(names[i], float(scores[i])) for i in candidates.tolist()]
+        else:
+            scores = [sum(a * b for a, b in zip(row, descriptor)) for row in matrix]
+            results = sorted(zip(names, scores), key=lambda result: -result[1])
+
+        return [result for result in results if result[0] not in exclude][:count]
@@ -0,0 +1,352 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to reduce the number of CVs of curve data
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import copy
+import json
+import heapq
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpDcc.libs.curves.core import nurbs, hashing, tessellation
+
+# Default maximum distance allowed between a simplified shape and its original one
+DEFAULT_TOLERANCE = 0.001
+
+# Default LOD levels. Tolerances are relative to the size of each shape
+LOD_LEVELS = ({'tolerance': 0.005}, {'tolerance': 0.02}, {'tolerance': 0.05})
+
+# Shape keys stored in each LOD level
+LOD_KEYS = ('degree', 'form', 'knots', 'cvs')
+
+MAX_CACHED_LODS = 1024
+
+_LODS_CACHE = OrderedDict()
+_LODS_LOCK = threading.Lock()
+
+
+def simplify_polyline(points, tolerance=DEFAULT_TOLERANCE, max_points=None):
+    """
+    Removes the points of the given polyline that are not needed to keep its shape within the given tolerance,
+    following Ramer-Douglas-Peucker algorithm. Points are added back in order of importance, so when a max number of
+    points is given the most relevant ones are kept. Collinear points are always removed. First and last points are
+    kept.
+    :param points: list(list(float))
+    :param tolerance: float or None, max distance allowed between removed points and the simplified polyline
+    :param max_points: int or None, max number of points of the simplified polyline
+    :return: tuple(list(list(float)), float), simplified points and max distance of the removed points to the
+        simplified polyline
+    """
+
+    if len(points) < 3:
+        return [list(point) for point in points], 0.0
+
+    def _push_farthest(first, last):
+        farthest, farthest_distance = None, -1.0
+        for i in range(first + 1, last):
+            distance = tessellation._get_segment_distance(points[i], points[first], points[last])
+            if distance > farthest_distance:
+                farthest, farthest_distance = i, distance
+        if farthest is not None:
+            heapq.heappush(ranges, (-farthest_distance, first, last, farthest))
+
+    max_points = len(points) if max_points is None else max(max_points, 2)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    kept_count = 2
+    ranges = list()
+    _push_farthest(0, len(points) - 1)
+    while ranges:
+        distance = -ranges[0][0]
+        if kept_count >= max_points or (tolerance is not None and distance <= tolerance) or not distance:
+            break
+        _, first, last, farthest = heapq.heappop(ranges)
+        keep[farthest] = True
+        kept_count += 1
+        _push_farthest(first, farthest)
+        _push_farthest(farthest, last)
+
+    return [list(point) for point, kept in zip(points, keep) if kept], -ranges[0][0] if ranges else 0.0
+
+
+def _get_basis_matrix(knots, degree, cvs_count, params):
+    """
+    Internal function that returns the value of the basis function of each CV at each one of the given parameters
+    :param knots: list(float), knot vector with cvs count + degree + 1 knots
+    :param degree: int
+    :param cvs_count: int
+    :param params: numpy.ndarray
+    :return: numpy.ndarray, (parameters count, cvs count) array
+    """
+
+    # Evaluating a curve whose CVs are the identity matrix gives the basis functions values
+    return nurbs.evaluate_cvs(numpy.identity(cvs_count), knots, degree, params)
+
+
+def _fit_shape(points, degree, cvs_count, periodic):
+    """
+    Internal function that fits a curve with uniform knots and the given number of CVs to the given points using
+    least squares. Open curves keep their end points.
+    :param points: numpy.ndarray, (N, 3) array of points sampled along the original shape
+    :param degree: int
+    :param cvs_count: int, number of CVs of the fitted curve (without the repeated CVs of periodic curves)
+    :param periodic: bool
+    :return: tuple(numpy.ndarray, list(float), float), fitted CVs (periodic CVs repeated at the end), knots in curve
+        files layout and max distance between the given points and the fitted curve
+    """
+
+    if periodic:
+        points = points[:-1]
+        closed_points = numpy.vstack([points, points[:1]])
+    else:
+        closed_points = points
+    chord_lengths = numpy.linalg.norm(numpy.diff(closed_points, axis=0), axis=1)
+    params = numpy.concatenate([[0.0], numpy.cumsum(chord_lengths)])
+    params /= params[-1] or 1.0
+    if periodic:
+        params = params[:-1]
+
+    total_cvs = cvs_count + degree if periodic else cvs_count
+    form = nurbs.FORM_PERIODIC if periodic else nurbs.FORM_OPEN
+    knots = nurbs.get_default_knots(total_cvs, degree, form=form)
+    full_knots = nurbs.normalize_knots(knots, total_cvs, degree, form=form)
+    start, end = full_knots[degree], full_knots[total_cvs]
+    params = start + params * (end - start)
+
+    basis = _get_basis_matrix(full_knots, degree, total_cvs, params)
+    if periodic:
+        basis[:, :degree] += basis[:, cvs_count:]
+        cvs = numpy.linalg.lstsq(basis[:, :cvs_count], points, rcond=None)[0]
+        cvs = numpy.vstack([cvs, cvs[:degree]])
+    else:
+        rhs = points - numpy.outer(basis[:, 0], points[0]) - numpy.outer(basis[:, -1], points[-1])
+        inner_cvs = numpy.linalg.lstsq(basis[:, 1:-1], rhs, rcond=None)[0]
+        cvs = numpy.vstack([points[:1], inner_cvs, points[-1:]])
+
+    fitted_points = nurbs.evaluate_cvs(cvs, full_knots, degree, params)
+
+    return cvs, knots, float(numpy.linalg.norm(fitted_points - points, axis=1).max())
+
+
+def _refit_shape(shape_data, tolerance, max_cvs=None):
+    """
+    Internal function that returns the CVs and knots of the curve with the least number of uniform CVs that stays
+    within the given tolerance from the given shape
+    :param shape_data: dict
+    :param tolerance: float or None
+    :param max_cvs: int or None, max number of CVs of the refitted shape. If no fit within tolerance is found with
+        this number of CVs, the fit with max CVs is returned.
+    :return: tuple(list(list(float)), list(float), float) or None, CVs, knots and max deviation of the refitted shape.
+        None if the shape could not be simplified.
+    """
+
+    cvs, knots, degree, domain = nurbs.get_evaluation_data(shape_data)
+    periodic = shape_data.get('form', nurbs.FORM_OPEN) == nurbs.FORM_PERIODIC
+    original_count = len(cvs) - degree if periodic else len(cvs)
+    min_count = degree + 1
+    if original_count <= min_count:
+        return None
+
+    samples_count = min(max(original_count * 10, 200), 2000)
+    points = numpy.asarray(nurbs.evaluate_cvs(cvs, knots, degree, nurbs.get_uniform_params(domain, samples_count)))
+
+    best_fit = None
+    low, high = min_count, original_count - 1
+    if max_cvs is not None:
+        high = min(high, max(max_cvs, min_count))
+    max_count = high
+    while low <= high and tolerance is not None:
+        cvs_count = (low + high) // 2
+        try:
+            fit = _fit_shape(points, degree, cvs_count, periodic)
+        except numpy.linalg.LinAlgError:
+            fit = None
+        if fit and fit[2] <= tolerance:
+            best_fit = fit
+            high = cvs_count - 1
+        else:
+            low = cvs_count + 1
+    if not best_fit and max_cvs is not None:
+        try:
+            best_fit = _fit_shape(points, degree, max_count, periodic)
+        except numpy.linalg.LinAlgError:
+            best_fit = None
+
+    if not best_fit:
+        return None
+
+    return best_fit[0].tolist(), best_fit[1], best_fit[2]
+
+
+def simplify_shape(shape_data, tolerance=DEFAULT_TOLERANCE, max_cvs=None):
+    """
+    Returns a copy of the given curve shape with as few CVs as possible while staying within the given tolerance.
+    Degree 1 shapes are simplified removing collinear and redundant CVs. Higher degree shapes are refitted with
+    uniform knots using least squares, which requires NumPy; if it is not available they are returned unchanged.
+    LOD variants stored in the shape are discarded if the shape is simplified.
+    :param shape_data: dict
+    :param tolerance: float or None, max distance allowed between the original and the simplified shape
+    :param max_cvs: int or None, max number of CVs (without the repeated CVs of periodic shapes) of the simplified
+        shape. If given, it has priority over the tolerance.
+    :return: tuple(OrderedDict, dict), simplified shape data and report with the CVs count before and after the
+        simplification and the max deviation from the original shape
+    """
+
+    new_shape_data = OrderedDict(shape_data)
+    cvs = shape_data.get('cvs', None) or list()
+    degree = shape_data.get('degree', 1)
+    form = shape_data.get('form', nurbs.FORM_OPEN)
+    report = {'cvs_count_before': len(cvs), 'cvs_count_after': len(cvs), 'max_deviation': 0.0}
+
+    if degree == 1:
+        max_points = None
+        if max_cvs is not None:
+            max_points = max_cvs + 1 if form == nurbs.FORM_PERIODIC else max_cvs
+        new_cvs, max_deviation = simplify_polyline(cvs, tolerance=tolerance, max_points=max_points)
+        if len(new_cvs) >= len(cvs):
+            return new_shape_data, report
+        new_shape_data['cvs'] = new_cvs
+        new_shape_data['knots'] = nurbs.get_default_knots(len(new_cvs), degree, form=form)
+    elif degree > 1 and numpy is not None:
+        refit = _refit_shape(shape_data, tolerance, max_cvs=max_cvs)
+        if not refit or len(refit[0]) >= len(cvs):
+            return new_shape_data, report
+        new_cvs, new_knots, max_deviation = refit
+        new_shape_data['cvs'] = new_cvs
+        new_shape_data['knots'] = new_knots
+    else:
+        return new_shape_data, report
+
+    new_shape_data.pop('lods', None)
+    report['cvs_count_after'] = len(new_shape_data['cvs'])
+    report['max_deviation'] = max_deviation
+
+    return new_shape_data, report
+
+
+def simplify_curve(curve_data, tolerance=DEFAULT_TOLERANCE):
+    """
+    Returns a copy of the given curve data with the CVs of all its shapes simplified
+    :param curve_data: dict
+    :param tolerance: float, max distance allowed between the original and the simplified shapes
+    :return: tuple(OrderedDict, dict), simplified curve data and report with the total CVs count before and after
+        the simplification, the max deviation and the report of each shape
+    """
+
+    new_curve_data = OrderedDict()
+    shapes_report = OrderedDict()
+    for shape_name, shape_data in curve_data.items():
+        new_curve_data[shape_name], shapes_report[shape_name] = simplify_shape(shape_data, tolerance=tolerance)
+
+    report = {
+        'cvs_count_before': sum(shape_report['cvs_count_before'] for shape_report in shapes_report.values()),
+        'cvs_count_after': sum(shape_report['cvs_count_after'] for shape_report in shapes_report.values()),
+        'max_deviation': max([shape_report['max_deviation'] for shape_report in shapes_report.values()] or [0.0]),
+        'shapes': shapes_report
+    }
+
+    return new_curve_data, report
+
+
+def _get_shape_size(shape_data):
+    """
+    Internal function that returns the length of the largest side of the bounding box of the given shape CVs
+    :param shape_data: dict
+    :return: float
+    """
+
+    cvs = shape_data.get('cvs', None) or list()
+    if not cvs:
+        return 0.0
+
+    return max(max(axis) - min(axis) for axis in zip(*cvs))
+
+
+def get_shape_lods(shape_data, levels=LOD_LEVELS):
+    """
+    Returns the geometry of the LOD variants of the given shape. Each LOD is simplified from the original shape, so
+    its deviation is bounded by its own tolerance. LODs of the same shape geometry are only generated once per
+    session.
+    :param shape_data: dict
+    :param levels: list(dict), LOD levels definition. Each level is a dictionary with a tolerance key (relative to
+        the size of the shape) or a max_cvs key
+    :return: list(OrderedDict), degree, form, knots and CVs of each LOD level
+    """
+
+    cache_key = (hashing.get_shape_hash(shape_data), json.dumps(levels, sort_keys=True))
+    with _LODS_LOCK:
+        shape_lods = _LODS_CACHE.pop(cache_key, None)
+        if shape_lods is not None:
+            _LODS_CACHE[cache_key] = shape_lods
+            return copy.deepcopy(shape_lods)
+
+    size = _get_shape_size(shape_data) or 1.0
+    geometry_data = OrderedDict((key, shape_data[key]) for key in LOD_KEYS if key in shape_data)
+    shape_lods = list()
+    for level in levels:
+        tolerance = level.get('tolerance', None)
+        lod_data, _ = simplify_shape(
+            geometry_data, tolerance=tolerance * size if tolerance is not None else None,
+            max_cvs=level.get('max_cvs', None))
+        shape_lods.append(OrderedDict((key, lod_data[key]) for key in LOD_KEYS if key in lod_data))
+
+    with _LODS_LOCK:
+        _LODS_CACHE[cache_key] = shape_lods
+        while len(_LODS_CACHE) > MAX_CACHED_LODS:
+            _LODS_CACHE.popitem(last=False)
+
+    return copy.deepcopy(shape_lods)
+
+
+def add_curve_lods(curve_data, levels=LOD_LEVELS):
+    """
+    Returns a copy of the given curve data where each shape stores the geometry of its LOD variants in a lods key
+    :param curve_data: dict
+    :param levels: list(dict), LOD levels definition. Each level is a dictionary with a tolerance key (relative to
+        the size of the shape) or a max_cvs key
+    :return: OrderedDict
+    """
+
+    new_curve_data = OrderedDict()
+    for shape_name, shape_data in curve_data.items():
+        new_shape_data = OrderedDict(shape_data)
+        new_shape_data['lods'] = get_shape_lods(shape_data, levels=levels)
+        new_curve_data[shape_name] = new_shape_data
+
+    return new_curve_data
+
+
+def get_curve_lod(curve_data, lod=0, levels=LOD_LEVELS):
+    """
+    Returns a copy of the given curve data where the geometry of each shape is replaced by the one of the given LOD
+    level. LODs stored in the curve data are used if available; otherwise they are generated. Returned data never
+    contains LOD variants, so it can be directly created in a DCC.
+    :param curve_data: dict
+    :param lod: int, LOD level. 0 is the full resolution curve. Levels higher than the available ones return the
+        lightest LOD.
+    :param levels: list(dict), LOD levels definition used if the curve data does not store its LODs
+    :return: OrderedDict
+    """
+
+    new_curve_data = OrderedDict()
+    for shape_name, shape_data in curve_data.items():
+        new_shape_data = OrderedDict(shape_data)
+        shape_lods = new_shape_data.pop('lods', None)
+        if lod > 0:
+            if not shape_lods:
+                shape_lods = get_shape_lods(shape_data, levels=levels)
+            if shape_lods:
+                new_shape_data.update(shape_lods[min(lod, len(shape_lods)) - 1])
+        new_curve_data[shape_name] = new_shape_data
+
+    return new_curve_data
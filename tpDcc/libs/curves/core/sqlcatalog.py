@@ -0,0 +1,618 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains curve catalog implementation that persists the index of curve files in a SQLite database
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+from tpDcc.libs.python import path as path_utils
+
+from tpDcc.libs.curves.core import consts, geometry, storage
+
+logger = logging.getLogger(consts.LIB_ID)
+
+# Version of the database schema. Databases with a different version are rebuilt.
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    root TEXT NOT NULL,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS directories_parent ON directories (parent);
+CREATE TABLE IF NOT EXISTS curves (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    root TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    mtime REAL,
+    size INTEGER,
+    hash TEXT,
+    cvs_count INTEGER,
+    shapes_count INTEGER,
+    min_x REAL, min_y REAL, min_z REAL,
+    max_x REAL, max_y REAL, max_z REAL,
+    max_extent REAL
+);
+CREATE INDEX IF NOT EXISTS curves_name ON curves (name);
+CREATE INDEX IF NOT EXISTS curves_root ON curves (root);
+CREATE INDEX IF NOT EXISTS curves_directory ON curves (directory);
+CREATE INDEX IF NOT EXISTS curves_hash ON curves (hash);
+CREATE TABLE IF NOT EXISTS tags (
+    path TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (path, tag)
+);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+"""
+
+_CURVE_COLUMNS = (
+    'path', 'name', 'root', 'directory', 'mtime', 'size', 'hash', 'cvs_count', 'shapes_count', 'min_x', 'min_y',
+    'min_z', 'max_x', 'max_y', 'max_z', 'max_extent')
+
+
+def is_available():
+    """
+    Returns whether SQLite catalogs can be used in current Python interpreter
+    :return: bool
+    """
+
+    return sqlite3 is not None
+
+
+def _load_curve_file(curve_path):
+    """
+    Internal function that loads the curve data stored in the given curve file
+    :param curve_path: str
+    :return: dict or None
+    """
+
+    try:
+        with open(curve_path, 'r') as fh:
+            return json.load(fh, object_pairs_hook=OrderedDict)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+class SqlCurveCatalog(object):
+    """
+    Class that indexes the curve files located in curves root paths into a SQLite database. Index persists between
+    sessions and it is updated incrementally: only directories whose modification time changed since last sync are
+    listed again and only curve files whose modification time or size changed are parsed again. Curves can be
+    retrieved by name or filtered by name pattern, root path, tags, content hash, size and CVs count using indexed
+    queries.
+    """
+
+    def __init__(self, root_paths, database_path, curve_loader=None):
+        """
+        :param root_paths: list(str), curves root paths sorted by precedence
+        :param database_path: str, path of the SQLite database file. It is created if it does not exist.
+        :param curve_loader: callable or None, function that returns the curve data of a curve path
+        """
+
+        super(SqlCurveCatalog, self).__init__()
+
+        if sqlite3 is None:
+            raise RuntimeError('SQLite is not available in current Python interpreter')
+
+        self._root_paths = [path_utils.clean_path(root_path) for root_path in root_paths if root_path]
+        self._database_path = database_path
+        self._curve_loader = curve_loader or _load_curve_file
+        self._lock = threading.RLock()
+        self._synced = False
+        self._connection = sqlite3.connect(database_path, check_same_thread=False, timeout=30.0)
+        self._connection.row_factory = sqlite3.Row
+        self._initialize()
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def root_paths(self):
+        return list(self._root_paths)
+
+    @property
+    def database_path(self):
+        return self._database_path
+
+    @property
+    def synced(self):
+        return self._synced
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def close(self):
+        """
+        Closes the connection with the database
+        """
+
+        with self._lock:
+            self._connection.close()
+
+    def sync(self, full=False):
+        """
+        Updates the database with the changes of the curve files located in the root paths
+        :param full: bool, Whether to list all directories and check all curve files, even if their directory did not
+            change. Required to detect curve files modified in place by external tools.
+        :return: bool, True if the index changed; False otherwise
+        """
+
+        with self._lock, self._connection:
+            changed = False
+            visited = set()
+            for root_path in self._root_paths:
+                changed = self._sync_directory(root_path, None, root_path, visited, full) or changed
+            self._synced = True
+
+        return changed
+
+    def find_curve_path(self, curve_name):
+        """
+        Returns the path of the curve file with the given name located in the root path with more precedence
+        :param curve_name: str, name of the curve (without extension)
+        :return: str or None
+        """
+
+        curve_paths = self.get_curve_providers(curve_name)
+
+        return curve_paths[0] if curve_paths else None
+
+    def get_curve_providers(self, curve_name):
+        """
+        Returns the paths of all the curve files with the given name sorted by root paths precedence
+        :param curve_name: str, name of the curve (without extension)
+        :return: list(str)
+        """
+
+        return [row['path'] for row in self._query('name = ?', [curve_name])]
+
+    def get_curve_names(self):
+        """
+        Returns the names of all the curves sorted by root paths precedence
+        :return: list(str)
+        """
+
+        if not self._synced:
+            self.sync()
+        if not self._root_paths:
+            return list()
+
+        sql = 'SELECT name FROM curves WHERE +root IN ({}) GROUP BY name ORDER BY MIN({}), MIN(path)'.format(
+            ', '.join('?' * len(self._root_paths)), self._get_rank_expression())
+        with self._lock:
+            cursor = self._connection.execute(sql, self._root_paths + self._root_paths)
+            return [row['name'] for row in cursor.fetchall()]
+
+    def get_curve_paths(self, root_path=None):
+        """
+        Returns the paths of all the curve files sorted by root paths precedence
+        :param root_path: str or None, if given only curve files located in this root path will be returned
+        :return: list(str)
+        """
+
+        return [row['path'] for row in self.query(root_path=root_path, include_shadowed=True)]
+
+    def get_curve_info(self, curve_path):
+        """
+        Returns the info stored for the given curve file
+        :param curve_path: str
+        :return: dict or None
+        """
+
+        rows = self._query('path = ?', [path_utils.clean_path(curve_path)])
+
+        return rows[0] if rows else None
+
+    def query(
+            self, name_pattern=None, root_path=None, tags=None, curve_hash=None, min_size=None, max_size=None,
+            min_cvs=None, max_cvs=None, include_shadowed=False, limit=None):
+        """
+        Returns the curves that match all the given filters
+        :param name_pattern: str or None, glob pattern (case sensitive) curve names must match, for example "arrow*"
+        :param root_path: str or None, root path curves must be located in
+        :param tags: list(str) or None, tags curves must have
+        :param curve_hash: str or None, content hash curves must have
+        :param min_size: float or None, minimum size of the largest side of curves bounding box
+        :param max_size: float or None, maximum size of the largest side of curves bounding box
+        :param min_cvs: int or None, minimum number of CVs of curves
+        :param max_cvs: int or None, maximum number of CVs of curves
+        :param include_shadowed: bool, Whether to include curves shadowed by curves with the same name located in
+            root paths with more precedence
+        :param limit: int or None, maximum number of curves to return
+        :return: list(dict), info of each curve sorted by root paths precedence
+        """
+
+        conditions = list()
+        parameters = list()
+        if name_pattern:
+            conditions.append('name GLOB ?')
+            parameters.append(name_pattern)
+        if root_path:
+            conditions.append('root = ?')
+            parameters.append(path_utils.clean_path(root_path))
+        if curve_hash:
+            conditions.append('hash = ?')
+            parameters.append(curve_hash)
+        for column, operator, value in (
+                ('max_extent', '>=', min_size), ('max_extent', '<=', max_size), ('cvs_count', '>=', min_cvs),
+                ('cvs_count', '<=', max_cvs)):
+            if value is not None:
+                conditions.append('{} {} ?'.format(column, operator))
+                parameters.append(value)
+        if tags:
+            tags = sorted(set(tags))
+            conditions.append(
+                'path IN (SELECT path FROM tags WHERE tag IN ({}) GROUP BY path HAVING COUNT(*) = ?)'.format(
+                    ', '.join('?' * len(tags))))
+            parameters.extend(tags + [len(tags)])
+
+        rows = self._query(' AND '.join(conditions), parameters)
+        if not include_shadowed:
+            winners = self._get_winner_paths(set(row['name'] for row in rows))
+            rows = [row for row in rows if winners.get(row['name'], None) == row['path']]
+
+        return rows[:limit] if limit is not None else rows
+
+    def get_curve_tags(self, curve_path):
+        """
+        Returns the tags of the given curve file
+        :param curve_path: str
+        :return: list(str)
+        """
+
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT tag FROM tags WHERE path = ? ORDER BY tag', [path_utils.clean_path(curve_path)])
+            return [row['tag'] for row in cursor.fetchall()]
+
+    def get_tags(self):
+        """
+        Returns all the tags used by the indexed curves and the number of curves that use each one of them
+        :return: OrderedDict(str, int)
+        """
+
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT tag, COUNT(*) AS count FROM tags WHERE path IN (SELECT path FROM curves WHERE root IN ({})) '
+                'GROUP BY tag ORDER BY tag'.format(', '.join('?' * len(self._root_paths))), self._root_paths)
+            return OrderedDict((row['tag'], row['count']) for row in cursor.fetchall())
+
+    def set_curve_tags(self, curve_path, tags):
+        """
+        Replaces the tags of the given curve file. Tags are kept while the curve file exists.
+        :param curve_path: str
+        :param tags: list(str)
+        :return: bool
+        """
+
+        curve_path = path_utils.clean_path(curve_path)
+        if not self.get_curve_info(curve_path):
+            return False
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM tags WHERE path = ?', [curve_path])
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO tags (path, tag) VALUES (?, ?)', [(curve_path, tag) for tag in set(tags)])
+
+        return True
+
+    def add_curve_tags(self, curve_path, tags):
+        """
+        Adds the given tags to the given curve file
+        :param curve_path: str
+        :param tags: list(str)
+        :return: bool
+        """
+
+        return self.set_curve_tags(curve_path, set(self.get_curve_tags(curve_path)).union(tags))
+
+    def remove_curve_tags(self, curve_path, tags):
+        """
+        Removes the given tags from the given curve file
+        :param curve_path: str
+        :param tags: list(str)
+        :return: bool
+        """
+
+        return self.set_curve_tags(curve_path, set(self.get_curve_tags(curve_path)).difference(tags))
+
+    def add_curve_path(self, curve_path, curve_data=None):
+        """
+        Registers given curve file into the database without syncing its directory
+        :param curve_path: str
+        :param curve_data: dict or None, curve data stored in the curve file. If not given, it is loaded.
+        :return: bool
+        """
+
+        curve_path = path_utils.clean_path(curve_path)
+        root_path = self._get_root_path(curve_path)
+        if not root_path:
+            return False
+        try:
+            file_stat = os.stat(curve_path)
+        except OSError:
+            return False
+
+        with self._lock, self._connection:
+            self._update_curve(curve_path, root_path, file_stat, curve_data=curve_data)
+
+        return True
+
+    def remove_curve_path(self, curve_path):
+        """
+        Unregisters given curve file from the database without syncing its directory
+        :param curve_path: str
+        :return: bool
+        """
+
+        curve_path = path_utils.clean_path(curve_path)
+        with self._lock, self._connection:
+            cursor = self._connection.execute('DELETE FROM curves WHERE path = ?', [curve_path])
+            self._connection.execute('DELETE FROM tags WHERE path = ?', [curve_path])
+
+        return cursor.rowcount > 0
+
+    def move_curve_path(self, curve_path, new_curve_path, curve_data=None):
+        """
+        Moves the info and the tags of the given curve file to its new path without syncing their directories
+        :param curve_path: str, old curve file path
+        :param new_curve_path: str, new curve file path
+        :param curve_data: dict or None, curve data stored in the curve file. If not given, it is loaded.
+        :return: bool
+        """
+
+        curve_path = path_utils.clean_path(curve_path)
+        new_curve_path = path_utils.clean_path(new_curve_path)
+        root_path = self._get_root_path(new_curve_path)
+        try:
+            file_stat = os.stat(new_curve_path) if root_path else None
+        except OSError:
+            file_stat = None
+        if not file_stat:
+            self.remove_curve_path(curve_path)
+            return False
+
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM curves WHERE path = ?', [curve_path])
+            self._connection.execute('DELETE FROM tags WHERE path = ?', [new_curve_path])
+            self._connection.execute('UPDATE tags SET path = ? WHERE path = ?', [new_curve_path, curve_path])
+            self._update_curve(new_curve_path, root_path, file_stat, curve_data=curve_data)
+
+        return True
+
+    def clear(self):
+        """
+        Removes all the info stored in the database
+        """
+
+        with self._lock, self._connection:
+            for table in ('directories', 'curves', 'tags'):
+                self._connection.execute('DELETE FROM {}'.format(table))
+            self._synced = False
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _initialize(self):
+        """
+        Internal function that creates database tables, rebuilding them if their schema is outdated
+        """
+
+        with self._lock, self._connection:
+            version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                for table in ('directories', 'curves', 'tags'):
+                    self._connection.execute('DROP TABLE IF EXISTS {}'.format(table))
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute('PRAGMA user_version = {}'.format(SCHEMA_VERSION))
+
+    def _query(self, condition=None, parameters=None):
+        """
+        Internal function that returns the info of the curves located in the root paths that match the given SQL
+        condition sorted by root paths precedence and path
+        :param condition: str or None
+        :param parameters: list or None
+        :return: list(dict)
+        """
+
+        if not self._synced:
+            self.sync()
+        if not self._root_paths:
+            return list()
+
+        # Root index is disabled in root paths filter (unary plus), so SQLite uses the index of the given condition
+        sql = 'SELECT {} FROM curves WHERE +root IN ({}){} ORDER BY {}, path'.format(
+            ', '.join(_CURVE_COLUMNS), ', '.join('?' * len(self._root_paths)),
+            ' AND {}'.format(condition) if condition else '', self._get_rank_expression())
+        with self._lock:
+            cursor = self._connection.execute(
+                sql, list(self._root_paths) + list(parameters or list()) + list(self._root_paths))
+            return [OrderedDict(zip(_CURVE_COLUMNS, tuple(row))) for row in cursor.fetchall()]
+
+    def _get_rank_expression(self):
+        """
+        Internal function that returns the SQL expression that sorts curves by the precedence of their root path.
+        Root paths must be given as parameters of the expression.
+        :return: str
+        """
+
+        return 'CASE root {} END'.format(' '.join('WHEN ? THEN {}'.format(i) for i in range(len(self._root_paths))))
+
+    def _get_winner_paths(self, curve_names):
+        """
+        Internal function that returns the path of the curve file that wins for each one of the given curve names
+        :param curve_names: set(str)
+        :return: dict(str, str)
+        """
+
+        winners = dict()
+        curve_names = list(curve_names)
+        # SQLite limits the number of parameters of a query
+        for i in range(0, len(curve_names), 500):
+            names = curve_names[i:i + 500]
+            for row in self._query('name IN ({})'.format(', '.join('?' * len(names))), names):
+                winners.setdefault(row['name'], row['path'])
+
+        return winners
+
+    def _get_root_path(self, file_path):
+        """
+        Internal function that returns the root path with more precedence the given file is located in
+        :param file_path: str
+        :return: str or None
+        """
+
+        for root_path in self._root_paths:
+            if file_path.startswith(root_path.rstrip('/') + '/'):
+                return root_path
+
+        return None
+
+    def _sync_directory(self, directory, parent_directory, root_path, visited, full):
+        """
+        Internal function that syncs given directory and its sub directories recursively
+        :param directory: str
+        :param parent_directory: str or None
+        :param root_path: str
+        :param visited: set(str), directories already synced during current sync
+        :param full: bool
+        :return: bool, True if the index changed; False otherwise
+        """
+
+        if directory in visited:
+            return False
+        visited.add(directory)
+
+        row = self._connection.execute(
+            'SELECT mtime, root FROM directories WHERE path = ?', [directory]).fetchone()
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return self._remove_directory(directory) if row else False
+
+        if row and row['mtime'] == mtime and row['root'] == root_path and not full:
+            sub_directories = [sub_row['path'] for sub_row in self._connection.execute(
+                'SELECT path FROM directories WHERE parent = ?', [directory]).fetchall()]
+            changed = False
+        else:
+            sub_directories, changed = self._update_directory(directory, root_path, full)
+            self._connection.execute(
+                'INSERT OR REPLACE INTO directories (path, parent, root, mtime) VALUES (?, ?, ?, ?)',
+                [directory, parent_directory, root_path, mtime])
+
+        for sub_directory in sub_directories:
+            changed = self._sync_directory(sub_directory, directory, root_path, visited, full) or changed
+
+        return changed
+
+    def _update_directory(self, directory, root_path, full):
+        """
+        Internal function that lists given directory and updates the info of its curve files
+        :param directory: str
+        :param root_path: str
+        :param full: bool
+        :return: tuple(list(str), bool), sub directories and whether the index changed
+        """
+
+        try:
+            sub_directory_names, curve_file_names = storage.list_curves_directory(directory)
+        except OSError as exc:
+            logger.warning('Impossible to list curves directory "{}": {}'.format(directory, exc))
+            sub_directory_names, curve_file_names = list(), list()
+
+        stored_curves = dict(
+            (row['path'], (row['mtime'], row['size'], row['root'])) for row in self._connection.execute(
+                'SELECT path, mtime, size, root FROM curves WHERE directory = ?', [directory]).fetchall())
+        sub_directories = [path_utils.clean_path(os.path.join(directory, name)) for name in sub_directory_names]
+        changed = False
+        for file_name in curve_file_names:
+            file_path = path_utils.clean_path(os.path.join(directory, file_name))
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue
+            stored = stored_curves.pop(file_path, None)
+            if stored == (file_stat.st_mtime, file_stat.st_size, root_path):
+                continue
+            self._update_curve(file_path, root_path, file_stat)
+            changed = True
+
+        for curve_path in stored_curves:
+            self._connection.execute('DELETE FROM curves WHERE path = ?', [curve_path])
+            self._connection.execute('DELETE FROM tags WHERE path = ?', [curve_path])
+            changed = True
+
+        stored_sub_directories = [row['path'] for row in self._connection.execute(
+            'SELECT path FROM directories WHERE parent = ?', [directory]).fetchall()]
+        for sub_directory in stored_sub_directories:
+            if sub_directory not in sub_directories:
+                changed = self._remove_directory(sub_directory) or changed
+
+        return sub_directories, changed
+
+    def _remove_directory(self, directory):
+        """
+        Internal function that removes the given directory, its sub directories and their curves from the database
+        :param directory: str
+        :return: bool
+        """
+
+        for row in self._connection.execute('SELECT path FROM directories WHERE parent = ?', [directory]).fetchall():
+            self._remove_directory(row['path'])
+        self._connection.execute(
+            'DELETE FROM tags WHERE path IN (SELECT path FROM curves WHERE directory = ?)', [directory])
+        self._connection.execute('DELETE FROM curves WHERE directory = ?', [directory])
+        self._connection.execute('DELETE FROM directories WHERE path = ?', [directory])
+
+        return True
+
+    def _update_curve(self, curve_path, root_path, file_stat, curve_data=None):
+        """
+        Internal function that stores the info of the given curve file
+        :param curve_path: str
+        :param root_path: str
+        :param file_stat: os.stat_result
+        :param curve_data: dict or None
+        """
+
+        if curve_data is None:
+            curve_data = self._curve_loader(curve_path)
+        curve_metadata = None
+        if curve_data:
+            try:
+                curve_metadata = geometry.get_curve_metadata(curve_data)
+            except Exception as exc:
+                logger.warning('Impossible to compute metadata of curve "{}": {}'.format(curve_path, exc))
+
+        values = [
+            curve_path, os.path.splitext(os.path.basename(curve_path))[0], root_path, os.path.dirname(curve_path),
+            file_stat.st_mtime, file_stat.st_size]
+        if curve_metadata:
+            (min_x, min_y, min_z), (max_x, max_y, max_z) = curve_metadata['bounding_box']
+            values.extend([
+                curve_metadata['hash'], curve_metadata['cvs_count'], len(curve_metadata['shapes']),
+                min_x, min_y, min_z, max_x, max_y, max_z, max(curve_metadata['size'])])
+        else:
+            values.extend([None] * 10)
+
+        self._connection.execute(
+            'INSERT OR REPLACE INTO curves ({}) VALUES ({})'.format(
+                ', '.join(_CURVE_COLUMNS), ', '.join('?' * len(_CURVE_COLUMNS))), values)
@@ -0,0 +1,309 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to safely write curve files shared by multiple processes
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import io
+import json
+import stat
+import time
+import hashlib
+import tempfile
+import contextlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+from tpDcc.libs.curves.core import consts
+
+# Seconds to wait for other processes to release the lock of a file
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+LOCK_EXT = '.lock'
+TEMP_EXT = '.tmp'
+
+# Environment variable that overrides the local folder where per user curve caches (databases, thumbnails) are stored
+CACHE_PATH_ENV = 'TPDCC_CURVES_CACHE_PATH'
+
+
+class FileLockTimeoutError(Exception):
+    """
+    Exception raised when the lock of a file could not be acquired in time
+    """
+
+    pass
+
+
+def list_curves_directory(directory):
+    """
+    Returns the sub directories and the curve files located in the given directory. Hidden entries (lock, temporary
+    and cache files and folders) are ignored, so changes on them are not considered changes of curve directories.
+    :param directory: str
+    :return: tuple(list(str), list(str)), sorted names of sub directories and curve files
+    :raises OSError: if the directory cannot be listed
+    """
+
+    sub_directories = list()
+    curve_files = list()
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.startswith('.'):
+            continue
+        if os.path.isdir(os.path.join(directory, file_name)):
+            sub_directories.append(file_name)
+        elif file_name.endswith(consts.CURVE_EXT):
+            curve_files.append(file_name)
+
+    return sub_directories, curve_files
+
+
+def get_cache_root_path():
+    """
+    Returns the local folder where per user curve caches are stored. Caches are never stored inside curve root paths,
+    so they do not modify curve directories and they work with curve root paths located in read-only or network drives.
+    :return: str
+    """
+
+    cache_path = os.environ.get(CACHE_PATH_ENV, '')
+    if cache_path:
+        return os.path.abspath(os.path.expanduser(cache_path))
+
+    if os.name == 'nt':
+        base_path = os.environ.get('LOCALAPPDATA', '') or os.path.expanduser('~')
+    else:
+        base_path = os.environ.get('XDG_CACHE_HOME', '') or os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(base_path, 'tpDcc', 'curves')
+
+
+def get_cache_path(source_paths, create=True):
+    """
+    Returns the local cache folder of the given curve source paths
+    :param source_paths: str or list(str), curve root path or curve root paths the cache is created for
+    :param create: bool, Whether to create the cache folder if it does not exist
+    :return: str
+    """
+
+    if not isinstance(source_paths, (list, tuple)):
+        source_paths = [source_paths]
+    cache_key = '|'.join(
+        os.path.normcase(os.path.abspath(source_path)).replace('\\', '/') for source_path in source_paths)
+    cache_path = os.path.join(get_cache_root_path(), hashlib.sha1(cache_key.encode('utf-8')).hexdigest()[:16])
+    if create and not os.path.isdir(cache_path):
+        try:
+            os.makedirs(cache_path)
+        except OSError:
+            if not os.path.isdir(cache_path):
+                raise
+
+    return cache_path
+
+
+def get_lock_path(file_path):
+    """
+    Returns the path of the hidden lock file used to serialize writes into the given file
+    :param file_path: str
+    :return: str
+    """
+
+    directory, file_name = os.path.split(file_path)
+
+    return os.path.join(directory, '.{}{}'.format(file_name, LOCK_EXT))
+
+
+def _try_lock(file_descriptor):
+    """
+    Internal function that tries to acquire an exclusive advisory lock on the given file without blocking
+    :param file_descriptor: int
+    :return: bool
+    """
+
+    try:
+        if fcntl is not None:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            msvcrt.locking(file_descriptor, msvcrt.LK_NBLCK, 1)
+    except (IOError, OSError):
+        return False
+
+    return True
+
+
+def _unlock(file_descriptor):
+    """
+    Internal function that releases the advisory lock of the given file
+    :param file_descriptor: int
+    """
+
+    try:
+        if fcntl is not None:
+            fcntl.flock(file_descriptor, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            os.lseek(file_descriptor, 0, os.SEEK_SET)
+            msvcrt.locking(file_descriptor, msvcrt.LK_UNLCK, 1)
+    except (IOError, OSError):
+        pass
+
+
+@contextlib.contextmanager
+def file_lock(file_path, timeout=DEFAULT_LOCK_TIMEOUT):
+    """
+    Context manager that holds an exclusive advisory lock for the given file, so processes writing the same file
+    are serialized. Lock is held on a hidden file next to the given one, so the file itself can be replaced while
+    the lock is held. If the platform does not support file locking, no lock is acquired.
+    :param file_path: str
+    :param timeout: float or None, seconds to wait for the lock. If None, it waits forever.
+    :raises FileLockTimeoutError: if the lock could not be acquired in time
+    """
+
+    file_descriptor = os.open(get_lock_path(file_path), os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        start_time = time.time()
+        while not _try_lock(file_descriptor):
+            if timeout is not None and time.time() - start_time >= timeout:
+                raise FileLockTimeoutError('Timeout while waiting for the lock of file: "{}"'.format(file_path))
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def _fsync_directory(directory):
+    """
+    Internal function that flushes the given directory entries to disk. Not supported on Windows.
+    :param directory: str
+    """
+
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        file_descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(file_descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(file_descriptor)
+
+
+def _replace(source_path, target_path):
+    """
+    Internal function that atomically replaces target path with source path
+    :param source_path: str
+    :param target_path: str
+    """
+
+    if hasattr(os, 'replace'):
+        os.replace(source_path, target_path)
+    elif os.name == 'nt' and os.path.exists(target_path):
+        # Python 2 on Windows cannot rename over an existing file
+        os.remove(target_path)
+        os.rename(source_path, target_path)
+    else:
+        os.rename(source_path, target_path)
+
+
+def write_file_atomic(file_path, contents, fsync=True):
+    """
+    Writes given contents into the given file path so readers never observe a partially written file. Contents are
+    written into a temporary file located in the same directory that replaces the target file once it is complete.
+    :param file_path: str
+    :param contents: bytes
+    :param fsync: bool, Whether to flush the file contents to disk before replacing the target file
+    :return: str, written file path
+    """
+
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    file_descriptor, temp_path = tempfile.mkstemp(prefix='.{}.'.format(file_name), suffix=TEMP_EXT, dir=directory)
+    try:
+        with io.open(file_descriptor, 'wb') as fh:
+            fh.write(contents)
+            fh.flush()
+            if fsync:
+                os.fsync(fh.fileno())
+        os.chmod(temp_path, _get_file_mode(file_path))
+        _replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(directory)
+
+    return file_path
+
+
+def write_json_file(data, file_path, lock=True, timeout=DEFAULT_LOCK_TIMEOUT, fsync=True):
+    """
+    Atomically writes given data into the given JSON file
+    :param data: dict
+    :param file_path: str
+    :param lock: bool, Whether to hold the advisory lock of the file while writing it
+    :param timeout: float or None, seconds to wait for the lock of the file
+    :param fsync: bool, Whether to flush the file contents to disk before replacing the target file
+    :return: str, written file path
+    :raises FileLockTimeoutError: if the lock of the file could not be acquired in time
+    """
+
+    contents = json.dumps(data, indent=2).encode('utf-8')
+    if not lock:
+        return write_file_atomic(file_path, contents, fsync=fsync)
+
+    with file_lock(file_path, timeout=timeout):
+        return write_file_atomic(file_path, contents, fsync=fsync)
+
+
+def _get_umask():
+    """
+    Internal function that returns current process umask. On Linux, it is read from the process status, because
+    changing it temporarily to query it affects files created meanwhile by other threads.
+    :return: int
+    """
+
+    try:
+        with io.open('/proc/self/status', 'r') as fh:
+            for line in fh:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (IOError, OSError, ValueError, IndexError):
+        pass
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return umask
+
+
+# Umask is only queried when the module is imported, before other threads of the library can create files
+_UMASK = _get_umask()
+
+
+def _get_file_mode(file_path):
+    """
+    Internal function that returns the permissions a file replacing the given one must have: the permissions of the
+    existing file or, if it does not exist, the default permissions of new files
+    :param file_path: str
+    :return: int
+    """
+
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
@@ -0,0 +1,209 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to convert curve data into polylines
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import array
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpDcc.libs.curves.core import nurbs, hashing
+
+
+def _get_segment_distances(points, starts, ends):
+    """
+    Internal function that returns the distance of each point to its segment
+    :param points: numpy.ndarray, (N, 3) array
+    :param starts: numpy.ndarray, (N, 3) array with segments start points
+    :param ends: numpy.ndarray, (N, 3) array with segments end points
+    :return: numpy.ndarray
+    """
+
+    directions = ends - starts
+    lengths = numpy.einsum('ij,ij->i', directions, directions)
+    safe_lengths = numpy.where(lengths > 0.0, lengths, 1.0)
+    factors = numpy.clip(numpy.einsum('ij,ij->i', points - starts, directions) / safe_lengths, 0.0, 1.0)
+    factors = numpy.where(lengths > 0.0, factors, 0.0)[:, None]
+
+    return numpy.linalg.norm(points - (starts + directions * factors), axis=1)
+
+
+def _get_segment_distance(point, start, end):
+    """
+    Internal function that returns the distance of the given point to the given segment
+    :param point: list(float)
+    :param start: list(float)
+    :param end: list(float)
+    :return: float
+    """
+
+    direction = [b - a for a, b in zip(start, end)]
+    length = sum(value * value for value in direction)
+    factor = 0.0
+    if length > 0.0:
+        factor = min(max(sum((p - a) * d for p, a, d in zip(point, start, direction)) / length, 0.0), 1.0)
+
+    return sum((p - (a + d * factor)) ** 2 for p, a, d in zip(point, start, direction)) ** 0.5
+
+
+def _get_span_params(knots, degree, cvs_count):
+    """
+    Internal function that returns the unique knot values that delimit the non empty spans of the curve domain
+    :param knots: list(float)
+    :param degree: int
+    :param cvs_count: int
+    :return: list(float)
+    """
+
+    span_params = list()
+    for knot in knots[degree:cvs_count + 1]:
+        if not span_params or knot > span_params[-1]:
+            span_params.append(knot)
+
+    return span_params
+
+
+def tessellate_shape(shape_data, tolerance=0.01, max_depth=8):
+    """
+    Converts given curve shape into a polyline. Each knot span is subdivided until the distance between the curve
+    and the polyline chords is below the given tolerance. Degree 1 shapes are returned as their CVs polyline.
+    :param shape_data: dict
+    :param tolerance: float, maximum chord deviation
+    :param max_depth: int, maximum number of subdivisions per knot span
+    :return: numpy.ndarray or array.array, (N, 3) float32 array if NumPy is available or a flat float32 array
+    """
+
+    cvs, knots, degree, _ = nurbs.get_evaluation_data(shape_data)
+    if degree <= 1 or not cvs:
+        points = cvs
+    else:
+        params = _get_span_params(knots, degree, len(cvs))
+        starts, ends = params[:-1], params[1:]
+        for _ in range(max_depth):
+            if not starts:
+                break
+            if numpy is not None:
+                starts_array, ends_array = numpy.asarray(starts), numpy.asarray(ends)
+                tests_params = numpy.concatenate([
+                    starts_array, ends_array, starts_array * 0.75 + ends_array * 0.25,
+                    (starts_array + ends_array) * 0.5, starts_array * 0.25 + ends_array * 0.75])
+                tests_points = nurbs.evaluate_cvs(cvs, knots, degree, tests_params).reshape(5, len(starts), -1)
+                deviations = numpy.max([_get_segment_distances(
+                    tests_points[i], tests_points[0], tests_points[1]) for i in range(2, 5)], axis=0)
+                to_split = (deviations > tolerance).tolist()
+            else:
+                to_split = list()
+                for start, end in zip(starts, ends):
+                    tests_points = nurbs.evaluate_cvs(
+                        cvs, knots, degree, [start, end, start * 0.75 + end * 0.25, (start + end) * 0.5,
+                                             start * 0.25 + end * 0.75])
+                    to_split.append(max(_get_segment_distance(
+                        point, tests_points[0], tests_points[1]) for point in tests_points[2:]) > tolerance)
+            new_starts, new_ends = list(), list()
+            for start, end, split in zip(starts, ends, to_split):
+                if not split:
+                    continue
+                middle = (start + end) * 0.5
+                params.append(middle)
+                new_starts.extend((start, middle))
+                new_ends.extend((middle, end))
+            starts, ends = new_starts, new_ends
+        points = nurbs.evaluate_cvs(cvs, knots, degree, sorted(params))
+
+    if numpy is not None:
+        return numpy.asarray(points, dtype=numpy.float32).reshape(-1, 3)
+
+    return array.array('f', [float(value) for point in points for value in point])
+
+
+class TessellationCache(object):
+    """
+    Class that stores tessellated curve shapes keyed by shape content hash and tolerance
+    """
+
+    def __init__(self, max_entries=1024):
+        super(TessellationCache, self).__init__()
+
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns tessellation stored with the given key
+        :param key: tuple(str, float, int)
+        :return: numpy.ndarray or array.array or None
+        """
+
+        with self._lock:
+            polyline = self._entries.pop(key, None)
+            if polyline is not None:
+                self._entries[key] = polyline
+            return polyline
+
+    def set(self, key, polyline):
+        """
+        Stores the given tessellation
+        :param key: tuple(str, float, int)
+        :param polyline: numpy.ndarray or array.array
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = polyline
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all stored tessellations
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+
+_TESSELLATION_CACHE = TessellationCache()
+
+
+def get_tessellation_cache():
+    """
+    Returns the cache used to store tessellated curves during current session
+    :return: TessellationCache
+    """
+
+    return _TESSELLATION_CACHE
+
+
+def tessellate_curve(curve_data, tolerance=0.01, max_depth=8):
+    """
+    Converts all the shapes of the given curve data into polylines. Results are cached by the canonical hash of each
+    shape and the tolerance, so tessellating the same shape again is free, even if it belongs to another curve.
+    NumPy arrays returned from cache are read-only. Flat arrays returned when NumPy is not available are copies.
+    :param curve_data: dict
+    :param tolerance: float, maximum chord deviation
+    :param max_depth: int, maximum number of subdivisions per knot span
+    :return: OrderedDict(str, numpy.ndarray or array.array), polyline of each shape
+    """
+
+    polylines = OrderedDict()
+    for shape_name, shape_data in curve_data.items():
+        key = (hashing.get_shape_hash(shape_data), float(tolerance), max_depth)
+        polyline = _TESSELLATION_CACHE.get(key)
+        if polyline is None:
+            polyline = tessellate_shape(shape_data, tolerance=tolerance, max_depth=max_depth)
+            if numpy is not None:
+                polyline.flags.writeable = False
+            _TESSELLATION_CACHE.set(key, polyline)
+        polylines[shape_name] = polyline if numpy is not None else array.array('f', polyline)
+
+    return polylines
@@ -0,0 +1,308 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to render curve thumbnails without a DCC and to cache them on disk
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import io
+import os
+import json
+import zlib
+import struct
+import hashlib
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpDcc.libs.curves.core import consts, storage, tessellation
+
+logger = logging.getLogger(consts.LIB_ID)
+
+# View axis > (horizontal axis index, horizontal sign, vertical axis index, vertical sign)
+VIEW_AXES = {
+    'x': (2, -1.0, 1, 1.0),
+    'y': (0, 1.0, 2, -1.0),
+    'z': (0, 1.0, 1, 1.0)
+}
+
+
+def encode_png(width, height, pixels):
+    """
+    Encodes given RGBA pixels as a PNG image
+    :param width: int
+    :param height: int
+    :param pixels: bytes or bytearray, RGBA pixels stored row by row
+    :return: bytes
+    """
+
+    def _chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack(
+            '>I', zlib.crc32(chunk_type + data) & 0xffffffff)
+
+    row_size = width * 4
+    raw_data = bytearray()
+    for row in range(height):
+        raw_data.append(0)
+        raw_data.extend(pixels[row * row_size:(row + 1) * row_size])
+
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+        _chunk(b'IDAT', zlib.compress(bytes(raw_data), 6)),
+        _chunk(b'IEND', b'')])
+
+
+def get_view_axis(points):
+    """
+    Returns the axis the given points should be looked from to get the most readable thumbnail. This is the axis
+    along which the points have the smallest extent, so planar curves are always looked from their normal.
+    :param points: list(list(float))
+    :return: str
+    """
+
+    if not points:
+        return 'z'
+
+    extents = [max(point[i] for point in points) - min(point[i] for point in points) for i in range(3)]
+
+    # On ties we prefer the front view (z), then the top view (y)
+    return min(zip(extents, (2, 1, 0), 'xyz'))[2]
+
+
+def _project_polylines(curve_data, size, view_axis, margin, tolerance):
+    """
+    Internal function that projects the polylines of all the shapes of the given curve into image space
+    :param curve_data: dict
+    :param size: int
+    :param view_axis: str or None
+    :param margin: int
+    :param tolerance: float
+    :return: list(list(tuple(float, float)))
+    """
+
+    polylines_3d = list()
+    for polyline in tessellation.tessellate_curve(curve_data, tolerance=tolerance).values():
+        points = polyline.tolist() if numpy is not None else [polyline[i:i + 3] for i in range(0, len(polyline), 3)]
+        polylines_3d.append(points)
+
+    if not view_axis:
+        view_axis = get_view_axis([point for polyline in polylines_3d for point in polyline])
+    horizontal_axis, horizontal_sign, vertical_axis, vertical_sign = VIEW_AXES[view_axis.lower()]
+    polylines = [[(point[horizontal_axis] * horizontal_sign, point[vertical_axis] * vertical_sign) for point in points]
+                 for points in polylines_3d]
+
+    all_points = [point for polyline in polylines for point in polyline]
+    if not all_points:
+        return list()
+    min_u, max_u = min(point[0] for point in all_points), max(point[0] for point in all_points)
+    min_v, max_v = min(point[1] for point in all_points), max(point[1] for point in all_points)
+    extent = max(max_u - min_u, max_v - min_v) or 1.0
+    scale = (size - 1 - margin * 2) / extent
+    offset_u = (size - 1 - (max_u - min_u) * scale) * 0.5
+    offset_v = (size - 1 - (max_v - min_v) * scale) * 0.5
+
+    # Image rows grow downwards, so vertical coordinates are flipped
+    return [[((u - min_u) * scale + offset_u, size - 1 - ((v - min_v) * scale + offset_v)) for u, v in polyline]
+            for polyline in polylines]
+
+
+def render_curve(curve_data, size=64, view_axis=None, color=(255, 255, 255, 255), margin=4, tolerance=0.01):
+    """
+    Renders the given curve data into an image using an orthographic projection
+    :param curve_data: dict
+    :param size: int, width and height of the image in pixels
+    :param view_axis: str or None, axis the curve is looked from ('x', 'y' or 'z'). If None, the axis along which
+        the curve is flattest is used
+    :param color: tuple(int, int, int, int), RGBA color of the lines
+    :param margin: int, empty pixels between the curve and the image borders
+    :param tolerance: float, tessellation tolerance
+    :return: bytearray, RGBA pixels stored row by row (transparent background)
+    """
+
+    pixels = bytearray(size * size * 4)
+    polylines = _project_polylines(curve_data, size, view_axis, margin, tolerance)
+    segments = [(polyline[i], polyline[i + 1]) for polyline in polylines for i in range(len(polyline) - 1)]
+    segments.extend((polyline[0], polyline[0]) for polyline in polylines if len(polyline) == 1)
+    if not segments:
+        return pixels
+
+    if numpy is not None:
+        starts = numpy.array([segment[0] for segment in segments], dtype=numpy.float64)
+        ends = numpy.array([segment[1] for segment in segments], dtype=numpy.float64)
+        counts = numpy.ceil(numpy.abs(ends - starts).max(axis=1)).astype(numpy.int64) + 1
+        segment_indices = numpy.repeat(numpy.arange(len(segments)), counts)
+        first_indices = numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        factors = (numpy.arange(counts.sum()) - first_indices) / numpy.maximum(counts - 1, 1)[segment_indices]
+        points = starts[segment_indices] + (ends - starts)[segment_indices] * factors[:, None]
+        points = numpy.clip(numpy.rint(points).astype(numpy.int64), 0, size - 1)
+        image = numpy.frombuffer(pixels, dtype=numpy.uint8).reshape(size, size, 4)
+        image[points[:, 1], points[:, 0]] = color
+        return pixels
+
+    for start, end in segments:
+        count = int(max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 0.999999) + 1
+        for i in range(count):
+            factor = i / max(count - 1, 1)
+            column = min(max(int(round(start[0] + (end[0] - start[0]) * factor)), 0), size - 1)
+            row = min(max(int(round(start[1] + (end[1] - start[1]) * factor)), 0), size - 1)
+            index = (row * size + column) * 4
+            pixels[index:index + 4] = bytearray(color)
+
+    return pixels
+
+
+def render_curve_png(curve_data, size=64, view_axis=None, color=(255, 255, 255, 255), margin=4, tolerance=0.01):
+    """
+    Renders the given curve data into a PNG image using an orthographic projection
+    :param curve_data: dict
+    :param size: int, width and height of the image in pixels
+    :param view_axis: str or None, axis the curve is looked from ('x', 'y' or 'z'). If None, the axis along which
+        the curve is flattest is used
+    :param color: tuple(int, int, int, int), RGBA color of the lines
+    :param margin: int, empty pixels between the curve and the image borders
+    :param tolerance: float, tessellation tolerance
+    :return: bytes
+    """
+
+    pixels = render_curve(
+        curve_data, size=size, view_axis=view_axis, color=color, margin=margin, tolerance=tolerance)
+
+    return encode_png(size, size, pixels)
+
+
+class ThumbnailCache(object):
+    """
+    Class that stores rendered curve thumbnails in the local curves cache folder of a curves root path. Thumbnails are
+    invalidated when the modification time and size of their curve file changes and its contents hash differs.
+    """
+
+    def __init__(self, curves_path, thumbnails_path=None):
+        """
+        :param curves_path: str, curves root path
+        :param thumbnails_path: str or None, folder where thumbnails are stored. If not given, thumbnails are stored
+            in the local curves cache folder of the curves root path.
+        """
+
+        super(ThumbnailCache, self).__init__()
+
+        self._curves_path = curves_path
+        self._thumbnails_path = thumbnails_path or os.path.join(
+            storage.get_cache_path(curves_path, create=False), consts.THUMBNAILS_FOLDER)
+        self._index_path = os.path.join(self._thumbnails_path, consts.THUMBNAILS_INDEX)
+        self._index = None
+        self._dirty = False
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def thumbnails_path(self):
+        return self._thumbnails_path
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def get_thumbnail(self, curve_path, load_fn, size=64, view_axis=None, save=True):
+        """
+        Returns the path of the thumbnail of the given curve file, rendering it if it is not cached or it is outdated
+        :param curve_path: str
+        :param load_fn: callable, function that receives a curve path and returns its curve data
+        :param size: int
+        :param view_axis: str or None, axis the curve is looked from. If None, it is automatically selected
+        :param save: bool, Whether to save the thumbnails index to disk if it changed
+        :return: str or None
+        """
+
+        try:
+            file_stat = os.stat(curve_path)
+        except OSError:
+            return None
+
+        index = self._get_index()
+        curve_name = os.path.splitext(os.path.relpath(curve_path, self._curves_path))[0].replace('\\', '/')
+        view_name = view_axis.lower() if view_axis else 'auto'
+        key = '{}|{}|{}'.format(curve_name, view_name, size)
+        thumbnail_path = os.path.join(
+            self._thumbnails_path, '{}_{}_{}.png'.format(curve_name.replace('/', '__'), view_name, size))
+        entry = index.get(key, None)
+        thumbnail_exists = os.path.isfile(thumbnail_path)
+        if entry and thumbnail_exists and entry['mtime'] == file_stat.st_mtime and entry['size'] == file_stat.st_size:
+            return thumbnail_path
+
+        with io.open(curve_path, 'rb') as fh:
+            file_hash = hashlib.sha1(fh.read()).hexdigest()
+        if not entry or not thumbnail_exists or entry['hash'] != file_hash:
+            curve_data = load_fn(curve_path)
+            if not curve_data:
+                return None
+            try:
+                if not os.path.isdir(self._thumbnails_path):
+                    os.makedirs(self._thumbnails_path)
+                storage.write_file_atomic(
+                    thumbnail_path, render_curve_png(curve_data, size=size, view_axis=view_axis), fsync=False)
+            except (IOError, OSError) as exc:
+                logger.warning('Impossible to write curve thumbnail "{}": {}'.format(thumbnail_path, exc))
+                return None
+
+        index[key] = {'mtime': file_stat.st_mtime, 'size': file_stat.st_size, 'hash': file_hash}
+        self._dirty = True
+        if save:
+            self.save()
+
+        return thumbnail_path
+
+    def save(self):
+        """
+        Writes thumbnails index into disk if it changed
+        """
+
+        if not self._dirty or self._index is None:
+            return
+        try:
+            # Index is merged with the entries written by other sessions while the lock of the index is held
+            with storage.file_lock(self._index_path):
+                self._index = dict(self._read_index(), **self._index)
+                storage.write_json_file(self._index, self._index_path, lock=False, fsync=False)
+        except (IOError, OSError, storage.FileLockTimeoutError) as exc:
+            logger.warning('Impossible to write curve thumbnails index "{}": {}'.format(self._index_path, exc))
+            return
+        self._dirty = False
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _get_index(self):
+        """
+        Internal function that returns thumbnails index, loading it from disk the first time
+        :return: dict
+        """
+
+        if self._index is None:
+            self._index = self._read_index()
+
+        return self._index
+
+    def _read_index(self):
+        """
+        Internal function that reads thumbnails index stored in disk
+        :return: dict
+        """
+
+        if not os.path.isfile(self._index_path):
+            return dict()
+        try:
+            with io.open(self._index_path, 'r') as fh:
+                return json.load(fh)
+        except (IOError, OSError, ValueError) as exc:
+            logger.warning('Impossible to read curve thumbnails index "{}": {}'.format(self._index_path, exc))
+
+        return dict()
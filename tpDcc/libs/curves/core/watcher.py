@@ -0,0 +1,606 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the watcher that notifies the curve files created, modified, deleted or renamed in curves paths
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+import ctypes
+import ctypes.util
+from collections import OrderedDict, namedtuple
+
+from tpDcc.libs.python import path as path_utils
+
+from tpDcc.libs.curves.core import consts, storage
+
+logger = logging.getLogger(consts.LIB_ID)
+
+# Seconds between checks of the directories watched by the polling backend (and between wake ups of the watcher
+# thread when inotify is used)
+DEFAULT_INTERVAL = 1.0
+
+# Seconds without new changes the watcher waits before notifying a burst of changes
+DEFAULT_COALESCE_DELAY = 0.2
+
+# Maximum seconds a burst of changes can be delayed while it keeps growing
+MAX_COALESCE_DELAY = 2.0
+
+CREATED = 'created'
+MODIFIED = 'modified'
+DELETED = 'deleted'
+MOVED = 'moved'
+
+# Change of a curve file. For moved events, path is the new path and old_path the previous one
+CurveEvent = namedtuple('CurveEvent', ['type', 'path', 'old_path'])
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_INOTIFY_MASK |= _IN_MOVE_SELF | _IN_ONLYDIR
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _get_libc():
+    """
+    Internal function that returns the C library if it supports inotify
+    :return: ctypes.CDLL or None
+    """
+
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    if not all(hasattr(libc, name) for name in ('inotify_init1', 'inotify_add_watch', 'inotify_rm_watch')):
+        return None
+
+    return libc
+
+
+class PollingBackend(object):
+    """
+    Class that detects changes of watched directories by checking their modification times. Changes of curve files
+    that are written in place do not change the modification time of their directory, so they are only detected
+    once the directory changes (library saves replace curve files, so they are always detected).
+    """
+
+    def __init__(self):
+        super(PollingBackend, self).__init__()
+
+        self._mtimes = dict()           # directory > mtime
+        self._wake_event = threading.Event()
+
+    def watch(self, directory):
+        """
+        Starts watching the given directory
+        :param directory: str
+        """
+
+        self._mtimes[directory] = self._get_mtime(directory)
+
+    def unwatch(self, directory):
+        """
+        Stops watching the given directory
+        :param directory: str
+        """
+
+        self._mtimes.pop(directory, None)
+
+    def wait(self, timeout):
+        """
+        Waits until watched directories change or until timeout expires
+        :param timeout: float, seconds
+        :return: set(str), changed directories
+        """
+
+        changed_directories = self._check_directories()
+        if changed_directories or timeout <= 0:
+            return changed_directories
+        self._wake_event.wait(timeout)
+        self._wake_event.clear()
+
+        return self._check_directories()
+
+    def wake(self):
+        """
+        Interrupts current wait
+        """
+
+        self._wake_event.set()
+
+    def close(self):
+        """
+        Stops watching all directories
+        """
+
+        self._mtimes.clear()
+        self.wake()
+
+    def _get_mtime(self, directory):
+        """
+        Internal function that returns the modification time of the given directory
+        :param directory: str
+        :return: float or None
+        """
+
+        try:
+            return os.stat(directory).st_mtime
+        except OSError:
+            return None
+
+    def _check_directories(self):
+        """
+        Internal function that returns the watched directories whose modification time changed since last check
+        :return: set(str)
+        """
+
+        changed_directories = set()
+        for directory, mtime in list(self._mtimes.items()):
+            new_mtime = self._get_mtime(directory)
+            if new_mtime != mtime:
+                self._mtimes[directory] = new_mtime
+                changed_directories.add(directory)
+
+        return changed_directories
+
+
+class InotifyBackend(PollingBackend):
+    """
+    Class that detects changes of watched directories using Linux inotify. Directories that cannot be watched with
+    inotify (for example, because the maximum number of watches was reached) are polled.
+    """
+
+    def __init__(self, libc=None):
+        super(InotifyBackend, self).__init__()
+
+        self._libc = libc or _get_libc()
+        if not self._libc:
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._wake_read, self._wake_write = os.pipe()
+        self._directories = dict()      # watch descriptor > directory
+        self._descriptors = dict()      # directory > watch descriptor
+
+    def watch(self, directory):
+        """
+        Starts watching the given directory
+        :param directory: str
+        """
+
+        if directory in self._descriptors:
+            return
+        encoded_directory = directory
+        if not isinstance(encoded_directory, bytes):
+            encoded_directory = encoded_directory.encode(sys.getfilesystemencoding() or 'utf-8')
+        descriptor = self._libc.inotify_add_watch(self._fd, encoded_directory, _INOTIFY_MASK)
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            if error != errno.ENOENT:
+                logger.warning('Impossible to watch directory "{}" with inotify, it will be polled: {}'.format(
+                    directory, os.strerror(error)))
+                super(InotifyBackend, self).watch(directory)
+            return
+        self._directories[descriptor] = directory
+        self._descriptors[directory] = descriptor
+
+    def unwatch(self, directory):
+        """
+        Stops watching the given directory
+        :param directory: str
+        """
+
+        super(InotifyBackend, self).unwatch(directory)
+        descriptor = self._descriptors.pop(directory, None)
+        if descriptor is None:
+            return
+        self._directories.pop(descriptor, None)
+        self._libc.inotify_rm_watch(self._fd, descriptor)
+
+    def wait(self, timeout):
+        """
+        Waits until watched directories change or until timeout expires
+        :param timeout: float, seconds
+        :return: set(str), changed directories
+        """
+
+        if self._fd < 0:
+            return set()
+        try:
+            readable = select.select([self._fd, self._wake_read], list(), list(), max(timeout, 0))[0]
+        except (OSError, select.error) as exc:
+            if exc.args[0] != errno.EINTR:
+                raise
+            readable = list()
+        if self._wake_read in readable:
+            os.read(self._wake_read, 1024)
+
+        changed_directories = self._read_events() if self._fd in readable else set()
+        changed_directories.update(self._check_directories())
+
+        return changed_directories
+
+    def wake(self):
+        """
+        Interrupts current wait
+        """
+
+        try:
+            os.write(self._wake_write, b'x')
+        except OSError:
+            pass
+
+    def close(self):
+        """
+        Stops watching all directories and releases inotify resources
+        """
+
+        super(InotifyBackend, self).close()
+        if self._fd < 0:
+            return
+        os.close(self._fd)
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+        self._fd = -1
+        self._directories.clear()
+        self._descriptors.clear()
+
+    def _read_events(self):
+        """
+        Internal function that reads pending inotify events and returns the directories they belong to
+        :return: set(str)
+        """
+
+        buffer_data = b''
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as exc:
+                if exc.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not data:
+                break
+            buffer_data += data
+
+        changed_directories = set()
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(buffer_data):
+            descriptor, mask, _, name_length = _INOTIFY_EVENT.unpack_from(buffer_data, offset)
+            name = buffer_data[offset + _INOTIFY_EVENT.size:offset + _INOTIFY_EVENT.size + name_length].rstrip(b'\0')
+            offset += _INOTIFY_EVENT.size + name_length
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost, so all the watched directories must be checked
+                changed_directories.update(self._descriptors.keys())
+                continue
+            directory = self._directories.get(descriptor, None)
+            if directory is None:
+                continue
+            if mask & _IN_IGNORED:
+                self._directories.pop(descriptor, None)
+                self._descriptors.pop(directory, None)
+            # Changes of temporary and lock files written next to curve files are ignored
+            if name and not mask & _IN_ISDIR and not name.endswith(consts.CURVE_EXT.encode('utf-8')):
+                continue
+            changed_directories.add(directory)
+
+        return changed_directories
+
+
+def create_backend(use_inotify=True):
+    """
+    Returns the best backend available to watch directories
+    :param use_inotify: bool, Whether to use inotify if it is available
+    :return: PollingBackend
+    """
+
+    if use_inotify:
+        libc = _get_libc()
+        if libc:
+            try:
+                return InotifyBackend(libc)
+            except OSError as exc:
+                logger.warning('Impossible to initialize inotify, directories will be polled: {}'.format(exc))
+
+    return PollingBackend()
+
+
+class CurveWatcher(object):
+    """
+    Class that watches curves root paths and notifies the curve files that are created, modified, deleted or renamed
+    on them. Changes are coalesced, so a burst of changes is notified once. Changes can be processed by calling
+    poll (for example, from a UI timer) or by starting a background thread. Callbacks receive the list of
+    CurveEvent and they are called from the thread that processes the changes.
+    """
+
+    def __init__(
+            self, root_paths, interval=DEFAULT_INTERVAL, coalesce_delay=DEFAULT_COALESCE_DELAY, use_inotify=True):
+        super(CurveWatcher, self).__init__()
+
+        self._root_paths = [path_utils.clean_path(root_path) for root_path in root_paths if root_path]
+        self._interval = interval
+        self._coalesce_delay = coalesce_delay
+        self._use_inotify = use_inotify
+        self._backend = None
+        self._directories = dict()      # directory > (list(sub directories), dict(curve file > (mtime, size, inode)))
+        self._callbacks = list()
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def root_paths(self):
+        return list(self._root_paths)
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def add_callback(self, callback):
+        """
+        Registers a function that is called with the list of CurveEvent each time curve files change
+        :param callback: callable
+        """
+
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """
+        Unregisters given callback
+        :param callback: callable
+        :return: bool
+        """
+
+        if callback not in self._callbacks:
+            return False
+        self._callbacks.remove(callback)
+
+        return True
+
+    def get_curve_paths(self):
+        """
+        Returns the paths of all the curve files found by the watcher
+        :return: list(str)
+        """
+
+        self._ensure_started()
+        with self._lock:
+            return [curve_path for _, curve_files in self._directories.values() for curve_path in curve_files]
+
+    def poll(self, timeout=0.0):
+        """
+        Processes the changes of the watched directories and notifies them to the registered callbacks
+        :param timeout: float, seconds to wait for changes
+        :return: list(CurveEvent)
+        """
+
+        self._ensure_started()
+        changed_directories = self._backend.wait(timeout)
+        if not changed_directories:
+            return list()
+
+        # Changes are accumulated until no new changes happen, so bursts are notified once
+        start_time = time.time()
+        while time.time() - start_time < MAX_COALESCE_DELAY and not self._stop_event.is_set():
+            new_changed_directories = self._backend.wait(self._coalesce_delay)
+            if not new_changed_directories:
+                break
+            changed_directories.update(new_changed_directories)
+
+        with self._lock:
+            events = self._update(changed_directories)
+        if events:
+            self._notify(events)
+
+        return events
+
+    def start(self, threaded=True):
+        """
+        Takes the initial snapshot of the watched directories and, optionally, starts processing their changes in a
+        background thread
+        :param threaded: bool
+        """
+
+        self._ensure_started()
+        if not threaded or self.running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='CurveWatcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops watching curves root paths
+        """
+
+        self._stop_event.set()
+        if self._backend:
+            self._backend.wake()
+        if self._thread is not None:
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._backend:
+                self._backend.close()
+                self._backend = None
+            self._directories.clear()
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _ensure_started(self):
+        """
+        Internal function that creates the backend and takes the initial snapshot of the watched directories
+        """
+
+        with self._lock:
+            if self._backend is not None:
+                return
+            self._backend = create_backend(use_inotify=self._use_inotify)
+            self._stop_event.clear()
+            for root_path in self._root_paths:
+                self._update_directory(root_path, dict(), dict())
+
+    def _run(self):
+        """
+        Internal function that processes changes until the watcher is stopped
+        """
+
+        while not self._stop_event.is_set():
+            try:
+                self.poll(self._interval)
+            except Exception:
+                logger.exception('Error while watching curves paths')
+                self._stop_event.wait(self._interval)
+
+    def _notify(self, events):
+        """
+        Internal function that calls the registered callbacks with the given events
+        :param events: list(CurveEvent)
+        """
+
+        for callback in list(self._callbacks):
+            try:
+                callback(events)
+            except Exception:
+                logger.exception('Error while notifying curve changes to callback: {}'.format(callback))
+
+    def _update(self, changed_directories):
+        """
+        Internal function that updates the snapshot of the given directories and returns the curve changes
+        :param changed_directories: set(str)
+        :return: list(CurveEvent)
+        """
+
+        previous_files = dict()
+        current_files = dict()
+        for directory in sorted(changed_directories):
+            if directory in self._directories:
+                self._update_directory(directory, previous_files, current_files)
+
+        created_paths = [path for path in current_files if path not in previous_files]
+        deleted_paths = [path for path in previous_files if path not in current_files]
+        deleted_inodes = OrderedDict(
+            ((previous_files[path][1], previous_files[path][2]), path) for path in deleted_paths
+            if previous_files[path][2])
+
+        events = list()
+        for curve_path in sorted(previous_files):
+            if curve_path in current_files and current_files[curve_path] != previous_files[curve_path]:
+                events.append(CurveEvent(MODIFIED, curve_path, None))
+        for curve_path in sorted(created_paths):
+            file_size, inode = current_files[curve_path][1:]
+            old_path = deleted_inodes.pop((file_size, inode), None) if inode else None
+            if old_path:
+                events.append(CurveEvent(MOVED, curve_path, old_path))
+            else:
+                events.append(CurveEvent(CREATED, curve_path, None))
+        for curve_path in sorted(deleted_inodes.values()) + sorted(
+                path for path in deleted_paths if not previous_files[path][2]):
+            events.append(CurveEvent(DELETED, curve_path, None))
+
+        return events
+
+    def _update_directory(self, directory, previous_files, current_files):
+        """
+        Internal function that lists again the given directory and its new sub directories and stores the previous
+        and current info of their curve files
+        :param directory: str
+        :param previous_files: dict(str, tuple), curve files info before the update
+        :param current_files: dict(str, tuple), curve files info after the update
+        """
+
+        cached = self._directories.pop(directory, None)
+        old_sub_directories, old_curve_files = cached if cached else (list(), dict())
+        for curve_path, info in old_curve_files.items():
+            previous_files.setdefault(curve_path, info)
+            current_files.pop(curve_path, None)
+
+        if cached is None:
+            self._backend.watch(directory)
+        try:
+            sub_directory_names, curve_file_names = storage.list_curves_directory(directory)
+        except OSError:
+            self._forget_directory(directory, previous_files, current_files)
+            for sub_directory in old_sub_directories:
+                self._forget_directory(sub_directory, previous_files, current_files)
+            return
+
+        sub_directories = [path_utils.clean_path(os.path.join(directory, name)) for name in sub_directory_names]
+        curve_files = OrderedDict()
+        for file_name in curve_file_names:
+            file_path = path_utils.clean_path(os.path.join(directory, file_name))
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue
+            curve_files[file_path] = (file_stat.st_mtime, file_stat.st_size, file_stat.st_ino)
+        self._directories[directory] = (sub_directories, curve_files)
+        current_files.update(curve_files)
+
+        for sub_directory in old_sub_directories:
+            if sub_directory not in sub_directories:
+                self._forget_directory(sub_directory, previous_files, current_files)
+        for sub_directory in sub_directories:
+            if sub_directory not in self._directories:
+                self._update_directory(sub_directory, previous_files, current_files)
+
+    def _forget_directory(self, directory, previous_files, current_files):
+        """
+        Internal function that stops watching the given directory and its sub directories
+        :param directory: str
+        :param previous_files: dict(str, tuple), curve files info before the update
+        :param current_files: dict(str, tuple), curve files info after the update
+        """
+
+        self._backend.unwatch(directory)
+        cached = self._directories.pop(directory, None)
+        if not cached:
+            return
+        sub_directories, curve_files = cached
+        for curve_path, info in curve_files.items():
+            previous_files.setdefault(curve_path, info)
+            current_files.pop(curve_path, None)
+        for sub_directory in sub_directories:
+            self._forget_directory(sub_directory, previous_files, current_files)
@@ -11,6 +11,8 @@ from tpDcc import dcc
 from tpDcc.core import consts
 from tpDcc.dccs.max.core import curves
 
+from tpDcc.libs.curves.core import cache, nurbs, simplify
+
 
 def create_curve_from_data(curve_data, **kwargs):
     """
@@ -25,24 +27,33 @@ def create_curve_from_data(curve_data, **kwargs):
     mirror = kwargs.get('mirror', None)
     color = kwargs.get('color', None)
     parent = kwargs.get('parent', None)
+    lod = kwargs.get('lod', 0)
+
+    # LOD variants stored in curve data are never sent to the DCC
+    curve_data = simplify.get_curve_lod(curve_data, lod=lod)
 
-    curve_data_ = curve_data.copy()
-    for curve_name, data in curve_data_.items():
-        cvs = curve_data[curve_name]['cvs']
-        up_axis = curve_data[curve_name].get('up_axis', consts.Axis.Y)
-        if up_axis == consts.Axis.Y:
-            new_cvs = [dcc.convert_translation(cv) for cv in cvs]
-            curve_data[curve_name]['cvs'] = new_cvs
-
-    for curve_name, data in curve_data_.items():
-        cvs = curve_data[curve_name]['cvs']
-        degree = curve_data[curve_name]['degree']
-        order = degree + 1
-        total_knots = order + len(cvs)
-        while len(curve_data[curve_name]['knots']) < total_knots:
-            curve_data[curve_name]['knots'].insert(0, curve_data[curve_name]['knots'][0])
-            curve_data[curve_name]['knots'].append(curve_data[curve_name]['knots'][-1])
+    # 3ds Max needs clamped knot vectors (cvs count + degree + 1 knots). Given curve data is not modified.
+    curve_data = convert_curve_data_to_dcc(nurbs.normalize_curve_knots(curve_data))
 
     return curves.create_curve_shape(
         curve_data, curve_size=curve_size, translate_offset=translate_offset, scale=scale, axis_order=axis_order,
         mirror=mirror, color=color)
+
+
+def convert_curve_data_to_dcc(curve_data):
+    """
+    Returns a copy of the given curve data with the CVs of its Y-up shapes converted into 3ds Max Z-up space.
+    Curve creation transforms (offset, scale, axis order and mirror) are applied after this conversion, so they are
+    defined in 3ds Max space.
+    :param curve_data: dict
+    :return: dict
+    """
+
+    curve_data = cache.copy_curve_data(curve_data)
+    for data in curve_data.values():
+        if data.get('up_axis', consts.Axis.Y) != consts.Axis.Y or 'cvs' not in data:
+            continue
+        data['cvs'] = [list(dcc.convert_translation(cv)) for cv in data['cvs']]
+        data['up_axis'] = consts.Axis.Z
+
+    return curve_data
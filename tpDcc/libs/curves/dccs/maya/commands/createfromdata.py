@@ -11,7 +11,7 @@ import maya.cmds
 import maya.api.OpenMaya
 
 from tpDcc.core import command
-from tpDcc.libs.curves.core import curveslib
+from tpDcc.libs.curves.core import curveslib, geometry, simplify
 from tpDcc.dccs.maya.api import node as api_node
 
 
@@ -47,10 +47,14 @@ class CreateCurveFromData(command.DccCommand, object):
         return arguments
 
     def run(self, curve_data=None, curve_size=1.0, translate_offset=(0.0, 0.0, 0.0),
-            scale=(1.0, 1.0, 1.0), axis_order='XYZ', mirror=None, parent=None):
-        parent_mobj, shape_mobjs = curveslib.create_curve_from_data(
-            curve_data, curve_size=curve_size, translate_offset=translate_offset,
-            scale=scale, axis_order=axis_order, mirror=mirror, parent=parent)
+            scale=(1.0, 1.0, 1.0), axis_order='XYZ', mirror=None, parent=None, lod=0):
+        curve_data = simplify.get_curve_lod(curve_data, lod=lod)
+        matrix = geometry.compose_transform_matrix(
+            curve_size=curve_size, translate_offset=translate_offset, scale=scale, axis_order=axis_order,
+            mirror=mirror)
+        if not geometry.is_identity_matrix(matrix):
+            curve_data = geometry.transform_curve_data(curve_data, matrix)
+        parent_mobj, shape_mobjs = curveslib.create_curve_from_data(curve_data, parent=parent)
         self._parent = maya.api.OpenMaya.MObjectHandle(parent_mobj)
         self._shape_nodes = map(maya.api.OpenMaya.MObjectHandle, shape_mobjs)
 
@@ -0,0 +1,69 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains Dcc commands to create multiple curves in Maya
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import maya.cmds
+import maya.api.OpenMaya
+
+from tpDcc.core import command
+from tpDcc.libs.curves.core import curveslib
+from tpDcc.dccs.maya.api import node as api_node
+
+
+class CreateCurvesFromPaths(command.DccCommand, object):
+
+    id = 'tpDcc-libs-curves-dccs-maya-createCurvesFromPaths'
+    creator = 'Tomas Poveda'
+    is_undoable = True
+
+    _nodes = list()
+
+    def resolve_arguments(self, arguments):
+        curve_specs = arguments.curve_specs
+        if not curve_specs:
+            self.cancel('No curve specs given')
+
+        resolved_specs = list()
+        for curve_spec in curve_specs:
+            curve_spec = dict(curve_spec)
+            if not curve_spec.get('curve_type', None):
+                curve_spec['curve_type'] = 'circle'
+            parent = curve_spec.get('parent', None)
+            if parent is not None:
+                handle = maya.api.OpenMaya.MObjectHandle(parent)
+                if not handle.isValid() or not handle.isAlive():
+                    self.cancel('Parent no longer exists in current scene: "{}"'.format(parent))
+                curve_spec['parent'] = handle
+            resolved_specs.append(curve_spec)
+
+        arguments['curve_specs'] = resolved_specs
+
+        return arguments
+
+    def run(self, curve_specs=None):
+        results, errors = curveslib.create_curves(curve_specs)
+
+        # We only store the nodes that must be deleted on undo: the new parent transform of the curves created
+        # without parent or the shapes of the curves created under an existing parent
+        self._nodes = list()
+        for curve_spec, result in zip(curve_specs, results):
+            if not result:
+                continue
+            parent_mobj, shape_mobjs = result
+            if curve_spec.get('parent', None) is None:
+                self._nodes.append(maya.api.OpenMaya.MObjectHandle(parent_mobj))
+            else:
+                self._nodes.extend(maya.api.OpenMaya.MObjectHandle(shape_mobj) for shape_mobj in shape_mobjs)
+
+        return results, errors
+
+    def undo(self):
+        nodes_to_delete = [api_node.name_from_mobject(
+            i.object()) for i in self._nodes if (i.isValid() and i.isAlive())]
+        if nodes_to_delete:
+            maya.cmds.delete(nodes_to_delete)
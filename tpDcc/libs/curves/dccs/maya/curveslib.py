@@ -16,6 +16,8 @@ from tpDcc.libs.python import python
 from tpDcc.dccs.maya import api
 from tpDcc.dccs.maya.api import curves, node as api_node
 
+from tpDcc.libs.curves.core import consts, geometry, simplify
+
 
 def create_curve_from_data(curve_data, **kwargs):
     """
@@ -30,6 +32,10 @@ def create_curve_from_data(curve_data, **kwargs):
     mirror = kwargs.get('mirror', None)
     color = kwargs.get('color', None)
     parent = kwargs.get('parent', None)
+    lod = kwargs.get('lod', 0)
+
+    # LOD variants stored in curve data are never sent to the DCC
+    curve_data = simplify.get_curve_lod(curve_data, lod=lod)
 
     return curves.create_curve_shape(
         curve_data, curve_size=curve_size, translate_offset=translate_offset, scale=scale, axis_order=axis_order,
@@ -83,6 +89,7 @@ def serialize_curve(curve_node, normalize=True, **kwargs):
     """
 
     space = kwargs.pop('space', None) or maya.api.OpenMaya.MSpace.kObject
+    normalize_mode = kwargs.pop('normalize_mode', None) or consts.NormalizeMode.MAX
 
     if python.is_string(curve_node):
         curve_node = api_node.as_mobject(curve_node)
@@ -112,14 +119,7 @@ def serialize_curve(curve_node, normalize=True, **kwargs):
 
     # Normalize CVs to be in 0-1 space
     if normalize:
-        mx = -1
-        for shape_name, shape_data in data.items():
-            for cv in shape_data['cvs']:
-                for p in cv:
-                    if mx < abs(p):
-                        mx = abs(p)
-        for shape_name, shape_data in data.items():
-            shape_data['cvs'] = [[p / mx for p in pt] for pt in shape_data['cvs']]
+        data = geometry.normalize_curve_data(data, mode=normalize_mode)
 
     return data
 